@@ -1,14 +1,33 @@
 import os
+import sys
 import json
+import logging
 import secrets
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, make_response, session
+from flask import Flask, Response, render_template, request, redirect, url_for, flash, jsonify, make_response, session, g
 from flask_wtf.csrf import CSRFProtect
+import click
 from dotenv import load_dotenv
 import requests
 from datetime import datetime, timedelta
 from dateutil import parser
 import traceback
 import urllib.parse
+import re
+import sqlite3
+import threading
+import queue
+import asyncio
+import contextvars
+import time
+import random
+import copy
+import hashlib
+import hmac
+import heapq
+import itertools
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 
 # Conditionally import pyngrok
 ngrok_available = False
@@ -18,6 +37,14 @@ try:
 except ImportError:
     pass
 
+# Conditionally import httpx (only needed for the async ASGI entry point)
+httpx_available = False
+try:
+    import httpx
+    httpx_available = True
+except ImportError:
+    pass
+
 # Load environment variables
 load_dotenv()
 
@@ -27,6 +54,101 @@ app.secret_key = os.getenv('FLASK_SECRET_KEY', 'dev_key')
 app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=7)
 csrf = CSRFProtect(app)
 
+# Logging configuration
+# LOG_LEVEL sets the base level; LOG_LEVELS overrides it per subsystem,
+# e.g. "graphql=WARNING,workflow_states=DEBUG"
+LOG_LEVEL = os.getenv('LOG_LEVEL', '')
+LOG_LEVELS = os.getenv('LOG_LEVELS', '')
+# Payload dumps are truncated to this many characters
+LOG_PAYLOAD_MAX_CHARS = int(os.getenv('LOG_PAYLOAD_MAX_CHARS', 2000))
+# Fraction of below-WARNING payload dumps that are actually serialized
+LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv('LOG_PAYLOAD_SAMPLE_RATE', 1.0))
+# Keys whose values never reach the logs
+LOG_REDACTED_KEYS = {'client_secret', 'access_token', 'refresh_token', 'code', 'authorization'}
+
+def parse_log_levels(spec):
+    """Parse "name=LEVEL,name=LEVEL" into a dict of logging levels"""
+    levels = {}
+    for item in spec.split(','):
+        name, _, level_name = item.partition('=')
+        if not name.strip() or not level_name.strip():
+            continue
+        level = logging.getLevelName(level_name.strip().upper())
+        if isinstance(level, int):
+            levels[name.strip()] = level
+        else:
+            app.logger.warning(f"Ignoring unknown log level {level_name!r} for {name.strip()}")
+    return levels
+
+if LOG_LEVEL:
+    app.logger.setLevel(LOG_LEVEL.upper())
+log_levels = parse_log_levels(LOG_LEVELS)
+
+def get_logger(subsystem):
+    """Get the logger for a subsystem, honouring its LOG_LEVELS override"""
+    logger = app.logger.getChild(subsystem)
+    if subsystem in log_levels:
+        logger.setLevel(log_levels[subsystem])
+    return logger
+
+def redact(value):
+    """Copy a payload with secret-looking keys masked"""
+    if isinstance(value, dict):
+        return {key: '***' if str(key).lower() in LOG_REDACTED_KEYS else redact(item)
+                for key, item in value.items()}
+    if isinstance(value, list):
+        return [redact(item) for item in value]
+    return value
+
+class LazyJSON:
+    """A log argument that serializes its payload only when the record is formatted"""
+    
+    def __init__(self, payload, max_chars=None):
+        self.payload = payload
+        self.max_chars = max_chars or LOG_PAYLOAD_MAX_CHARS
+    
+    def __str__(self):
+        try:
+            text = json.dumps(redact(self.payload), default=str)
+        except (TypeError, ValueError):
+            text = repr(self.payload)
+        return truncate(text, self.max_chars)
+
+def truncate(text, max_chars=None):
+    """Cap a string for logging, noting how much was cut"""
+    max_chars = max_chars or LOG_PAYLOAD_MAX_CHARS
+    if text is None or len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}... [{len(text) - max_chars} more chars]"
+
+def log_event(logger, level, event, payload=None, **fields):
+    """Log an event with key=value fields and an optional payload.
+    
+    Nothing is formatted unless the logger is enabled for the level. Payloads are
+    serialized lazily and capped; below WARNING they are also sampled.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    message = '%s'
+    args = [event]
+    for key, value in fields.items():
+        message += f' {key}=%s'
+        args.append(value)
+    if payload is not None:
+        if level >= logging.WARNING or random.random() < LOG_PAYLOAD_SAMPLE_RATE:
+            message += ' payload=%s'
+            args.append(LazyJSON(payload))
+        else:
+            message += ' payload=<not sampled>'
+    logger.log(level, message, *args, extra={'event': event, 'fields': fields}, stacklevel=2)
+
+graphql_log = get_logger('graphql')
+workflow_log = get_logger('workflow_states')
+issues_log = get_logger('issues')
+writes_log = get_logger('writes')
+comments_log = get_logger('comments')
+auth_log = get_logger('auth')
+
 # Configure ngrok (if in development and available)
 NGROK_ENABLED = False  # Disable by default to avoid conflicts
 NGROK_AUTH_TOKEN = os.getenv('NGROK_AUTH_TOKEN', None)
@@ -74,6 +196,129 @@ app.logger.info(f"OAuth Redirect URI: {LINEAR_REDIRECT_URI}")
 
 # Linear API URL
 LINEAR_API_URL = 'https://api.linear.app/graphql'
+LINEAR_TOKEN_URL = 'https://api.linear.app/oauth/token'
+
+# Signed-in users' OAuth tokens are refreshed in the background once they are
+# within this many seconds of expiring, checked every interval seconds
+LINEAR_TOKEN_REFRESH_MARGIN = int(os.getenv('LINEAR_TOKEN_REFRESH_MARGIN', 300))
+LINEAR_TOKEN_REFRESH_INTERVAL = int(os.getenv('LINEAR_TOKEN_REFRESH_INTERVAL', 60))
+# SQLite file the tokens are kept in, readable by this user only, so they
+# survive restarts and are shared by every worker; set the path to an empty
+# string to hold them in memory only
+LINEAR_TOKEN_STORE_PATH = os.getenv(
+    'LINEAR_TOKEN_STORE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'linear_tokens.sqlite3')
+)
+
+# HTTP connection pool configuration for calls to Linear
+LINEAR_POOL_SIZE = int(os.getenv('LINEAR_POOL_SIZE', 10))
+LINEAR_CONNECT_TIMEOUT = float(os.getenv('LINEAR_CONNECT_TIMEOUT', 5))
+LINEAR_READ_TIMEOUT = float(os.getenv('LINEAR_READ_TIMEOUT', 30))
+
+# Each worker thread keeps its own keep-alive session so connections are reused
+# across requests without sharing a requests.Session between threads
+_http_local = threading.local()
+_pool_stats_lock = threading.Lock()
+pool_stats = {
+    'hits': 0,
+    'misses': 0,
+    'sessions': 0
+}
+
+# Client-side rate limiting: keep a reserve of Linear's per-credential request
+# and complexity budgets, and retry rate-limited calls with jittered backoff
+LINEAR_RATE_LIMIT_MIN_REQUESTS = int(os.getenv('LINEAR_RATE_LIMIT_MIN_REQUESTS', 10))
+LINEAR_RATE_LIMIT_MIN_COMPLEXITY = int(os.getenv('LINEAR_RATE_LIMIT_MIN_COMPLEXITY', 5000))
+LINEAR_RATE_LIMIT_MAX_WAIT = float(os.getenv('LINEAR_RATE_LIMIT_MAX_WAIT', 30))
+LINEAR_MAX_RETRIES = int(os.getenv('LINEAR_MAX_RETRIES', 3))
+LINEAR_BACKOFF_BASE = float(os.getenv('LINEAR_BACKOFF_BASE', 0.5))
+LINEAR_BACKOFF_MAX = float(os.getenv('LINEAR_BACKOFF_MAX', 10))
+
+# Existence cache for issues/comments targeted by writes. Writes no longer
+# verify first; set LINEAR_WRITE_PRECHECK to check existence before each write
+LINEAR_WRITE_PRECHECK = os.getenv('LINEAR_WRITE_PRECHECK', 'False').lower() in ('true', '1', 'yes')
+LINEAR_EXISTENCE_TTL = int(os.getenv('LINEAR_EXISTENCE_TTL', 300))
+LINEAR_MISSING_TTL = int(os.getenv('LINEAR_MISSING_TTL', 60))
+
+# Bulk issue updates: items per request and per GraphQL document
+LINEAR_BULK_MAX_ITEMS = int(os.getenv('LINEAR_BULK_MAX_ITEMS', 200))
+LINEAR_BULK_CHUNK_SIZE = int(os.getenv('LINEAR_BULK_CHUNK_SIZE', 20))
+
+# Response cache configuration for rarely-changing reads (teams, projects, states)
+LINEAR_CACHE_MAX_ENTRIES = int(os.getenv('LINEAR_CACHE_MAX_ENTRIES', 256))
+LINEAR_CACHE_TTLS = {
+    'teams': int(os.getenv('LINEAR_CACHE_TTL_TEAMS', 600)),
+    'projects': int(os.getenv('LINEAR_CACHE_TTL_PROJECTS', 120)),
+    'workflow_states': int(os.getenv('LINEAR_CACHE_TTL_WORKFLOW_STATES', 600)),
+    'team_members': int(os.getenv('LINEAR_CACHE_TTL_TEAM_MEMBERS', 600)),
+    'comments': int(os.getenv('LINEAR_CACHE_TTL_COMMENTS', 60))
+}
+
+# Issue pagination: page size per request and overall cap per board
+LINEAR_ISSUES_PAGE_SIZE = int(os.getenv('LINEAR_ISSUES_PAGE_SIZE', 100))
+LINEAR_ISSUES_MAX = int(os.getenv('LINEAR_ISSUES_MAX', 1000))
+
+# Page sizes for team members (issue edit form) and comments (issue page)
+LINEAR_MEMBERS_PAGE_SIZE = int(os.getenv('LINEAR_MEMBERS_PAGE_SIZE', 250))
+LINEAR_COMMENTS_PAGE_SIZE = int(os.getenv('LINEAR_COMMENTS_PAGE_SIZE', 50))
+# Open issue pages on the newest comments (loading earlier ones on demand)
+# rather than the oldest
+LINEAR_COMMENTS_NEWEST_FIRST = os.getenv('LINEAR_COMMENTS_NEWEST_FIRST', 'True').lower() in ('true', '1', 'yes')
+
+# Local SQLite issue store kept fresh by incremental sync; set the path to an
+# empty string to always read issues straight from Linear
+LINEAR_ISSUE_STORE_PATH = os.getenv(
+    'LINEAR_ISSUE_STORE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'linear_issues.sqlite3')
+)
+# Seconds between checks that every stored issue is still on its board; delta
+# syncs can't see issues moved to another team or project, or deleted (0 disables)
+LINEAR_SYNC_RECONCILE_INTERVAL = int(os.getenv('LINEAR_SYNC_RECONCILE_INTERVAL', 3600))
+# Board changes kept for /api/board_changes; older cursors get a reset
+LINEAR_BOARD_CHANGES_RETAINED = int(os.getenv('LINEAR_BOARD_CHANGES_RETAINED', 20000))
+
+# Live board feeds (/api/board_events): seconds between upstream syncs per
+# board, seconds between keepalives, and events buffered per browser
+LINEAR_FEED_POLL_INTERVAL = int(os.getenv('LINEAR_FEED_POLL_INTERVAL', 15))
+LINEAR_FEED_HEARTBEAT = int(os.getenv('LINEAR_FEED_HEARTBEAT', 20))
+LINEAR_FEED_QUEUE_SIZE = int(os.getenv('LINEAR_FEED_QUEUE_SIZE', 100))
+# Feeds nobody is subscribed to are dropped after this many idle seconds, or
+# sooner (least recently used first) once more than the max boards are held
+LINEAR_FEED_IDLE_TTL = int(os.getenv('LINEAR_FEED_IDLE_TTL', 600))
+LINEAR_FEED_MAX_BOARDS = int(os.getenv('LINEAR_FEED_MAX_BOARDS', 200))
+# Streams served by the WSGI app each hold a request thread, so at most this
+# many are open at once; further browsers poll /api/board_changes instead.
+# Streams served by asgi.py run on the event loop and aren't counted
+LINEAR_FEED_MAX_STREAMS = int(os.getenv('LINEAR_FEED_MAX_STREAMS', 20))
+
+# Activity logs (/api/get_activity): events kept in memory per board, seconds
+# between fetches of new activity from Linear, and events per page
+LINEAR_ACTIVITY_LOG_SIZE = int(os.getenv('LINEAR_ACTIVITY_LOG_SIZE', 500))
+LINEAR_ACTIVITY_REFRESH_INTERVAL = int(os.getenv('LINEAR_ACTIVITY_REFRESH_INTERVAL', 10))
+LINEAR_ACTIVITY_PAGE_SIZE = int(os.getenv('LINEAR_ACTIVITY_PAGE_SIZE', 50))
+# Logs not read for this many seconds are dropped, as are the least recently
+# used ones once more than the max boards are held
+LINEAR_ACTIVITY_LOG_IDLE_TTL = int(os.getenv('LINEAR_ACTIVITY_LOG_IDLE_TTL', 900))
+LINEAR_ACTIVITY_LOGS_MAX = int(os.getenv('LINEAR_ACTIVITY_LOGS_MAX', 200))
+
+_issue_store_local = threading.local()
+_issue_store_schema_lock = threading.Lock()
+_token_store_local = threading.local()
+
+# Linear webhooks push changes into the cache and issue store. While verified
+# deliveries keep arriving, board syncs only run as a safety net once per interval
+LINEAR_WEBHOOK_SECRET = os.getenv('LINEAR_WEBHOOK_SECRET')
+LINEAR_WEBHOOK_SYNC_INTERVAL = int(os.getenv('LINEAR_WEBHOOK_SYNC_INTERVAL', 300))
+LINEAR_WEBHOOK_MAX_AGE = int(os.getenv('LINEAR_WEBHOOK_MAX_AGE', 60))
+
+# Async mode (asgi.py): maximum concurrent connections to Linear per process
+LINEAR_ASYNC_MAX_CONNECTIONS = int(os.getenv('LINEAR_ASYNC_MAX_CONNECTIONS', 100))
+# Threads running Flask views (and any Linear calls they still make) in async mode
+LINEAR_ASYNC_WORKER_THREADS = int(os.getenv('LINEAR_ASYNC_WORKER_THREADS', 100))
+
+# Bounded worker pool for issuing independent Linear queries in parallel
+LINEAR_FETCH_WORKERS = int(os.getenv('LINEAR_FETCH_WORKERS', 8))
+_fetch_executor = ThreadPoolExecutor(max_workers=LINEAR_FETCH_WORKERS, thread_name_prefix='linear-fetch')
 
 # Configure global error handlers to return JSON for API routes
 @app.errorhandler(400)
@@ -137,19 +382,7 @@ def api_update_issue(issue_id):
             response.headers['Content-Type'] = 'application/json'
             return response, 400
             
-        update_data = {}
-        
-        if 'title' in data:
-            update_data['title'] = data['title']
-        
-        if 'description' in data:
-            update_data['description'] = data['description']
-        
-        if 'stateId' in data:
-            update_data['stateId'] = data['stateId']
-        
-        if 'assigneeId' in data:
-            update_data['assigneeId'] = data['assigneeId'] if data['assigneeId'] else None
+        update_data = issue_update_input(data)
         
         if not update_data:
             response = jsonify({
@@ -159,7 +392,17 @@ def api_update_issue(issue_id):
             response.headers['Content-Type'] = 'application/json'
             return response, 400
         
-        app.logger.info(f"Processing update for issue {issue_id} with data: {json.dumps(update_data)}")
+        # Board moves send the team, so the target column can be checked up front
+        state_error = validate_state_move(data)
+        if state_error:
+            response = jsonify({
+                'success': False, 
+                'error': state_error
+            })
+            response.headers['Content-Type'] = 'application/json'
+            return response, 400
+        
+        log_event(writes_log, logging.DEBUG, "Processing issue update", update_data, issue_id=issue_id)
         
         success, error_message = update_issue(issue_id, update_data)
         
@@ -184,6 +427,68 @@ def api_update_issue(issue_id):
         response.headers['Content-Type'] = 'application/json'
         return response, 500
 
+@csrf.exempt
+@app.route('/api/update_issues', methods=['POST'])
+def api_update_issues():
+    """Update several issues in one request, e.g. after a bulk board move"""
+    try:
+        if not request.is_json:
+            return jsonify({
+                'success': False, 
+                'error': 'Content-Type must be application/json'
+            }), 400
+        
+        data = request.json
+        items = data.get('issues') if isinstance(data, dict) else data
+        if not isinstance(items, list) or not items:
+            return jsonify({
+                'success': False, 
+                'error': 'Expected a non-empty list of issues'
+            }), 400
+        
+        if len(items) > LINEAR_BULK_MAX_ITEMS:
+            return jsonify({
+                'success': False, 
+                'error': f'At most {LINEAR_BULK_MAX_ITEMS} issues can be updated per request'
+            }), 400
+        
+        # Validate each item on its own so one bad entry doesn't fail the batch
+        results = [None] * len(items)
+        updates = []
+        update_positions = []
+        for position, item in enumerate(items):
+            issue_id = item.get('id') if isinstance(item, dict) else None
+            update_data = issue_update_input(item) if issue_id else {}
+            state_error = validate_state_move(item) if update_data else None
+            if not issue_id:
+                results[position] = {'id': issue_id, 'success': False, 'error': 'Issue id is required'}
+            elif not update_data:
+                results[position] = {'id': issue_id, 'success': False, 'error': 'No valid fields to update'}
+            elif state_error:
+                results[position] = {'id': issue_id, 'success': False, 'error': state_error}
+            else:
+                updates.append((issue_id, update_data))
+                update_positions.append(position)
+        
+        app.logger.info(f"Processing bulk update for {len(updates)} issues")
+        
+        for position, (issue_id, _update_data), (success, error_message) in zip(
+                update_positions, updates, update_issues(updates)):
+            results[position] = {'id': issue_id, 'success': success}
+            if not success:
+                results[position]['error'] = error_message
+        
+        return jsonify({
+            'success': all(result['success'] for result in results),
+            'results': results
+        })
+    except Exception as e:
+        app.logger.error(f"Unexpected error in api_update_issues: {str(e)}", exc_info=True)
+        return jsonify({
+            'success': False, 
+            'error': f"Server error: {str(e)}"
+        }), 500
+
 # Disable CSRF for API routes
 @csrf.exempt
 @app.route('/api/add_comment/<issue_id>', methods=['POST'])
@@ -209,35 +514,27 @@ def api_add_comment(issue_id):
             response.headers['Content-Type'] = 'application/json'
             return response, 400
         
-        # Check if user is authenticated
+        # Check if user is authenticated; the token manager keeps their token valid
         user = session.get('user')
-        access_token = None
-        if user and user.get('access_token'):
-            access_token = user.get('access_token')
+        access_token = user_access_token()
+        if user and not access_token:
+            response = jsonify({
+                'success': False,
+                'error': 'Your Linear session has expired. Please log in again.'
+            })
+            response.headers['Content-Type'] = 'application/json'
+            return response, 401
+        if access_token:
             app.logger.info(f"Adding comment as authenticated user: {user.get('name')}")
         else:
             app.logger.info(f"Adding comment using API key (no authenticated user)")
         
         app.logger.info(f"Attempting to add comment to issue {issue_id}")
         
-        # First verify the issue exists and get the correct ID format
-        verify_query = """
-        query VerifyIssue($id: String!) {
-            issue(id: $id) {
-                id
-                identifier
-                title
-            }
-        }
-        """
-        
-        verify_vars = {"id": issue_id}
-        verify_result = execute_query(verify_query, verify_vars, access_token)
+        # Create the comment with user token if available
+        result, not_found = create_comment(issue_id, comment, access_token)
         
-        # Log the verification
-        app.logger.info(f"Issue verification: {json.dumps(verify_result)}")
-        
-        if not verify_result or 'data' not in verify_result or not verify_result['data'].get('issue'):
+        if not_found:
             response = jsonify({
                 'success': False, 
                 'error': f"Issue with ID {issue_id} not found"
@@ -245,44 +542,7 @@ def api_add_comment(issue_id):
             response.headers['Content-Type'] = 'application/json'
             return response, 404
         
-        # Get the internal ID
-        internal_id = verify_result['data']['issue']['id']
-        
-        # Standard comment creation mutation based on Linear docs
-        mutation = """
-        mutation CommentCreate($input: CommentCreateInput!) {
-            commentCreate(input: $input) {
-                success
-                comment {
-                    id
-                    body
-                    user {
-                        id
-                        name
-                        displayName
-                    }
-                    createdAt
-                }
-            }
-        }
-        """
-        
-        variables = {
-            "input": {
-                "issueId": internal_id,
-                "body": comment
-            }
-        }
-        
-        # Log the mutation and variables for debugging
-        app.logger.info(f"Comment mutation: {mutation}")
-        app.logger.info(f"Comment variables: {json.dumps(variables)}")
-        
-        # Execute the comment creation query with user token if available
-        result = execute_query(mutation, variables, access_token)
-        
-        # Log the full result
-        app.logger.info(f"Comment creation result: {json.dumps(result)}")
+        log_event(comments_log, logging.DEBUG, "Comment creation result", result, issue_id=issue_id)
         
         # Check for GraphQL errors
         if result and 'errors' in result:
@@ -297,25 +557,28 @@ def api_add_comment(issue_id):
                 elif 'NOT_AUTHORIZED' in error.get('extensions', {}).get('type', ''):
                     app.logger.error("Not authorized - check API key permissions")
                 elif 'INVALID_TOKEN' in error.get('message', '').upper() and access_token:
-                    # Try to refresh token if it's invalid
-                    if user and user.get('refresh_token'):
-                        app.logger.info("Token appears invalid, attempting to refresh...")
-                        token_data = refresh_access_token(user['refresh_token'])
-                        if token_data and 'access_token' in token_data:
-                            # Update session with new tokens
-                            user['access_token'] = token_data['access_token']
-                            if 'refresh_token' in token_data:
-                                user['refresh_token'] = token_data['refresh_token']
-                            session['user'] = user
-                            
-                            # Try again with new token
-                            app.logger.info("Retrying with refreshed token")
-                            result = execute_query(mutation, variables, user['access_token'])
-                            
-                            # If still errors, fall back to API key
-                            if result and 'errors' in result:
-                                app.logger.warning("Still getting errors after token refresh, falling back to API key")
-                                result = execute_query(mutation, variables)
+                    # Tokens are refreshed before they expire, so this one was
+                    # revoked or replaced elsewhere; refresh it once and retry
+                    app.logger.info("Token appears invalid, attempting to refresh...")
+                    access_token = token_manager.refresh(user.get('id'), force=True)
+                    if not access_token:
+                        session.pop('user', None)
+                        session.pop('token_expiry', None)
+                        response = jsonify({
+                            'success': False,
+                            'error': 'Your Linear session has expired. Please log in again.'
+                        })
+                        response.headers['Content-Type'] = 'application/json'
+                        return response, 401
+                    
+                    # Try again with new token
+                    app.logger.info("Retrying with refreshed token")
+                    result, _not_found = create_comment(issue_id, comment, access_token)
+                    
+                    # If still errors, fall back to API key
+                    if result and 'errors' in result:
+                        app.logger.warning("Still getting errors after token refresh, falling back to API key")
+                        result, _not_found = create_comment(issue_id, comment)
             
             # If still errors after all attempts, return error
             if result and 'errors' in result:
@@ -366,33 +629,7 @@ def api_delete_issue(issue_id):
     try:
         app.logger.info(f"Processing delete request for issue {issue_id}")
         
-        # First verify the issue exists
-        verify_query = """
-        query VerifyIssue($id: String!) {
-            issue(id: $id) {
-                id
-                identifier
-                title
-            }
-        }
-        """
-        
-        verify_vars = {"id": issue_id}
-        verify_result = execute_query(verify_query, verify_vars)
-        
-        # Log the verification result
-        app.logger.info(f"Issue verification for deletion: {json.dumps(verify_result)}")
-        
-        if not verify_result or 'data' not in verify_result or not verify_result['data'].get('issue'):
-            app.logger.error(f"Issue with ID {issue_id} could not be verified for deletion")
-            response = jsonify({
-                'success': False, 
-                'error': "Issue not found"
-            })
-            response.headers['Content-Type'] = 'application/json'
-            return response, 404
-        
-        # Issue exists, perform deletion via issueArchive mutation
+        # Archive the issue directly; a missing issue surfaces as a not-found error
         mutation = """
         mutation IssueArchive($id: String!) {
             issueArchive(id: $id) {
@@ -409,15 +646,21 @@ def api_delete_issue(issue_id):
             "id": issue_id
         }
         
-        # Log the mutation
-        app.logger.info(f"Delete mutation: {mutation}")
-        app.logger.info(f"Delete variables: {json.dumps(variables)}")
+        log_event(writes_log, logging.DEBUG, "Deleting issue", variables)
         
         # Execute the delete query
-        result = execute_query(mutation, variables)
+        result, not_found = execute_write('issue', issue_id, mutation, variables)
         
-        # Log the full result
-        app.logger.info(f"Delete result: {json.dumps(result)}")
+        log_event(writes_log, logging.DEBUG, "Delete result", result, issue_id=issue_id)
+        
+        if not_found:
+            app.logger.error(f"Issue with ID {issue_id} could not be found for deletion")
+            response = jsonify({
+                'success': False, 
+                'error': "Issue not found"
+            })
+            response.headers['Content-Type'] = 'application/json'
+            return response, 404
         
         if result and 'errors' in result:
             error_messages = [error.get('message', 'Unknown error') for error in result['errors']]
@@ -436,6 +679,10 @@ def api_delete_issue(issue_id):
                   result['data']['issueArchive'].get('success'))
         
         if success:
+            invalidate_cache('projects')
+            remember_existence('issue', issue_id, False)
+            if LINEAR_ISSUE_STORE_PATH:
+                delete_stored_issue(issue_id)
             response = jsonify({'success': True})
             response.headers['Content-Type'] = 'application/json'
             return response
@@ -463,32 +710,7 @@ def api_delete_comment(comment_id):
     try:
         app.logger.info(f"Processing delete request for comment {comment_id}")
         
-        # First verify the comment exists
-        verify_query = """
-        query VerifyComment($id: String!) {
-            comment(id: $id) {
-                id
-                body
-            }
-        }
-        """
-        
-        verify_vars = {"id": comment_id}
-        verify_result = execute_query(verify_query, verify_vars)
-        
-        # Log the verification result
-        app.logger.info(f"Comment verification for deletion: {json.dumps(verify_result)}")
-        
-        if not verify_result or 'data' not in verify_result or not verify_result['data'].get('comment'):
-            app.logger.error(f"Comment with ID {comment_id} could not be verified for deletion")
-            response = jsonify({
-                'success': False, 
-                'error': "Comment not found"
-            })
-            response.headers['Content-Type'] = 'application/json'
-            return response, 404
-        
-        # Comment exists, perform deletion via commentDelete mutation
+        # Delete the comment directly; a missing comment surfaces as a not-found error
         mutation = """
         mutation CommentDelete($id: String!) {
             commentDelete(id: $id) {
@@ -501,15 +723,21 @@ def api_delete_comment(comment_id):
             "id": comment_id
         }
         
-        # Log the mutation
-        app.logger.info(f"Delete comment mutation: {mutation}")
-        app.logger.info(f"Delete comment variables: {json.dumps(variables)}")
+        log_event(writes_log, logging.DEBUG, "Deleting comment", variables)
         
         # Execute the delete query
-        result = execute_query(mutation, variables)
+        result, not_found = execute_write('comment', comment_id, mutation, variables)
         
-        # Log the full result
-        app.logger.info(f"Delete comment result: {json.dumps(result)}")
+        log_event(writes_log, logging.DEBUG, "Delete comment result", result, comment_id=comment_id)
+        
+        if not_found:
+            app.logger.error(f"Comment with ID {comment_id} could not be found for deletion")
+            response = jsonify({
+                'success': False, 
+                'error': "Comment not found"
+            })
+            response.headers['Content-Type'] = 'application/json'
+            return response, 404
         
         if result and 'errors' in result:
             error_messages = [error.get('message', 'Unknown error') for error in result['errors']]
@@ -528,6 +756,8 @@ def api_delete_comment(comment_id):
                   result['data']['commentDelete'].get('success'))
         
         if success:
+            invalidate_cache('comments')
+            remember_existence('comment', comment_id, False)
             response = jsonify({'success': True})
             response.headers['Content-Type'] = 'application/json'
             return response
@@ -548,338 +778,2102 @@ def api_delete_comment(comment_id):
         response.headers['Content-Type'] = 'application/json'
         return response, 500
 
-# Linear API helper functions
-def execute_query(query, variables=None, access_token=None):
-    """Execute a GraphQL query against the Linear API
-    
-    If access_token is provided, use that for authentication (OAuth)
-    Otherwise, use the app's API key
-    """
-    # Determine the correct Authorization header format
-    if access_token:
-        # Use the provided OAuth token
-        auth_header = f"Bearer {access_token}"
-        auth_type = "OAuth Token"
-    else:
-        # Use the app's API key 
-        if LINEAR_API_KEY and LINEAR_API_KEY.startswith('lin_'):
-            # This is a personal API key, use as is
-            auth_header = LINEAR_API_KEY
-            auth_type = "Personal API Key"
-        else:
-            # Assume this is an OAuth token, add Bearer prefix
-            auth_header = f"Bearer {LINEAR_API_KEY}"
-            auth_type = "OAuth Token"
-    
-    headers = {
-        'Authorization': auth_header,
-        'Content-Type': 'application/json'
-    }
-    
-    payload = {
-        'query': query,
-        'variables': variables or {}
-    }
-    
-    app.logger.info(f"Executing Linear API query with auth type: {auth_type}")
-    
-    try:
-        response = requests.post(LINEAR_API_URL, json=payload, headers=headers)
-        
-        if response.status_code == 200:
-            result = response.json()
-            
-            # Check for GraphQL errors
-            if 'errors' in result:
-                app.logger.error(f"GraphQL Errors: {json.dumps(result['errors'])}")
-                for error in result['errors']:
-                    app.logger.error(f"Error: {error.get('message')}, Extensions: {json.dumps(error.get('extensions', {}))}")
-                    
-            return result
-        else:
-            app.logger.error(f"API Error: Status {response.status_code}")
-            app.logger.error(f"Response text: {response.text}")
-            
-            # Try to get more details from the response
-            try:
-                error_json = response.json()
-                app.logger.error(f"Error details: {json.dumps(error_json)}")
-            except:
-                app.logger.error("Could not parse error response as JSON")
-                
-            return None
-            
-    except Exception as e:
-        app.logger.error(f"Exception in execute_query: {str(e)}")
-        app.logger.error(traceback.format_exc())
-        return None
+# HTTP connection pool helpers
+def get_http_session():
+    """Get the pooled requests session for the current worker thread
 
-def get_teams():
-    """Get all teams from Linear"""
-    query = """
-    query Teams {
-        teams {
-            nodes {
-                id
-                name
-            }
-        }
-    }
+    Sessions are created lazily, one per thread, with a bounded urllib3 pool
+    so repeated calls to Linear reuse the same TCP+TLS connection
     """
-    
-    result = execute_query(query)
-    if result and 'data' in result and 'teams' in result['data']:
-        return result['data']['teams']['nodes']
-    return []
+    http_session = getattr(_http_local, 'session', None)
+    if http_session is None:
+        http_session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=LINEAR_POOL_SIZE)
+        http_session.mount('https://', adapter)
+        http_session.mount('http://', adapter)
+        _http_local.session = http_session
+        with _pool_stats_lock:
+            pool_stats['sessions'] += 1
+    return http_session
 
-def get_projects(team_id=None):
-    """Get projects, optionally filtered by team"""
-    # First get all projects without filtering
-    query = """
-    query Projects {
-        projects {
-            nodes {
-                id
-                name
-                description
-                icon
-                color
-                state
-                startDate
-                targetDate
-                lead {
-                    id
-                    name
-                }
-                teams {
-                    nodes {
-                        id
-                        name
-                    }
-                }
-                progress
-                issues {
-                    nodes {
-                        id
-                    }
-                }
-                completedIssues: issues(filter: { state: { type: { eq: "completed" } } }) {
-                    nodes {
-                        id
-                    }
-                }
-                completedAt
-                updatedAt
-                createdAt
-            }
-        }
-    }
+def _count_pool_connections(http_session):
+    """Count the connections opened so far by a session's connection pools"""
+    total = 0
+    for adapter in http_session.adapters.values():
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                total += pool.num_connections
+    return total
+
+def linear_post(url, **kwargs):
+    """POST to a Linear endpoint through the pooled session
+
+    Applies the configured connect/read timeouts unless the caller passes its own,
+    and records whether the request reused a pooled connection (hit) or had to
+    open a new one (miss)
     """
-    
-    result = execute_query(query)
-    projects = []
-    
-    if result and 'data' in result and 'projects' in result['data']:
-        all_projects = result['data']['projects']['nodes']
-        
-        # If team_id is provided, filter projects by team
-        if team_id:
-            for project in all_projects:
-                if 'teams' in project and 'nodes' in project['teams']:
-                    for team in project['teams']['nodes']:
-                        if team['id'] == team_id:
-                            # Add teamId property for compatibility with templates
-                            project['teamId'] = team_id
-                            # Count issues manually from the nodes array
-                            project['issueCount'] = len(project.get('issues', {}).get('nodes', []))
-                            project['completedIssueCount'] = len(project.get('completedIssues', {}).get('nodes', []))
-                            
-                            # If project is completed, set progress to 100%
-                            if project.get('completedAt'):
-                                project['progress'] = 100
-                                project['completedIssueCount'] = project['issueCount']
-                                
-                            projects.append(project)
-                            break
+    http_session = get_http_session()
+    kwargs.setdefault('timeout', (LINEAR_CONNECT_TIMEOUT, LINEAR_READ_TIMEOUT))
+
+    connections_before = _count_pool_connections(http_session)
+    response = http_session.post(url, **kwargs)
+    opened = _count_pool_connections(http_session) - connections_before
+
+    with _pool_stats_lock:
+        if opened > 0:
+            pool_stats['misses'] += 1
         else:
-            # Process projects if no team_id filter
-            for project in all_projects:
-                # Count issues manually from the nodes array
-                project['issueCount'] = len(project.get('issues', {}).get('nodes', []))
-                project['completedIssueCount'] = len(project.get('completedIssues', {}).get('nodes', []))
-                
-                # If project is completed, set progress to 100%
-                if project.get('completedAt'):
-                    project['progress'] = 100
-                    project['completedIssueCount'] = project['issueCount']
+            pool_stats['hits'] += 1
+
+    return response
+
+def get_pool_stats():
+    """Get a snapshot of the connection pool counters"""
+    with _pool_stats_lock:
+        stats = dict(pool_stats)
+    total = stats['hits'] + stats['misses']
+    stats['hit_rate'] = round(stats['hits'] / total, 4) if total else 0.0
+    stats['pool_size'] = LINEAR_POOL_SIZE
+    stats['connect_timeout'] = LINEAR_CONNECT_TIMEOUT
+    stats['read_timeout'] = LINEAR_READ_TIMEOUT
+    return stats
+
+# Metrics
+# Maximum label combinations kept per metric; extra ones are folded into "__other__"
+METRICS_MAX_SERIES = int(os.getenv('METRICS_MAX_SERIES', 500))
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+class MetricsRegistry:
+    """In-process counters and histograms rendered in the Prometheus text format
+
+    Memory is bounded: histograms use fixed buckets, and each metric keeps at
+    most max_series label combinations
+    """
+
+    def __init__(self, max_series):
+        self.max_series = max_series
+        self._metrics = OrderedDict()
+        self._lock = threading.Lock()
+
+    def describe(self, name, kind, help_text, buckets=None):
+        """Register a counter or histogram"""
+        self._metrics[name] = {'kind': kind, 'help': help_text, 'buckets': buckets, 'series': OrderedDict()}
+
+    def _series(self, metric, labels):
+        """Find or create the series for a label set, respecting max_series"""
+        key = tuple(sorted((labels or {}).items()))
+        series = metric['series']
+        if key not in series and len(series) >= self.max_series:
+            key = tuple((name, '__other__') for name, _value in key)
+        if key not in series:
+            if metric['kind'] == 'histogram':
+                series[key] = {'buckets': [0] * len(metric['buckets']), 'sum': 0.0, 'count': 0}
+            else:
+                series[key] = 0
+        return key
+
+    def inc(self, name, labels=None, value=1):
+        """Increment a counter"""
+        metric = self._metrics[name]
+        with self._lock:
+            key = self._series(metric, labels)
+            metric['series'][key] += value
+
+    def observe(self, name, value, labels=None):
+        """Record a value in a histogram"""
+        metric = self._metrics[name]
+        with self._lock:
+            key = self._series(metric, labels)
+            series = metric['series'][key]
+            for index, bound in enumerate(metric['buckets']):
+                if value <= bound:
+                    series['buckets'][index] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def render(self, extra=()):
+        """Render all metrics, plus (name, kind, help, samples) tuples from other stats"""
+        lines = []
+        with self._lock:
+            for name, metric in self._metrics.items():
+                lines.append(f"# HELP {name} {metric['help']}")
+                lines.append(f"# TYPE {name} {metric['kind']}")
+                for key, series in metric['series'].items():
+                    labels = dict(key)
+                    if metric['kind'] != 'histogram':
+                        lines.append(f"{name}{format_labels(labels)} {series}")
+                        continue
+                    for bound, count in zip(metric['buckets'], series['buckets']):
+                        lines.append(f"{name}_bucket{format_labels(dict(labels, le=bound))} {count}")
+                    lines.append(f"{name}_bucket{format_labels(dict(labels, le='+Inf'))} {series['count']}")
+                    lines.append(f"{name}_sum{format_labels(labels)} {round(series['sum'], 6)}")
+                    lines.append(f"{name}_count{format_labels(labels)} {series['count']}")
+        for name, kind, help_text, samples in extra:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{format_labels(labels)} {value}")
+        return '\n'.join(lines) + '\n'
+
+def format_labels(labels):
+    """Format a label dict as {name="value",...}"""
+    if not labels:
+        return ''
+    pairs = []
+    for name, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+metrics = MetricsRegistry(METRICS_MAX_SERIES)
+metrics.describe('linear_query_duration_seconds', 'histogram',
+                 'Latency of Linear GraphQL requests, including rate-limit retries', LATENCY_BUCKETS)
+metrics.describe('linear_query_response_bytes', 'histogram',
+                 'Size of Linear GraphQL response bodies', SIZE_BUCKETS)
+metrics.describe('linear_queries_total', 'counter', 'Linear GraphQL requests by operation and HTTP status')
+metrics.describe('linear_query_errors_total', 'counter', 'GraphQL errors returned by Linear')
+metrics.describe('linear_cache_lookups_total', 'counter', 'Response cache lookups by entity and result')
+metrics.describe('http_request_duration_seconds', 'histogram', 'Flask request latency by route', LATENCY_BUCKETS)
+metrics.describe('http_requests_total', 'counter', 'Flask requests by route and status')
+
+def operation_name(query):
+    """Get the operation name of a GraphQL document, for tagging metrics"""
+    match = re.match(r'\s*(?:query|mutation|subscription)\s+(\w+)', query)
+    return match.group(1) if match else 'anonymous'
+
+def record_query_metrics(operation, duration, status, response_bytes=0, errors=0):
+    """Record the latency, size and outcome of one Linear request"""
+    labels = {'operation': operation}
+    metrics.observe('linear_query_duration_seconds', duration, labels)
+    metrics.inc('linear_queries_total', {'operation': operation, 'status': status})
+    if response_bytes:
+        metrics.observe('linear_query_response_bytes', response_bytes, labels)
+    if errors:
+        metrics.inc('linear_query_errors_total', labels, errors)
+
+# Rate limit scheduler
+class RateLimitScheduler:
+    """Track Linear's rate-limit budgets per credential and delay calls that would exhaust them
+
+    Budgets are read from the X-RateLimit-* response headers. Each call reserves
+    one request from the known budget, so concurrent workers don't all spend the
+    last few requests before a reset
+    """
+
+    def __init__(self):
+        self._budgets = {}
+        self._lock = threading.Lock()
+        self.throttled_requests = 0
+        self.throttled_seconds = 0.0
+        self.rate_limited_responses = 0
+        self.retries = 0
+
+    def acquire(self, identity):
+        """Wait, if needed, until the credential's budget allows another call"""
+        wait = self.reserve(identity)
+        if wait > 0:
+            self.throttle(wait)
+
+    async def acquire_async(self, identity):
+        """Like acquire, but waits on the event loop instead of blocking the thread"""
+        wait = self.reserve(identity)
+        if wait > 0:
+            await self.throttle_async(wait)
+
+    def reserve(self, identity):
+        """Reserve one call from the credential's budget and return how long to wait first"""
+        wait = 0.0
+        with self._lock:
+            budget = self._budgets.get(identity)
+            if budget:
+                now = time.time()
+                if budget['requests_remaining'] is not None:
+                    if budget['requests_remaining'] <= LINEAR_RATE_LIMIT_MIN_REQUESTS and budget['requests_reset'] > now:
+                        wait = max(wait, budget['requests_reset'] - now)
+                    budget['requests_remaining'] -= 1
+                if budget['complexity_remaining'] is not None:
+                    if budget['complexity_remaining'] <= LINEAR_RATE_LIMIT_MIN_COMPLEXITY and budget['complexity_reset'] > now:
+                        wait = max(wait, budget['complexity_reset'] - now)
+        return min(wait, LINEAR_RATE_LIMIT_MAX_WAIT)
+
+    def record_response(self, identity, response):
+        """Update the credential's budget from a response's rate-limit headers"""
+        headers = response.headers
+
+        def header_number(name):
+            try:
+                return float(headers[name])
+            except (KeyError, TypeError, ValueError):
+                return None
+
+        requests_remaining = header_number('X-RateLimit-Requests-Remaining')
+        complexity_remaining = header_number('X-RateLimit-Complexity-Remaining')
+        if requests_remaining is None and complexity_remaining is None:
+            return
+
+        # Reset headers are UTC epoch milliseconds
+        requests_reset = header_number('X-RateLimit-Requests-Reset')
+        complexity_reset = header_number('X-RateLimit-Complexity-Reset')
+        with self._lock:
+            self._budgets[identity] = {
+                'requests_limit': header_number('X-RateLimit-Requests-Limit'),
+                'requests_remaining': requests_remaining,
+                'requests_reset': requests_reset / 1000 if requests_reset else 0,
+                'complexity_limit': header_number('X-RateLimit-Complexity-Limit'),
+                'complexity_remaining': complexity_remaining,
+                'complexity_reset': complexity_reset / 1000 if complexity_reset else 0,
+                'last_complexity': header_number('X-Complexity')
+            }
+
+    def retry_delay(self, identity, attempt, response):
+        """Get how long to wait before retrying a rate-limited call"""
+        with self._lock:
+            self.rate_limited_responses += 1
+            self.retries += 1
+            budget = self._budgets.get(identity) or {}
+
+        retry_after = response.headers.get('Retry-After')
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), LINEAR_RATE_LIMIT_MAX_WAIT)
+
+        # Full jitter on an exponential backoff, but never retry before a known reset
+        delay = random.uniform(0, min(LINEAR_BACKOFF_MAX, LINEAR_BACKOFF_BASE * (2 ** attempt)))
+        reset = max(budget.get('requests_reset', 0), budget.get('complexity_reset', 0))
+        if reset > time.time():
+            delay = max(delay, reset - time.time())
+        return min(delay, LINEAR_RATE_LIMIT_MAX_WAIT)
+
+    def throttle(self, seconds):
+        """Sleep for a throttling delay and account for it"""
+        time.sleep(seconds)
+        self._count_throttle(seconds)
+
+    async def throttle_async(self, seconds):
+        """Wait out a throttling delay on the event loop and account for it"""
+        await asyncio.sleep(seconds)
+        self._count_throttle(seconds)
+
+    def _count_throttle(self, seconds):
+        with self._lock:
+            self.throttled_requests += 1
+            self.throttled_seconds += seconds
+
+    def stats(self):
+        """Get throttling counters and the last known budget per credential"""
+        with self._lock:
+            return {
+                'throttled_requests': self.throttled_requests,
+                'throttled_seconds': round(self.throttled_seconds, 3),
+                'rate_limited_responses': self.rate_limited_responses,
+                'retries': self.retries,
+                'budgets': {identity: dict(budget) for identity, budget in self._budgets.items()}
+            }
+
+rate_limiter = RateLimitScheduler()
+
+def is_rate_limited(response):
+    """Check for an HTTP 429 or a GraphQL RATELIMITED error"""
+    if response.status_code == 429:
+        return True
+    if response.status_code == 400:
+        try:
+            body = response.json()
+        except ValueError:
+            return False
+        for error in body.get('errors') or []:
+            if (error.get('extensions') or {}).get('code') == 'RATELIMITED':
+                return True
+    return False
+
+# Request coalescing
+class SingleFlight:
+    """Collapse identical concurrent calls into one
+
+    While a call for a key is in flight, other callers with the same key wait
+    for it and receive their own copy of its result instead of calling again
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+
+    def do(self, key, func):
+        """Run func for key, or wait for the in-flight call with the same key"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = {'event': threading.Event(), 'waiters': 0, 'result': None}
+                self._calls[key] = call
+                self.leaders += 1
+            else:
+                call['waiters'] += 1
+                self.coalesced += 1
+
+        if not leader:
+            call['event'].wait()
+            return copy.deepcopy(call['result'])
+
+        result = None
+        try:
+            result = func()
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+                # Waiters get a snapshot taken before the leader can mutate its result
+                if call['waiters']:
+                    call['result'] = copy.deepcopy(result)
+            call['event'].set()
+
+    def stats(self):
+        """Get the number of upstream calls made and callers that shared one"""
+        with self._lock:
+            return {
+                'upstream_calls': self.leaders,
+                'coalesced_calls': self.coalesced,
+                'in_flight': len(self._calls)
+            }
+
+single_flight = SingleFlight()
+
+# Response cache
+class ResponseCache:
+    """Thread-safe LRU cache whose entries expire after a per-entry TTL
+
+    Entries are tagged with an entity name (e.g. 'projects') so a whole class of
+    cached responses can be dropped when a mutation makes them stale
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """Return (found, value) for a key, counting the lookup as a hit or miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            value, expires_at, _entity = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def set(self, key, value, ttl, entity=None):
+        """Store a value, evicting the least recently used entries past max_entries"""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl, entity)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *entities):
+        """Drop cached entries for the given entities, or everything if none are given"""
+        with self._lock:
+            if not entities:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+            stale_keys = [key for key, entry in self._entries.items() if entry[2] in entities]
+            for key in stale_keys:
+                del self._entries[key]
+            return len(stale_keys)
+
+    def update(self, entity, func, key=None):
+        """Apply func to cached values in place, keeping their expiry
+
+        Updates the entry for key, or every entry tagged with entity when no key
+        is given. Returns the number of entries updated
+        """
+        with self._lock:
+            if key is not None:
+                keys = [key] if key in self._entries else []
+            else:
+                keys = [k for k, entry in self._entries.items() if entry[2] == entity]
+            for k in keys:
+                func(self._entries[k][0])
+            return len(keys)
+
+    def stats(self):
+        """Get hit/miss counters and the current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'size': len(self._entries),
+                'max_entries': self.max_entries
+            }
+
+response_cache = ResponseCache(LINEAR_CACHE_MAX_ENTRIES)
+
+def auth_identity(access_token=None):
+    """Get a short, non-reversible identifier for the credentials used on a request"""
+    credential = access_token or LINEAR_API_KEY or ''
+    return hashlib.sha256(credential.encode('utf-8')).hexdigest()[:16]
+
+def _cache_key(query, variables=None, access_token=None):
+    """Build the response cache key for a query"""
+    return (query, json.dumps(variables or {}, sort_keys=True), auth_identity(access_token))
+
+def cache_lookup(query, variables=None, access_token=None, entity=None):
+    """Return a copy of the cached response for a query, or None on a miss"""
+    found, result = response_cache.get(_cache_key(query, variables, access_token))
+    metrics.inc('linear_cache_lookups_total', {'entity': entity or 'unknown', 'result': 'hit' if found else 'miss'})
+    return copy.deepcopy(result) if found else None
+
+def cache_store(entity, query, variables, result, access_token=None):
+    """Cache a successful response under the key of the query that produced it"""
+    if result and 'data' in result and 'errors' not in result:
+        response_cache.set(_cache_key(query, variables, access_token), copy.deepcopy(result),
+                           LINEAR_CACHE_TTLS[entity], entity)
+
+def cache_update(entity, func, query=None, variables=None):
+    """Patch cached API-key responses in place, for one query or a whole entity"""
+    key = _cache_key(query, variables) if query is not None else None
+    return response_cache.update(entity, func, key)
+
+def cached_query(entity, query, variables=None, access_token=None):
+    """Execute a read query through the response cache
+
+    The cache key is (query, variables, auth identity) and the TTL comes from
+    LINEAR_CACHE_TTLS[entity]. Only successful responses are cached, and callers
+    always receive their own copy so they can annotate results freely
+    """
+    result = cache_lookup(query, variables, access_token, entity)
+    if result is not None:
+        return result
+
+    result = execute_query(query, variables, access_token)
+    cache_store(entity, query, variables, result, access_token)
+    return result
+
+def invalidate_cache(*entities):
+    """Invalidate cached responses after a mutation"""
+    removed = response_cache.invalidate(*entities)
+    if not entities or 'workflow_states' in entities:
+        workflow_orderings.invalidate()
+    if removed:
+        app.logger.info(f"Invalidated {removed} cached responses for {', '.join(entities) or 'all entities'}")
+
+# Write pipeline
+existence_cache = ResponseCache(LINEAR_CACHE_MAX_ENTRIES * 4)
+
+VERIFY_QUERIES = {
+    'issue': """
+    query VerifyIssue($id: String!) {
+        issue(id: $id) {
+            id
+        }
+    }
+    """,
+    'comment': """
+    query VerifyComment($id: String!) {
+        comment(id: $id) {
+            id
+        }
+    }
+    """
+}
+
+def remember_existence(entity, entity_id, exists):
+    """Record whether an issue or comment exists, with a shorter TTL for misses"""
+    ttl = LINEAR_EXISTENCE_TTL if exists else LINEAR_MISSING_TTL
+    existence_cache.set((entity, entity_id), exists, ttl, entity)
+
+def entity_exists(entity, entity_id, access_token=None):
+    """Check whether an issue or comment exists, using the existence cache first"""
+    found, exists = existence_cache.get((entity, entity_id))
+    if found:
+        return exists
+    
+    result = execute_query(VERIFY_QUERIES[entity], {"id": entity_id}, access_token)
+    if not result or 'data' not in result:
+        # Unknown, e.g. the request failed; let the write itself decide
+        return True
+    exists = bool(result['data'].get(entity))
+    remember_existence(entity, entity_id, exists)
+    return exists
+
+def is_not_found_error(result):
+    """Check whether a GraphQL response carries a "not found" error
+
+    The error may be about any entity the request referenced (a stateId or
+    assigneeId as much as the target), so use confirm_missing() before treating
+    the target as gone
+    """
+    for error in (result or {}).get('errors') or []:
+        extensions = error.get('extensions') or {}
+        messages = [error.get('message') or '', extensions.get('userPresentableMessage') or '']
+        if any('not found' in message.lower() for message in messages):
+            return True
+    return False
+
+def confirm_missing(entity, entity_id, access_token=None):
+    """Check with Linear, bypassing the existence cache, that an issue or comment is gone
+
+    Only a successful lookup that returns no entity counts as missing; the
+    answer is remembered either way
+    """
+    result = execute_query(VERIFY_QUERIES[entity], {"id": entity_id}, access_token)
+    if not result or 'data' not in result:
+        return False
+    exists = bool(result['data'].get(entity))
+    remember_existence(entity, entity_id, exists)
+    return not exists
+
+def execute_write(entity, entity_id, mutation, variables, access_token=None):
+    """Send a mutation targeting one issue or comment without a verify round trip
+
+    Returns (result, not_found). Entities recently seen missing are rejected
+    without calling Linear, and with LINEAR_WRITE_PRECHECK enabled existence is
+    checked first (through the existence cache). Otherwise a "not found" error
+    from the mutation is checked with a verify query, since it may refer to
+    another id in the variables rather than the target
+    """
+    found, exists = existence_cache.get((entity, entity_id))
+    if found and not exists:
+        return None, True
+    if LINEAR_WRITE_PRECHECK and not found and not entity_exists(entity, entity_id, access_token):
+        return None, True
+    
+    result = execute_query(mutation, variables, access_token)
+    if is_not_found_error(result):
+        return result, confirm_missing(entity, entity_id, access_token)
+    if result and result.get('data') and 'errors' not in result:
+        remember_existence(entity, entity_id, True)
+    return result, False
+
+# Concurrent fetch helpers
+def submit_fetch(func, *args, **kwargs):
+    """Run a fetch function on the shared worker pool and return its future"""
+    return _fetch_executor.submit(func, *args, **kwargs)
+
+def fetch_concurrently(calls):
+    """Run independent fetch calls in parallel and wait for all of them
+
+    calls maps a result name to a (func, *args) tuple; the returned dict maps the
+    same names to each call's result, so total latency is that of the slowest call
+    """
+    futures = {name: submit_fetch(call[0], *call[1:]) for name, call in calls.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+# Linear API helper functions
+def is_mutation(query):
+    """Check whether a GraphQL document is a mutation"""
+    return query.lstrip().startswith('mutation')
+
+def execute_query(query, variables=None, access_token=None):
+    """Execute a GraphQL query against the Linear API
+    
+    If access_token is provided, use that for authentication (OAuth)
+    Otherwise, use the app's API key
+    
+    Identical reads issued concurrently (same query, variables and credentials)
+    share a single upstream call. Mutations are always sent individually
+    """
+    if is_mutation(query):
+        return _send_query(query, variables, access_token)
+    
+    key = (query, json.dumps(variables or {}, sort_keys=True), auth_identity(access_token))
+    return single_flight.do(key, lambda: _send_query(query, variables, access_token))
+
+def _query_request(query, variables=None, access_token=None):
+    """Build the headers and JSON payload for a Linear GraphQL request"""
+    # Determine the correct Authorization header format
+    if access_token:
+        # Use the provided OAuth token
+        auth_header = f"Bearer {access_token}"
+        auth_type = "OAuth Token"
+    else:
+        # Use the app's API key
+        if LINEAR_API_KEY and LINEAR_API_KEY.startswith('lin_'):
+            # This is a personal API key, use as is
+            auth_header = LINEAR_API_KEY
+            auth_type = "Personal API Key"
+        else:
+            # Assume this is an OAuth token, add Bearer prefix
+            auth_header = f"Bearer {LINEAR_API_KEY}"
+            auth_type = "OAuth Token"
+
+    headers = {
+        'Authorization': auth_header,
+        'Content-Type': 'application/json'
+    }
+
+    payload = {
+        'query': query,
+        'variables': variables or {}
+    }
+
+    graphql_log.debug("Executing Linear API query with auth type: %s", auth_type)
+    return headers, payload
+
+def _query_result(response):
+    """Get the result (or None) and GraphQL error count from a Linear response"""
+    if response.status_code == 200:
+        result = response.json()
+
+        # Check for GraphQL errors
+        if 'errors' in result:
+            log_event(graphql_log, logging.ERROR, "GraphQL errors", result['errors'],
+                      count=len(result['errors']))
+            return result, len(result['errors'])
+        return result, 0
+
+    # Try to get more details from the response
+    try:
+        error_json = response.json()
+    except ValueError:
+        log_event(graphql_log, logging.ERROR, "Linear API error", status=response.status_code,
+                  body=truncate(response.text))
+        return None, 0
+    log_event(graphql_log, logging.ERROR, "Linear API error", error_json, status=response.status_code)
+
+    # GraphQL errors (e.g. validation or not-found) come back with a 4xx
+    # status; hand them to the caller like errors on a 200 response
+    if isinstance(error_json, dict) and error_json.get('errors'):
+        return error_json, len(error_json['errors'])
+    return None, 0
+
+def _send_query(query, variables=None, access_token=None):
+    """Send a GraphQL request to Linear, retrying when rate limited"""
+    headers, payload = _query_request(query, variables, access_token)
+
+    identity = auth_identity(access_token)
+    operation = operation_name(query)
+    started = time.perf_counter()
+    status = 'exception'
+    response_bytes = 0
+    errors = 0
+    try:
+        for attempt in range(LINEAR_MAX_RETRIES + 1):
+            rate_limiter.acquire(identity)
+            response = linear_post(LINEAR_API_URL, json=payload, headers=headers)
+            rate_limiter.record_response(identity, response)
+
+            if not is_rate_limited(response) or attempt == LINEAR_MAX_RETRIES:
+                break
+            delay = rate_limiter.retry_delay(identity, attempt, response)
+            graphql_log.warning("Rate limited by Linear, retrying in %.2fs (attempt %d of %d)",
+                                delay, attempt + 1, LINEAR_MAX_RETRIES)
+            rate_limiter.throttle(delay)
+
+        status = str(response.status_code)
+        response_bytes = len(response.content)
+        result, errors = _query_result(response)
+        return result
+
+    except Exception as e:
+        graphql_log.exception("Exception in execute_query: %s", e)
+        return None
+    finally:
+        record_query_metrics(operation, time.perf_counter() - started, status, response_bytes, errors)
+
+# Async execution, used by the ASGI entry point (asgi.py). Requests share the
+# rate limiter, metrics and response handling with _send_query, but wait on the
+# event loop instead of holding a worker thread
+_async_client = {'client': None, 'loop': None}
+
+def get_async_http_client():
+    """Get the pooled httpx client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    if _async_client['client'] is None or _async_client['loop'] is not loop:
+        _async_client['client'] = httpx.AsyncClient(
+            timeout=httpx.Timeout(LINEAR_READ_TIMEOUT, connect=LINEAR_CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=LINEAR_ASYNC_MAX_CONNECTIONS,
+                                max_keepalive_connections=LINEAR_ASYNC_MAX_CONNECTIONS)
+        )
+        _async_client['loop'] = loop
+    return _async_client['client']
+
+async def close_async_http_client():
+    """Close the async client, e.g. at ASGI shutdown"""
+    client = _async_client['client']
+    _async_client['client'] = _async_client['loop'] = None
+    if client is not None:
+        await client.aclose()
+
+class AsyncSingleFlight:
+    """Event-loop counterpart of SingleFlight: concurrent identical reads share one call"""
+
+    def __init__(self):
+        self._calls = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key, func):
+        """Await func() once per key at a time; concurrent callers get a copy of its result"""
+        call = self._calls.get(key)
+        if call is not None:
+            self.coalesced += 1
+            call['waiters'] += 1
+            return copy.deepcopy(await asyncio.shield(call['future']))
+
+        call = {'future': asyncio.get_running_loop().create_future(), 'waiters': 0}
+        self._calls[key] = call
+        self.leaders += 1
+        try:
+            result = await func()
+        except BaseException as e:
+            call['future'].set_exception(e)
+            # Mark the exception retrieved so an unwaited future doesn't warn
+            call['future'].exception()
+            raise
+        finally:
+            del self._calls[key]
+        # Waiters copy a snapshot taken before the leader can mutate its result
+        call['future'].set_result(copy.deepcopy(result) if call['waiters'] else result)
+        return result
+
+    def stats(self):
+        """Get the number of upstream calls made and callers that shared one"""
+        return {
+            'upstream_calls': self.leaders,
+            'coalesced_calls': self.coalesced,
+            'in_flight': len(self._calls)
+        }
+
+async_single_flight = AsyncSingleFlight()
+
+async def async_execute_query(query, variables=None, access_token=None):
+    """Async counterpart of execute_query, for requests served by asgi.py"""
+    if is_mutation(query):
+        return await _async_send_query(query, variables, access_token)
+
+    key = (query, json.dumps(variables or {}, sort_keys=True), auth_identity(access_token))
+    return await async_single_flight.do(key, lambda: _async_send_query(query, variables, access_token))
+
+async def _async_send_query(query, variables=None, access_token=None):
+    """Send a GraphQL request to Linear with the async client, retrying when rate limited"""
+    headers, payload = _query_request(query, variables, access_token)
+
+    identity = auth_identity(access_token)
+    operation = operation_name(query)
+    started = time.perf_counter()
+    status = 'exception'
+    response_bytes = 0
+    errors = 0
+    try:
+        client = get_async_http_client()
+        for attempt in range(LINEAR_MAX_RETRIES + 1):
+            await rate_limiter.acquire_async(identity)
+            response = await client.post(LINEAR_API_URL, json=payload, headers=headers)
+            rate_limiter.record_response(identity, response)
+
+            if not is_rate_limited(response) or attempt == LINEAR_MAX_RETRIES:
+                break
+            delay = rate_limiter.retry_delay(identity, attempt, response)
+            graphql_log.warning("Rate limited by Linear, retrying in %.2fs (attempt %d of %d)",
+                                delay, attempt + 1, LINEAR_MAX_RETRIES)
+            await rate_limiter.throttle_async(delay)
+
+        status = str(response.status_code)
+        response_bytes = len(response.content)
+        result, errors = _query_result(response)
+        return result
+
+    except Exception as e:
+        graphql_log.exception("Exception in async_execute_query: %s", e)
+        return None
+    finally:
+        record_query_metrics(operation, time.perf_counter() - started, status, response_bytes, errors)
+
+# Results fetched on the event loop by asgi.py before a Flask view runs. Views
+# use them instead of repeating the same Linear call synchronously
+prefetched_results = contextvars.ContextVar('prefetched_results', default=None)
+
+def prefetched(name):
+    """Get a result prefetched for the current request, if any"""
+    results = prefetched_results.get()
+    return results.get(name) if results else None
+
+def get_teams():
+    """Get all teams from Linear"""
+    query = """
+    query Teams {
+        teams {
+            nodes {
+                id
+                name
+            }
+        }
+    }
+    """
+    
+    result = cached_query('teams', query)
+    if result and 'data' in result and 'teams' in result['data']:
+        return result['data']['teams']['nodes']
+    return []
+
+# Query documents are kept as (variable definitions, selection) pairs so the
+# same selection can be sent alone or merged into a combined document
+def build_query(operation_name, variable_definitions, selection):
+    """Build a single-root GraphQL query document"""
+    if variable_definitions:
+        return f"query {operation_name}({variable_definitions}) {{\n    {selection.strip()}\n}}"
+    return f"query {operation_name} {{\n    {selection.strip()}\n}}"
+
+def compose_queries(operation_name, parts, operation='query'):
+    """Merge several single-root selections into one aliased GraphQL document
+
+    parts maps an alias to a (variable_definitions, selection, variables) tuple.
+    Each part's variables are prefixed with its alias, so parts can reuse a
+    variable name with different types. operation is 'query' or 'mutation'.
+    Returns (query, variables)
+    """
+    definitions = []
+    selections = []
+    merged_variables = {}
+    
+    for alias, (variable_definitions, selection, variables) in parts.items():
+        def namespace(text):
+            return re.sub(r'\$(\w+)', lambda match: f"${alias}_{match.group(1)}", text)
+        
+        if variable_definitions:
+            definitions.append(namespace(variable_definitions))
+        selections.append(f"{alias}: {namespace(selection).strip()}")
+        for name, value in (variables or {}).items():
+            merged_variables[f"{alias}_{name}"] = value
+    
+    body = "\n    ".join(selections)
+    if definitions:
+        query = f"{operation} {operation_name}({', '.join(definitions)}) {{\n    {body}\n}}"
+    else:
+        query = f"{operation} {operation_name} {{\n    {body}\n}}"
+    return query, merged_variables
+
+def split_composed_result(result, parts):
+    """Split a composed response back into one single-query response per alias
+
+    Each returned value has the shape the part's own query would have produced,
+    i.e. {'data': {<root field>: ...}}, or None if that part failed
+    """
+    split = {}
+    for alias, (_variable_definitions, selection, _variables) in parts.items():
+        root_field = re.match(r'\s*(\w+)', selection).group(1)
+        if result and result.get('data') and result['data'].get(alias) is not None:
+            split[alias] = {'data': {root_field: result['data'][alias]}}
+        else:
+            split[alias] = None
+    return split
+
+# Project list fields. Issue totals come from the last entry of Linear's count
+# history rather than from full issue id lists, so payload size doesn't grow
+# with the number of issues in each project. The history is sampled weekly, so
+# these are snapshot counts that can lag recent changes; progress is live
+PROJECT_LIST_FIELDS = """
+            id
+            name
+            description
+            icon
+            color
+            state
+            startDate
+            targetDate
+            lead {
+                id
+                name
+            }
+            teams {
+                nodes {
+                    id
+                    name
+                }
+            }
+            progress
+            issueCountHistory
+            completedIssueCountHistory
+            completedAt
+            updatedAt
+            createdAt
+"""
+
+PROJECTS_VARIABLES = ""
+PROJECTS_SELECTION = """
+    projects {
+        nodes {%s}
+    }
+""" % PROJECT_LIST_FIELDS
+PROJECTS_QUERY = build_query('Projects', PROJECTS_VARIABLES, PROJECTS_SELECTION)
+
+# Projects filtered by team on the server instead of in Python
+TEAM_PROJECTS_VARIABLES = "$teamId: String!"
+TEAM_PROJECTS_SELECTION = """
+    team(id: $teamId) {
+        projects {
+            nodes {%s}
+        }
+    }
+""" % PROJECT_LIST_FIELDS
+TEAM_PROJECTS_QUERY = build_query('TeamProjects', TEAM_PROJECTS_VARIABLES, TEAM_PROJECTS_SELECTION)
+
+# Single project lookup with just the fields pages show in headers
+PROJECT_VARIABLES = "$projectId: String!"
+PROJECT_SELECTION = """
+    project(id: $projectId) {
+        id
+        name
+        icon
+        color
+        state
+    }
+"""
+PROJECT_QUERY = build_query('Project', PROJECT_VARIABLES, PROJECT_SELECTION)
+
+def _latest_count(history):
+    """Get the latest weekly snapshot from one of Linear's count history arrays"""
+    return int(history[-1]) if history else 0
+
+def summarize_project(project, team_id=None):
+    """Add the issue counts and team id the templates expect to a project
+
+    The counts are Linear's latest weekly snapshot, flagged with
+    issueCountIsSnapshot so pages don't present them as live
+    """
+    if team_id:
+        # Add teamId property for compatibility with templates
+        project['teamId'] = team_id
+    project['issueCount'] = _latest_count(project.pop('issueCountHistory', None))
+    project['completedIssueCount'] = _latest_count(project.pop('completedIssueCountHistory', None))
+    project['issueCountIsSnapshot'] = True
+    
+    # If project is completed, set progress to 100%
+    if project.get('completedAt'):
+        project['progress'] = 100
+        project['completedIssueCount'] = project['issueCount']
+    return project
+
+def projects_from_result(result, team_id=None):
+    """Turn a Projects or TeamProjects response into the project list"""
+    if not result or 'data' not in result:
+        return []
+    
+    data = result['data']
+    if data.get('team') and data['team'].get('projects'):
+        all_projects = data['team']['projects']['nodes']
+    elif data.get('projects'):
+        all_projects = data['projects']['nodes']
+    else:
+        return []
+    
+    return [summarize_project(project, team_id) for project in all_projects]
+
+def get_projects(team_id=None):
+    """Get projects, optionally filtered by team on the server"""
+    if team_id:
+        result = cached_query('projects', TEAM_PROJECTS_QUERY, {"teamId": team_id})
+    else:
+        result = cached_query('projects', PROJECTS_QUERY)
+    return projects_from_result(result, team_id)
+
+def project_from_result(result):
+    """Get the project from a Project response, or None if it wasn't found"""
+    if result and 'data' in result and result['data'].get('project'):
+        return result['data']['project']
+    return None
+
+def get_project(project_id):
+    """Get a single project by id without downloading the whole project list"""
+    result = cached_query('projects', PROJECT_QUERY, {"projectId": project_id})
+    return project_from_result(result)
+
+WORKFLOW_STATES_VARIABLES = "$teamId: String!"
+WORKFLOW_STATES_SELECTION = """
+    team(id: $teamId) {
+        states {
+            nodes {
+                id
+                name
+                color
+                position
+                type
+            }
+        }
+    }
+"""
+WORKFLOW_STATES_QUERY = build_query('WorkflowStates', WORKFLOW_STATES_VARIABLES, WORKFLOW_STATES_SELECTION)
+
+# Board column group for each of Linear's standard state types
+WORKFLOW_STATE_GROUPS = {
+    'backlog': 0,
+    'unstarted': 1,
+    'started': 2,
+    'completed': 3,
+    'canceled': 4
+}
+
+def workflow_states_from_result(result):
+    """Turn a WorkflowStates response into the board's ordered column list"""
+    if result and 'data' in result and result['data'].get('team') and 'states' in result['data']['team']:
+        states = result['data']['team']['states']['nodes']
+        
+        # Get a snapshot of states for debugging
+        log_event(workflow_log, logging.DEBUG, "Workflow states before sorting", states, count=len(states))
+        
+        # Rank of each position in the sequence, for states of unknown type
+        position_index = {}
+        if any((state.get('type') or '').lower() not in WORKFLOW_STATE_GROUPS for state in states):
+            sorted_positions = sorted(float(state.get('position', 0)) for state in states)
+            for index, position in enumerate(sorted_positions):
+                position_index.setdefault(position, index)
+        
+        # Classify each state based on Linear's state types and fallback to position
+        total_states = len(states)
+        for state in states:
+            group_order = WORKFLOW_STATE_GROUPS.get((state.get('type') or '').lower())
+            if group_order is None:
+                if total_states > 1:
+                    # Normalize the state's rank to a 0-4 scale
+                    rank = position_index[float(state.get('position', 0))]
+                    group_order = min(4, int(rank * 5 / total_states))
+                else:
+                    group_order = 1  # Default to unstarted for a single state
             
-            projects = all_projects
+            state['group_order'] = group_order
             
-    return projects
+        # Sort by group order first, then by position within group
+        sorted_states = sorted(states, key=lambda x: (
+            x.get('group_order', 99),
+            float(x.get('position', 0))
+        ))
+        
+        # Log the sorted result
+        log_event(workflow_log, logging.DEBUG, "Workflow states after sorting", sorted_states)
+        
+        return sorted_states
+    return []
+
+class WorkflowOrderingCache:
+    """Ordered board columns per team, computed once per version of the team's states
+
+    A team's version is bumped whenever its states change (WorkflowState
+    webhooks, cache invalidation), which discards the stored ordering. Orderings
+    also expire with the workflow_states cache TTL. Each ordering carries a
+    state_id -> column index map for O(1) lookups. Orderings are shared between
+    requests, so callers must not modify them
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._entries = {}
+        self._versions = {}
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def version(self, team_id):
+        """Get the team's current version, to pass to build()"""
+        with self._lock:
+            return self._versions.get(team_id, 0)
+
+    def current(self, team_id):
+        """Get the team's ordering if it's up to date, else None"""
+        with self._lock:
+            entry = self._entries.get(team_id)
+            if (entry and entry['version'] == self._versions.get(team_id, 0)
+                    and entry['expires_at'] > time.monotonic()):
+                return entry
+            return None
+
+    def build(self, team_id, states_result, version):
+        """Order a team's states and keep the result unless its version moved on meanwhile"""
+        states = workflow_states_from_result(states_result)
+        entry = {
+            'version': version,
+            'states': states,
+            'column_index': {state['id']: index for index, state in enumerate(states)},
+            'expires_at': time.monotonic() + self.ttl
+        }
+        with self._lock:
+            self.builds += 1
+            # Failed fetches aren't kept, so the next request tries again
+            if states and self._versions.get(team_id, 0) == version:
+                self._entries[team_id] = entry
+        return entry
+
+    def invalidate(self, team_id=None):
+        """Bump the version of one team, or of every team when none is given"""
+        with self._lock:
+            team_ids = [team_id] if team_id else list(set(self._versions) | set(self._entries))
+            for stale_team_id in team_ids:
+                self._versions[stale_team_id] = self._versions.get(stale_team_id, 0) + 1
+                self._entries.pop(stale_team_id, None)
+
+workflow_orderings = WorkflowOrderingCache(LINEAR_CACHE_TTLS['workflow_states'])
+
+def get_workflow_ordering(team_id):
+    """Get a team's ordered columns and state_id -> column index map"""
+    ordering = workflow_orderings.current(team_id)
+    if ordering is None:
+        version = workflow_orderings.version(team_id)
+        result = cached_query('workflow_states', WORKFLOW_STATES_QUERY, {"teamId": team_id})
+        ordering = workflow_orderings.build(team_id, result, version)
+    return ordering
 
 def get_workflow_states(team_id):
     """Get workflow states (columns) for a team"""
-    query = """
-    query WorkflowStates($teamId: String!) {
-        team(id: $teamId) {
-            states {
+    return get_workflow_ordering(team_id)['states']
+
+def validate_state_move(data):
+    """Check that a stateId belongs to the board of the teamId sent with it
+
+    Returns an error message, or None when the move is valid or can't be checked
+    """
+    team_id, state_id = data.get('teamId'), data.get('stateId')
+    if not team_id or not state_id:
+        return None
+    ordering = get_workflow_ordering(team_id)
+    if ordering['states'] and state_id not in ordering['column_index']:
+        return f"State {state_id} is not a workflow state of team {team_id}"
+    return None
+
+TEAM_MEMBERS_QUERY = """
+query TeamMembers($teamId: String!, $first: Int!, $after: String) {
+    team(id: $teamId) {
+        members(first: $first, after: $after) {
+            nodes {
+                id
+                name
+                displayName
+            }
+            pageInfo {
+                hasNextPage
+                endCursor
+            }
+        }
+    }
+}
+"""
+
+def get_team_members(team_id):
+    """Get every member of a team, one cached page at a time"""
+    members = []
+    after = None
+    while True:
+        variables = {"teamId": team_id, "first": LINEAR_MEMBERS_PAGE_SIZE, "after": after}
+        result = cached_query('team_members', TEAM_MEMBERS_QUERY, variables)
+        team = result and result.get('data') and result['data'].get('team')
+        if not team or not team.get('members'):
+            break
+        members.extend(team['members']['nodes'])
+        page_info = team['members'].get('pageInfo') or {}
+        if not page_info.get('hasNextPage') or not page_info.get('endCursor'):
+            break
+        after = page_info['endCursor']
+    return members
+
+ISSUES_VARIABLES = "$teamId: ID!, $projectId: ID, $includeArchived: Boolean, $first: Int!, $after: String"
+# Delta pages also take the watermark they cover changes since
+DELTA_ISSUES_VARIABLES = ISSUES_VARIABLES + ", $updatedSince: DateTimeOrDuration"
+
+def issues_selection(nodes, ordered=False, delta=False):
+    """Build a selection for one page of a board's issues
+
+    ordered sorts the page by updatedAt; delta filters it to issues updated
+    since $updatedSince, which full syncs leave out
+    """
+    updated_filter = "\n            updatedAt: { gte: $updatedSince }" if delta else ""
+    order = "\n        orderBy: updatedAt" if ordered else ""
+    return f"""
+    issues(
+        filter: {{ 
+            team: {{ id: {{ eq: $teamId }} }}
+            project: {{ id: {{ eq: $projectId }} }}{updated_filter}
+        }}
+        first: $first
+        after: $after{order}
+        includeArchived: $includeArchived
+    ) {{
+        nodes {{{nodes}        }}
+        pageInfo {{
+            hasNextPage
+            endCursor
+        }}
+    }}
+"""
+
+ISSUE_FIELDS = """
+            id
+            identifier
+            title
+            description
+            priority
+            priorityLabel
+            labels {
                 nodes {
                     id
                     name
                     color
-                    position
-                    type
                 }
             }
-        }
+            state {
+                id
+                name
+                color
+            }
+            assignee {
+                id
+                name
+                displayName
+            }
+            project {
+                id
+            }
+            createdAt
+            updatedAt
+            archivedAt
+"""
+ISSUES_SELECTION = issues_selection(ISSUE_FIELDS, ordered=True)
+DELTA_ISSUES_SELECTION = issues_selection(ISSUE_FIELDS, ordered=True, delta=True)
+ISSUES_QUERY = build_query('Issues', ISSUES_VARIABLES, ISSUES_SELECTION)
+DELTA_ISSUES_QUERY = build_query('Issues', DELTA_ISSUES_VARIABLES, DELTA_ISSUES_SELECTION)
+
+ISSUE_IDS_SELECTION = issues_selection("""
+            id
+""")
+ISSUE_IDS_QUERY = build_query('IssueIds', ISSUES_VARIABLES, ISSUE_IDS_SELECTION)
+
+def issue_page_variables(team_id, project_id=None, first=None, after=None, updated_since=None):
+    """Build the variables for one page of the Issues query
+
+    With updated_since set, the page only covers issues changed since then and
+    includes archived ones so the local store can drop them
+    """
+    variables = {
+        "teamId": team_id,
+        "first": first or LINEAR_ISSUES_PAGE_SIZE,
+        "after": after,
+        "includeArchived": bool(updated_since)
+    }
+    if updated_since is not None:
+        # Only sent with DELTA_ISSUES_QUERY, which declares it
+        variables["updatedSince"] = updated_since
+    if project_id:
+        variables["projectId"] = project_id
+    return variables
+
+def iter_issue_pages(team_id, project_id=None, page_size=None, max_issues=None,
+                     updated_since=None, first_page=None):
+    """Yield pages of issues for a team, following pageInfo cursors
+
+    first_page is an already-fetched issues connection to start from (e.g. one
+    taken from a combined document). Iteration stops when Linear reports no
+    further pages or once max_issues have been yielded. A failed request yields
+    None and ends the iteration, so callers can tell a partial fetch apart
+    """
+    page_size = page_size or LINEAR_ISSUES_PAGE_SIZE
+    max_issues = LINEAR_ISSUES_MAX if max_issues is None else max_issues
+    
+    fetched = 0
+    cursor = None
+    connection = first_page
+    while True:
+        if connection is None:
+            if fetched >= max_issues:
+                app.logger.warning(f"Stopped fetching issues for team {team_id} at the cap of {max_issues}")
+                return
+            
+            variables = issue_page_variables(team_id, project_id, min(page_size, max_issues - fetched),
+                                             cursor, updated_since)
+            result = execute_query(ISSUES_QUERY if updated_since is None else DELTA_ISSUES_QUERY, variables)
+            if not result or 'data' not in result or not result['data'].get('issues'):
+                log_event(issues_log, logging.ERROR, "Failed to retrieve issues", result, team_id=team_id)
+                yield None
+                return
+            connection = result['data']['issues']
+        
+        nodes = connection['nodes'][:max(0, max_issues - fetched)]
+        fetched += len(nodes)
+        yield nodes
+        
+        page_info = connection.get('pageInfo') or {}
+        if not page_info.get('hasNextPage') or not page_info.get('endCursor'):
+            return
+        cursor = page_info['endCursor']
+        connection = None
+
+def iter_issues(team_id, project_id=None, page_size=None, max_issues=None, first_page=None):
+    """Yield issues for a team straight from Linear as each page arrives
+
+    Archived issues are skipped, so callers can process a board without holding
+    every page in memory
+    """
+    for page in iter_issue_pages(team_id, project_id, page_size, max_issues, first_page=first_page):
+        for issue in page or []:
+            if not issue.get('archivedAt'):
+                yield issue
+
+# Local issue store
+def _issue_store_connection():
+    """Get this thread's SQLite connection to the issue store, creating the schema on first use"""
+    connection = getattr(_issue_store_local, 'connection', None)
+    if connection is None:
+        connection = sqlite3.connect(LINEAR_ISSUE_STORE_PATH, timeout=10)
+        connection.execute("PRAGMA journal_mode=WAL")
+        with _issue_store_schema_lock:
+            connection.executescript("""
+                CREATE TABLE IF NOT EXISTS issues (
+                    id TEXT PRIMARY KEY,
+                    team_id TEXT NOT NULL,
+                    project_id TEXT,
+                    state_id TEXT,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    data TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_issues_team_project
+                    ON issues (team_id, project_id, created_at);
+                CREATE TABLE IF NOT EXISTS sync_watermarks (
+                    scope TEXT PRIMARY KEY,
+                    updated_at TEXT NOT NULL,
+                    synced_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS webhook_deliveries (
+                    source TEXT PRIMARY KEY,
+                    received_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS sync_reconciles (
+                    scope TEXT PRIMARY KEY,
+                    reconciled_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS issue_changes (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    issue_id TEXT NOT NULL,
+                    team_id TEXT,
+                    previous_team_id TEXT,
+                    previous_project_id TEXT,
+                    previous_state_id TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_issue_changes_issue
+                    ON issue_changes (issue_id, seq);
+                -- Tokens moved to the token store (LINEAR_TOKEN_STORE_PATH)
+                DROP TABLE IF EXISTS user_tokens;
+            """)
+        _issue_store_local.connection = connection
+    return connection
+
+def _sync_scope(team_id, project_id=None):
+    """Get the watermark key for a board (team, optionally narrowed to a project)"""
+    return f"{team_id}:{project_id or ''}"
+
+def record_webhook_delivery():
+    """Note that a verified Linear webhook just arrived"""
+    connection = _issue_store_connection()
+    with connection:
+        connection.execute(
+            "INSERT OR REPLACE INTO webhook_deliveries (source, received_at) VALUES ('linear', ?)",
+            (time.time(),)
+        )
+
+def _sync_is_fresh(team_id, project_id=None):
+    """Check whether webhooks are keeping a board current, so a sync can be skipped
+
+    Only while verified webhooks have arrived within LINEAR_WEBHOOK_SYNC_INTERVAL:
+    a configured secret alone doesn't mean Linear is delivering events here
+    """
+    if not LINEAR_WEBHOOK_SECRET:
+        return False
+    connection = _issue_store_connection()
+    delivery = connection.execute(
+        "SELECT received_at FROM webhook_deliveries WHERE source = 'linear'"
+    ).fetchone()
+    if not delivery or time.time() - delivery[0] >= LINEAR_WEBHOOK_SYNC_INTERVAL:
+        return False
+    row = connection.execute(
+        "SELECT synced_at FROM sync_watermarks WHERE scope = ?",
+        (_sync_scope(team_id, project_id),)
+    ).fetchone()
+    return bool(row) and time.time() - row[0] < LINEAR_WEBHOOK_SYNC_INTERVAL
+
+def get_sync_watermark(team_id, project_id=None):
+    """Get the latest updatedAt synced into the store for a board, or None"""
+    row = _issue_store_connection().execute(
+        "SELECT updated_at FROM sync_watermarks WHERE scope = ?",
+        (_sync_scope(team_id, project_id),)
+    ).fetchone()
+    return row[0] if row else None
+
+def _record_issue_change(connection, issue_id, team_id, previous):
+    """Log a change to an issue for board diffs, with where it was on the board before
+
+    previous is the issue's (team_id, project_id, state_id, updated_at) row
+    before the change, or None if it wasn't stored
+    """
+    connection.execute(
+        "INSERT INTO issue_changes (issue_id, team_id, previous_team_id, previous_project_id, previous_state_id) "
+        "VALUES (?, ?, ?, ?, ?)",
+        (issue_id, team_id) + (tuple(previous[:3]) if previous else (None, None, None))
+    )
+
+def _stored_issue_position(connection, issue_id):
+    """Get an issue's stored (team_id, project_id, state_id, updated_at), or None"""
+    return connection.execute(
+        "SELECT team_id, project_id, state_id, updated_at FROM issues WHERE id = ?", (issue_id,)
+    ).fetchone()
+
+def store_issues(team_id, issues):
+    """Upsert issues into the store, removing any that have been archived"""
+    connection = _issue_store_connection()
+    with connection:
+        for issue in issues:
+            previous = _stored_issue_position(connection, issue['id'])
+            if issue.get('archivedAt'):
+                if previous:
+                    connection.execute("DELETE FROM issues WHERE id = ?", (issue['id'],))
+                    _record_issue_change(connection, issue['id'], previous[0], previous)
+                continue
+            if previous is None or previous[3] != issue['updatedAt']:
+                _record_issue_change(connection, issue['id'], team_id, previous)
+            connection.execute(
+                "INSERT OR REPLACE INTO issues (id, team_id, project_id, state_id, created_at, updated_at, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    issue['id'],
+                    team_id,
+                    (issue.get('project') or {}).get('id'),
+                    (issue.get('state') or {}).get('id'),
+                    issue['createdAt'],
+                    issue['updatedAt'],
+                    json.dumps(issue)
+                )
+            )
+
+def sync_issues(team_id, project_id=None, updated_since=None, first_page=None):
+    """Pull issues changed since the board's watermark into the store
+
+    updated_since and first_page let a caller that already fetched the first
+    delta page (e.g. in a combined document) hand it over. The watermark only
+    advances when every page arrived. Returns the number of issues applied
+    """
+    if first_page is None:
+        if _sync_is_fresh(team_id, project_id):
+            reconcile_issues(team_id, project_id)
+            return 0
+        updated_since = get_sync_watermark(team_id, project_id)
+    
+    # A full sync is capped like any board fetch; deltas must be complete or
+    # the watermark would skip changes
+    max_issues = None if updated_since is None else sys.maxsize
+    
+    applied = 0
+    latest = updated_since
+    complete = True
+    for page in iter_issue_pages(team_id, project_id, max_issues=max_issues,
+                                 updated_since=updated_since, first_page=first_page):
+        if page is None:
+            complete = False
+            break
+        store_issues(team_id, page)
+        applied += len(page)
+        for issue in page:
+            if latest is None or issue['updatedAt'] > latest:
+                latest = issue['updatedAt']
+    
+    if complete and latest:
+        connection = _issue_store_connection()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO sync_watermarks (scope, updated_at, synced_at) VALUES (?, ?, ?)",
+                (_sync_scope(team_id, project_id), latest, time.time())
+            )
+            if updated_since is None:
+                # A full sync lists the whole board, so it needs no reconciling
+                connection.execute(
+                    "INSERT OR REPLACE INTO sync_reconciles (scope, reconciled_at) VALUES (?, ?)",
+                    (_sync_scope(team_id, project_id), time.time())
+                )
+    if complete and updated_since is not None:
+        applied += reconcile_issues(team_id, project_id)
+    if applied:
+        prune_issue_changes()
+    
+    app.logger.info(f"Synced {applied} changed issues for team {team_id} and project {project_id or 'None'}")
+    return applied
+
+def reconcile_issues(team_id, project_id=None, force=False):
+    """Remove stored issues that are no longer on a board, at most once per LINEAR_SYNC_RECONCILE_INTERVAL
+
+    Delta syncs filter by team and project, so they never see an issue that
+    moved to another board or was deleted outright. This lists the ids still on
+    the board (a lean query) and drops stored issues missing from it. Issues
+    changed after the watermark are kept, since they may have been stored after
+    the listing began. Returns the number of issues removed
+    """
+    scope = _sync_scope(team_id, project_id)
+    connection = _issue_store_connection()
+    if not force:
+        if not LINEAR_SYNC_RECONCILE_INTERVAL:
+            return 0
+        row = connection.execute(
+            "SELECT reconciled_at FROM sync_reconciles WHERE scope = ?", (scope,)
+        ).fetchone()
+        if row and time.time() - row[0] < LINEAR_SYNC_RECONCILE_INTERVAL:
+            return 0
+    # Claim the run first, so concurrent syncs don't all list the board
+    with connection:
+        connection.execute(
+            "INSERT OR REPLACE INTO sync_reconciles (scope, reconciled_at) VALUES (?, ?)",
+            (scope, time.time())
+        )
+    
+    watermark = get_sync_watermark(team_id, project_id)
+    if watermark is None:
+        return 0
+    live_ids = set()
+    cursor = None
+    while True:
+        variables = issue_page_variables(team_id, project_id, LINEAR_ISSUES_PAGE_SIZE, cursor)
+        result = execute_query(ISSUE_IDS_QUERY, variables)
+        if not result or 'data' not in result or not result['data'].get('issues'):
+            log_event(issues_log, logging.ERROR, "Failed to list issue ids for reconciling", result, team_id=team_id)
+            return 0
+        issues = result['data']['issues']
+        live_ids.update(node['id'] for node in issues['nodes'])
+        page_info = issues.get('pageInfo') or {}
+        if not page_info.get('hasNextPage') or not page_info.get('endCursor'):
+            break
+        cursor = page_info['endCursor']
+    
+    if project_id:
+        rows = connection.execute(
+            "SELECT id FROM issues WHERE team_id = ? AND project_id = ? AND updated_at <= ?",
+            (team_id, project_id, watermark)
+        ).fetchall()
+    else:
+        rows = connection.execute(
+            "SELECT id FROM issues WHERE team_id = ? AND updated_at <= ?",
+            (team_id, watermark)
+        ).fetchall()
+    removed = [row[0] for row in rows if row[0] not in live_ids]
+    for issue_id in removed:
+        delete_stored_issue(issue_id)
+    if removed:
+        app.logger.info(f"Removed {len(removed)} issues no longer on the board of team {team_id} "
+                        f"and project {project_id or 'None'}")
+    return len(removed)
+
+def delete_stored_issue(issue_id):
+    """Remove an issue from the store"""
+    connection = _issue_store_connection()
+    with connection:
+        previous = _stored_issue_position(connection, issue_id)
+        if previous:
+            connection.execute("DELETE FROM issues WHERE id = ?", (issue_id,))
+            _record_issue_change(connection, issue_id, previous[0], previous)
+
+def board_cursor():
+    """Get the cursor for the latest board change in the store"""
+    row = _issue_store_connection().execute("SELECT MAX(seq) FROM issue_changes").fetchone()
+    return str(row[0] or 0)
+
+def prune_issue_changes():
+    """Drop board changes beyond the newest LINEAR_BOARD_CHANGES_RETAINED"""
+    connection = _issue_store_connection()
+    with connection:
+        connection.execute(
+            "DELETE FROM issue_changes WHERE seq <= (SELECT MAX(seq) FROM issue_changes) - ?",
+            (LINEAR_BOARD_CHANGES_RETAINED,)
+        )
+
+def get_board_changes(team_id, project_id=None, since=None, sync=True):
+    """Get the issues added to, moved on or removed from a board since a cursor
+
+    Cursors are sequence numbers in the store's change log. Each issue changed
+    after the cursor is compared with where it was just before the cursor:
+    newly on the board is 'added', off the board is 'removed', in another column
+    is 'moved', and otherwise edited in place is 'updated'. A cursor that is
+    older than the retained log (or from another store) gets reset=True, and the
+    client should reload the board. Moved issues carry a previousStateId.
+    Pass sync=False to read the change log without syncing from Linear first.
+    """
+    if sync:
+        sync_issues(team_id, project_id)
+    connection = _issue_store_connection()
+    first_seq, last_seq = connection.execute("SELECT MIN(seq), MAX(seq) FROM issue_changes").fetchone()
+    last_seq = last_seq or 0
+    changes = {'cursor': str(last_seq), 'reset': False, 'added': [], 'moved': [], 'updated': [], 'removed': []}
+    if since is None:
+        return changes
+    if since > last_seq or (first_seq is not None and since < first_seq - 1):
+        changes['reset'] = True
+        return changes
+    
+    def on_board(row_team_id, row_project_id):
+        return row_team_id == team_id and (not project_id or row_project_id == project_id)
+    
+    # The earliest change after the cursor says where each issue was before it
+    before = OrderedDict()
+    for issue_id, previous_team_id, previous_project_id, previous_state_id in connection.execute(
+            "SELECT issue_id, previous_team_id, previous_project_id, previous_state_id FROM issue_changes "
+            "WHERE seq > ? AND seq <= ? AND (team_id = ? OR previous_team_id = ?) ORDER BY seq",
+            (since, last_seq, team_id, team_id)):
+        if issue_id not in before:
+            before[issue_id] = (on_board(previous_team_id, previous_project_id), previous_state_id)
+    
+    for issue_id, (was_on_board, previous_state_id) in before.items():
+        row = connection.execute(
+            "SELECT team_id, project_id, state_id, data FROM issues WHERE id = ?", (issue_id,)
+        ).fetchone()
+        now_on_board = bool(row) and on_board(row[0], row[1])
+        if not now_on_board:
+            if was_on_board:
+                changes['removed'].append(issue_id)
+        elif not was_on_board:
+            changes['added'].append(json.loads(row[3]))
+        elif previous_state_id != row[2]:
+            issue = json.loads(row[3])
+            issue['previousStateId'] = previous_state_id
+            changes['moved'].append(issue)
+        else:
+            changes['updated'].append(json.loads(row[3]))
+    return changes
+
+def iter_stored_issues(team_id, project_id=None, limit=None):
+    """Yield a board's issues from the store, newest first"""
+    sql = "SELECT data FROM issues WHERE team_id = ?"
+    params = [team_id]
+    if project_id:
+        sql += " AND project_id = ?"
+        params.append(project_id)
+    sql += " ORDER BY created_at DESC LIMIT ?"
+    params.append(limit or LINEAR_ISSUES_MAX)
+    
+    for (data,) in _issue_store_connection().execute(sql, params):
+        yield json.loads(data)
+
+# Live board feeds
+class BoardFeed:
+    """One upstream feed for a board, fanned out to every connected browser
+
+    While anyone is subscribed, a single thread syncs the board every
+    LINEAR_FEED_POLL_INTERVAL seconds (or as soon as a webhook touches its team),
+    reads the store's change log and publishes 'board' and 'activity' events to
+    each subscriber's queue. A subscriber whose queue fills up is sent 'reset'
+    and dropped, so a stalled browser can't hold memory
+    """
+
+    def __init__(self, team_id, project_id=None):
+        self.team_id = team_id
+        self.project_id = project_id
+        self.cursor = None
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self.last_used = time.monotonic()
+        self.polls = 0
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, subscriber=None):
+        """Add a subscriber queue, starting the feed thread if it isn't running"""
+        if subscriber is None:
+            subscriber = queue.Queue(maxsize=LINEAR_FEED_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.add(subscriber)
+            self.last_used = time.monotonic()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True,
+                                                name=f"board-feed-{_sync_scope(self.team_id, self.project_id)}")
+                self._thread.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        """Remove a subscriber; the feed thread stops once nobody is left"""
+        with self._lock:
+            self._subscribers.discard(subscriber)
+            self.last_used = time.monotonic()
+            if not self._subscribers:
+                self._wake.set()
+
+    def idle(self):
+        """Check whether nobody is subscribed and the feed thread has stopped"""
+        with self._lock:
+            return not self._subscribers and self._thread is None
+
+    def wake(self):
+        """Poll now instead of waiting for the next interval"""
+        self._wake.set()
+
+    def publish(self, event, data, event_id=None):
+        """Queue an event for every subscriber"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait((event, data, event_id))
+            except queue.Full:
+                with self._lock:
+                    self._subscribers.discard(subscriber)
+                    self.dropped += 1
+                with subscriber.mutex:
+                    subscriber.queue.clear()
+                subscriber.put_nowait(('reset', {'reason': 'Too far behind'}, None))
+        self.published += 1
+
+    def poll(self):
+        """Sync the board once and publish whatever changed since the last poll"""
+        changes = get_board_changes(self.team_id, self.project_id, self.cursor)
+        self.polls += 1
+        if changes['reset']:
+            self.publish('reset', {'reason': 'Change log was reset'})
+        elif self.cursor is not None and any(changes[kind] for kind in ('added', 'moved', 'updated', 'removed')):
+            self.publish('board', changes, changes['cursor'])
+            for activity in board_change_activities(self.team_id, changes):
+                self.publish('activity', activity)
+        self.cursor = int(changes['cursor'])
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+            try:
+                self.poll()
+            except Exception as e:
+                app.logger.error(f"Board feed for team {self.team_id} failed to poll: {str(e)}", exc_info=True)
+            self._wake.wait(LINEAR_FEED_POLL_INTERVAL)
+            self._wake.clear()
+
+    def stats(self):
+        """Get subscriber and event counters"""
+        with self._lock:
+            return {
+                'subscribers': len(self._subscribers),
+                'running': self._thread is not None,
+                'polls': self.polls,
+                'published': self.published,
+                'dropped': self.dropped,
+                'cursor': self.cursor
+            }
+
+class AsyncSubscriber(queue.Queue):
+    """Board feed subscriber queue that an event loop can wait on without a thread"""
+
+    def __init__(self, loop, maxsize=LINEAR_FEED_QUEUE_SIZE):
+        super().__init__(maxsize=maxsize)
+        self.loop = loop
+        self.ready = asyncio.Event()
+
+    def _put(self, item):
+        super()._put(item)
+        try:
+            self.loop.call_soon_threadsafe(self.ready.set)
+        except RuntimeError:
+            # The loop has closed, and the stream with it
+            pass
+
+    async def get_async(self):
+        """Wait on the loop for the next event"""
+        while True:
+            self.ready.clear()
+            try:
+                return self.get_nowait()
+            except queue.Empty:
+                await self.ready.wait()
+
+# Least recently used first
+board_feeds = OrderedDict()
+_board_feeds_lock = threading.Lock()
+
+def subscribe_board_feed(team_id, project_id=None, subscriber=None):
+    """Subscribe to the shared feed for a board; returns (feed, subscriber queue)
+
+    Subscribing under the registry lock keeps the feed from being pruned before
+    its first subscriber arrives
+    """
+    key = (team_id, project_id)
+    with _board_feeds_lock:
+        feed = board_feeds.get(key)
+        if feed is None:
+            feed = board_feeds[key] = BoardFeed(team_id, project_id)
+        board_feeds.move_to_end(key)
+        subscriber = feed.subscribe(subscriber)
+        _prune_board_feeds()
+        return feed, subscriber
+
+def _prune_board_feeds():
+    """Drop idle feeds past LINEAR_FEED_IDLE_TTL, and the least recently used idle ones over LINEAR_FEED_MAX_BOARDS
+
+    Called with _board_feeds_lock held. Feeds with subscribers are kept, so the
+    cap can be exceeded while that many boards are being watched
+    """
+    now = time.monotonic()
+    for key, feed in list(board_feeds.items()):
+        if not feed.idle():
+            continue
+        if len(board_feeds) > LINEAR_FEED_MAX_BOARDS or now - feed.last_used > LINEAR_FEED_IDLE_TTL:
+            del board_feeds[key]
+
+def team_board_feeds(team_id):
+    """Get the feeds of every board of a team"""
+    with _board_feeds_lock:
+        return [feed for (feed_team_id, _project_id), feed in board_feeds.items() if feed_team_id == team_id]
+
+def board_change_activities(team_id, changes):
+    """Turn board changes into activity feed entries, in the /api/get_activity format
+
+    The store only knows what changed, not who changed it, so entries have no
+    user; /api/get_activity fills in the actors from Linear's history
+    """
+    state_names = {state['id']: state['name'] for state in get_workflow_ordering(team_id)['states']}
+    now = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%S.000Z')
+    activities = []
+    for issue in changes['added']:
+        activities.append({
+            'id': f"{issue['id']}_created",
+            'type': 'issue_created',
+            'createdAt': issue.get('createdAt') or now,
+            'user': None,
+            'issue': {'id': issue['id'], 'identifier': issue.get('identifier'), 'title': issue.get('title')}
+        })
+    for issue in changes['moved']:
+        activities.append({
+            'id': f"{issue['id']}_moved_{issue.get('updatedAt')}",
+            'type': 'state_changed',
+            'createdAt': issue.get('updatedAt') or now,
+            'user': None,
+            'issue': {'id': issue['id'], 'identifier': issue.get('identifier'), 'title': issue.get('title')},
+            'fromState': state_names.get(issue.get('previousStateId'), 'Unknown'),
+            'toState': (issue.get('state') or {}).get('name') or state_names.get((issue.get('state') or {}).get('id'))
+        })
+    return activities
+
+def format_sse(event, data, event_id=None):
+    """Format one Server-Sent Events message"""
+    message = f"event: {event}\n"
+    if event_id is not None:
+        message += f"id: {event_id}\n"
+    return message + f"data: {json.dumps(data)}\n\n"
+
+def board_stream_start(team_id, project_id=None, since=None):
+    """Get the messages that open a board stream, after subscribing to its feed
+
+    That is the reconnect delay plus the changes a reconnecting browser missed
+    since its cursor. Returns (messages, ended), where ended means the cursor is
+    gone and the stream should close after a reset
+    """
+    messages = ["retry: 5000\n\n"]
+    if since and since.isdigit():
+        catch_up = get_board_changes(team_id, project_id, int(since), sync=False)
+        if catch_up['reset']:
+            messages.append(format_sse('reset', {'reason': 'Cursor is no longer available'}))
+            return messages, True
+        if any(catch_up[kind] for kind in ('added', 'moved', 'updated', 'removed')):
+            messages.append(format_sse('board', catch_up, catch_up['cursor']))
+    return messages, False
+
+SSE_HEADERS = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+
+# Board streams currently held open by the WSGI app
+board_streams = 0
+_board_streams_lock = threading.Lock()
+
+def get_issues(team_id, project_id=None):
+    """Get issues for a team, optionally filtered by project"""
+    if LINEAR_ISSUE_STORE_PATH:
+        sync_issues(team_id, project_id)
+        issues = list(iter_stored_issues(team_id, project_id))
+    else:
+        issues = list(iter_issues(team_id, project_id))
+    app.logger.info(f"Retrieved {len(issues)} issues for team {team_id}")
+    return issues
+
+def get_roadmap_data(team_id, project_id=None):
+    """Fetch everything the roadmap page needs in a single upstream request
+
+    Workflow states, the first page of issues (or of issue changes since the
+    last sync, when the local store is enabled) and the selected project are
+    merged into one aliased document. States and the project already in the
+    response cache are left out of the document, and freshly fetched ones are
+    cached under their own query keys for later reads.
+
+    Returns a dict with 'workflow_states', 'column_index' (state id -> column),
+    'issues' (an iterator) and 'project' ('project' is None when no project_id
+    is given or it wasn't found)
+    """
+    plan = plan_roadmap_data(team_id, project_id)
+    result = execute_query(plan['query'], plan['variables']) if plan['parts'] else None
+    return finish_roadmap_data(plan, result)
+
+async def async_get_roadmap_data(team_id, project_id=None):
+    """Like get_roadmap_data, but sends the combined request on the event loop
+
+    Planning reads the issue store, so it runs in a worker thread to keep
+    SQLite off the loop. Returns (plan, result) for finish_roadmap_data to
+    turn into page data
+    """
+    plan = await asyncio.to_thread(plan_roadmap_data, team_id, project_id)
+    result = await async_execute_query(plan['query'], plan['variables']) if plan['parts'] else None
+    return plan, result
+
+def plan_roadmap_data(team_id, project_id=None):
+    """Work out which parts of the roadmap document still need fetching"""
+    states_variables = {"teamId": team_id}
+    # States are only needed when the team's column ordering is out of date
+    ordering = workflow_orderings.current(team_id)
+    ordering_version = workflow_orderings.version(team_id)
+    states_result = None
+    if ordering is None:
+        states_result = cache_lookup(WORKFLOW_STATES_QUERY, states_variables, entity='workflow_states')
+    project_variables = {"projectId": project_id}
+    project_result = cache_lookup(PROJECT_QUERY, project_variables, entity='projects') if project_id else None
+    updated_since = get_sync_watermark(team_id, project_id) if LINEAR_ISSUE_STORE_PATH else None
+    # Boards kept current by webhooks are served from the store without a delta fetch
+    fetch_issues = not (LINEAR_ISSUE_STORE_PATH and _sync_is_fresh(team_id, project_id))
+    
+    first_page = min(LINEAR_ISSUES_PAGE_SIZE, LINEAR_ISSUES_MAX)
+    parts = OrderedDict()
+    if fetch_issues:
+        if updated_since is not None:
+            parts['issues'] = (DELTA_ISSUES_VARIABLES, DELTA_ISSUES_SELECTION,
+                               issue_page_variables(team_id, project_id, first_page, updated_since=updated_since))
+        else:
+            parts['issues'] = (ISSUES_VARIABLES, ISSUES_SELECTION,
+                               issue_page_variables(team_id, project_id, first_page))
+    if ordering is None and states_result is None:
+        parts['states'] = (WORKFLOW_STATES_VARIABLES, WORKFLOW_STATES_SELECTION, states_variables)
+    if project_id and project_result is None:
+        parts['project'] = (PROJECT_VARIABLES, PROJECT_SELECTION, project_variables)
+    
+    query, variables = compose_queries('RoadmapData', parts) if parts else (None, None)
+    return {
+        'team_id': team_id,
+        'project_id': project_id,
+        'states_variables': states_variables,
+        'states_result': states_result,
+        'ordering': ordering,
+        'ordering_version': ordering_version,
+        'project_variables': project_variables,
+        'project_result': project_result,
+        'updated_since': updated_since,
+        'fetch_issues': fetch_issues,
+        'parts': parts,
+        'query': query,
+        'variables': variables
     }
-    """
+
+def finish_roadmap_data(plan, result):
+    """Cache, store and assemble the roadmap data from a planned request's result"""
+    team_id, project_id = plan['team_id'], plan['project_id']
+    parts = plan['parts']
+    states_result, project_result = plan['states_result'], plan['project_result']
+    updated_since, fetch_issues = plan['updated_since'], plan['fetch_issues']
+    split = split_composed_result(result, parts) if parts else {}
     
-    variables = {"teamId": team_id}
-    result = execute_query(query, variables)
+    if 'states' in parts:
+        states_result = split['states']
+        cache_store('workflow_states', WORKFLOW_STATES_QUERY, plan['states_variables'], states_result)
+    if 'project' in parts:
+        project_result = split['project']
+        cache_store('projects', PROJECT_QUERY, plan['project_variables'], project_result)
     
-    if result and 'data' in result and 'team' in result['data'] and 'states' in result['data']['team']:
-        states = result['data']['team']['states']['nodes']
-        
-        # Get a snapshot of states for debugging
-        app.logger.info(f"Workflow states before sorting: {json.dumps(states)}")
-        
-        # Classify each state based on Linear's state types and fallback to position
-        for state in states:
-            state_type = state.get('type', '').lower()
-            
-            # Use Linear's standard state types directly
-            if state_type == 'backlog':
-                group_order = 0
-            elif state_type == 'unstarted':
-                group_order = 1
-            elif state_type == 'started':
-                group_order = 2
-            elif state_type == 'completed':
-                group_order = 3
-            elif state_type == 'canceled':
-                group_order = 4
-            else:
-                # For unknown types, use position as last resort
-                position = float(state.get('position', 0))
-                # Normalize position to a 0-4 scale
-                total_states = len(states)
-                if total_states > 1:
-                    # Find relative position in the sequence
-                    sorted_positions = sorted([float(s.get('position', 0)) for s in states])
-                    position_index = sorted_positions.index(position)
-                    group_order = min(4, int(position_index * 5 / total_states))
-                else:
-                    group_order = 1  # Default to unstarted for a single state
-            
-            state['group_order'] = group_order
-            
-        # Sort by group order first, then by position within group
-        sorted_states = sorted(states, key=lambda x: (
-            x.get('group_order', 99),
-            float(x.get('position', 0))
-        ))
-        
-        # Log the sorted result
-        app.logger.info(f"Workflow states after sorting: {json.dumps(sorted_states)}")
-        
-        return sorted_states
-    return []
+    issues_page = split['issues']['data']['issues'] if split.get('issues') else None
+    if fetch_issues and issues_page is None:
+        log_event(issues_log, logging.ERROR, "Failed to retrieve roadmap data", result, team_id=team_id)
+    
+    if LINEAR_ISSUE_STORE_PATH:
+        if issues_page is not None:
+            sync_issues(team_id, project_id, updated_since=updated_since, first_page=issues_page)
+        issues = iter_stored_issues(team_id, project_id)
+    else:
+        issues = iter_issues(team_id, project_id, first_page=issues_page) if issues_page is not None else iter([])
+    
+    ordering = plan['ordering'] or workflow_orderings.build(team_id, states_result, plan['ordering_version'])
+    return {
+        'workflow_states': ordering['states'],
+        'column_index': ordering['column_index'],
+        'issues': issues,
+        'project': project_from_result(project_result)
+    }
 
-def get_issues(team_id, project_id=None):
-    """Get issues for a team, optionally filtered by project"""
-    query = """
-    query Issues($teamId: ID!, $projectId: ID) {
-        issues(
-            filter: { 
-                team: { id: { eq: $teamId } }
-                project: { id: { eq: $projectId } }
-            }
-            first: 100
-            includeArchived: false
-        ) {
+COMMENT_PAGE_INFO = """
+                pageInfo {
+                    hasNextPage
+                    hasPreviousPage
+                    startCursor
+                    endCursor
+                }
+"""
+
+ISSUE_COMMENTS_QUERY = """
+query IssueComments($issueId: String!, $first: Int, $after: String, $last: Int, $before: String) {
+    issue(id: $issueId) {
+        id
+        comments(first: $first, after: $after, last: $last, before: $before) {
             nodes {
                 id
-                identifier
-                title
-                description
-                priority
-                priorityLabel
-                labels {
-                    nodes {
-                        id
-                        name
-                        color
-                    }
-                }
-                state {
-                    id
-                    name
-                    color
-                }
-                assignee {
-                    id
+                body
+                user {
                     name
                     displayName
                 }
                 createdAt
-                updatedAt
             }
+""" + COMMENT_PAGE_INFO + """
         }
     }
+}
+"""
+
+def comment_page(comments, newest=False):
+    """Turn a comments connection into a page of comments, oldest first
+
+    has_more and cursor continue in the paging direction: towards older
+    comments when newest is set, else towards newer ones
     """
-    
-    variables = {"teamId": team_id}
-    if project_id:
-        variables["projectId"] = project_id
-    
-    result = execute_query(query, variables)
-    if result and 'data' in result and 'issues' in result['data']:
-        # Add detailed logging for debugging
-        issues = result['data']['issues']['nodes']
-        app.logger.info(f"Retrieved {len(issues)} issues for team {team_id}")
-        return issues
+    page_info = comments.get('pageInfo') or {}
+    nodes = sorted(comments.get('nodes') or [], key=lambda node: node.get('createdAt') or '')
+    if newest:
+        has_more, cursor = page_info.get('hasPreviousPage'), page_info.get('startCursor')
     else:
-        app.logger.error(f"Failed to retrieve issues. Result: {json.dumps(result) if result else 'None'}")
-        return []
+        has_more, cursor = page_info.get('hasNextPage'), page_info.get('endCursor')
+    return {'comments': nodes, 'has_more': bool(has_more and cursor), 'cursor': cursor}
 
-def get_issue_comments(issue_id):
-    """Get comments for an issue"""
-    query = """
-    query IssueComments($issueId: String!) {
-        issue(id: $issueId) {
-            comments {
-                nodes {
-                    id
-                    body
-                    user {
-                        name
-                        displayName
-                    }
-                    createdAt
-                }
-            }
-        }
-    }
+def get_issue_comments(issue_id, cursor=None, newest=False, page_size=None):
+    """Get one page of an issue's comments
+
+    Pages run forward from the oldest comment, or backward from the newest one
+    when newest is set; pass the previous page's cursor to continue. Returns a
+    comment_page() dict, or None when the request failed
     """
+    page_size = page_size or LINEAR_COMMENTS_PAGE_SIZE
+    if newest:
+        variables = {"issueId": issue_id, "last": page_size, "before": cursor}
+    else:
+        variables = {"issueId": issue_id, "first": page_size, "after": cursor}
+    result = cached_query('comments', ISSUE_COMMENTS_QUERY, variables)
     
-    variables = {"issueId": issue_id}
-    result = execute_query(query, variables)
-    
-    if result and 'data' in result and 'issue' in result['data'] and 'comments' in result['data']['issue']:
-        return result['data']['issue']['comments']['nodes']
-    return []
+    issue = result and result.get('data') and result['data'].get('issue')
+    if not issue or not issue.get('comments'):
+        return None
+    return comment_page(issue['comments'], newest)
 
-def add_comment_to_issue(issue_id, comment):
-    """Add a comment to an issue"""
-    
-    # First attempt: Use the basic mutation structure
-    mutation = """
-    mutation CommentCreate($issueId: String!, $body: String!) {
-        commentCreate(input: {
-            issueId: $issueId,
-            body: $body
-        }) {
+# Comment write engine. Linear has accepted both of these mutation shapes over
+# time; the first one that works is remembered and used for every later write
+COMMENT_FIELDS = """
             success
             comment {
                 id
@@ -891,149 +2885,208 @@ def add_comment_to_issue(issue_id, comment):
                 }
                 createdAt
             }
+"""
+COMMENT_MUTATIONS = OrderedDict([
+    ('input_object', (
+        """
+        mutation CommentCreate($input: CommentCreateInput!) {
+            commentCreate(input: $input) {%s}
         }
-    }
+        """ % COMMENT_FIELDS,
+        lambda issue_id, body: {"input": {"issueId": issue_id, "body": body}}
+    )),
+    ('inline_input', (
+        """
+        mutation CommentCreate($issueId: String!, $body: String!) {
+            commentCreate(input: { issueId: $issueId, body: $body }) {%s}
+        }
+        """ % COMMENT_FIELDS,
+        lambda issue_id, body: {"issueId": issue_id, "body": body}
+    ))
+])
+
+_comment_path_lock = threading.Lock()
+comment_path = {'name': None}
+comment_write_stats = {
+    name: {'requests': 0, 'successes': 0, 'failures': 0, 'latency_total': 0.0, 'latency_max': 0.0}
+    for name in COMMENT_MUTATIONS
+}
+
+def is_schema_error(result):
+    """Check whether a GraphQL response was rejected because the document doesn't fit the schema"""
+    for error in (result or {}).get('errors') or []:
+        code = (error.get('extensions') or {}).get('code')
+        message = error.get('message') or ''
+        if code == 'GRAPHQL_VALIDATION_FAILED' or message.startswith(('Unknown argument', 'Unknown type', 'Cannot query field')):
+            return True
+    return False
+
+def _record_comment_write(path_name, elapsed, success):
+    """Record latency and outcome for one comment mutation shape"""
+    with _comment_path_lock:
+        stats = comment_write_stats[path_name]
+        stats['requests'] += 1
+        stats['successes' if success else 'failures'] += 1
+        stats['latency_total'] += elapsed
+        stats['latency_max'] = max(stats['latency_max'], elapsed)
+
+def create_comment(issue_id, body, access_token=None):
+    """Create a comment with a single parameterized commentCreate request
+
+    Uses the mutation shape that last worked. Until one has worked, a shape the
+    API rejects as invalid for its schema is skipped for the next one, so the
+    choice is only made once. Returns (result, not_found) like execute_write
     """
+    with _comment_path_lock:
+        known_path = comment_path['name']
+    candidates = [known_path] if known_path else list(COMMENT_MUTATIONS)
     
-    variables = {
-        "issueId": issue_id,
-        "body": comment
-    }
-    
-    app.logger.info(f"Attempting comment creation with mutation 1")
+    result, not_found = None, False
+    for path_name in candidates:
+        mutation, build_variables = COMMENT_MUTATIONS[path_name]
+        started = time.monotonic()
+        result, not_found = execute_write('issue', issue_id, mutation, build_variables(issue_id, body), access_token)
+        success = bool(result and result.get('data') and (result['data'].get('commentCreate') or {}).get('success'))
+        _record_comment_write(path_name, time.monotonic() - started, success)
+        
+        if success:
+            if not known_path:
+                with _comment_path_lock:
+                    comment_path['name'] = path_name
+                app.logger.info(f"Using the '{path_name}' commentCreate mutation for comment writes")
+            invalidate_cache('comments')
+            break
+        if known_path or not is_schema_error(result):
+            break
+        app.logger.warning(f"The '{path_name}' commentCreate mutation was rejected, trying the next shape")
     
-    # Try the first mutation attempt
-    result = execute_query(mutation, variables)
+    return result, not_found
+
+def get_comment_write_stats():
+    """Get per-mutation-shape request counts and latency for comment writes"""
+    with _comment_path_lock:
+        stats = {}
+        for name, path_stats in comment_write_stats.items():
+            stats[name] = dict(path_stats)
+            stats[name]['latency_avg'] = (
+                round(path_stats['latency_total'] / path_stats['requests'], 4) if path_stats['requests'] else 0.0
+            )
+        return {'active_path': comment_path['name'], 'paths': stats}
+
+def add_comment_to_issue(issue_id, comment):
+    """Add a comment to an issue"""
+    result, not_found = create_comment(issue_id, comment)
     
-    # Check if the first attempt succeeded
-    if result and 'data' in result and 'commentCreate' in result['data'] and result['data']['commentCreate'].get('success'):
-        app.logger.info("Comment creation successful with first attempt")
-        return True
-        
-    # If first attempt failed, log error details
+    if not_found:
+        app.logger.error(f"Cannot comment on issue {issue_id}: issue not found")
+        return False
     if result and 'errors' in result:
-        app.logger.error(f"First attempt errors: {json.dumps(result['errors'])}")
+        log_event(comments_log, logging.ERROR, "Comment creation errors", result['errors'], issue_id=issue_id)
     
-    # Second attempt: Try the official Linear SDK example format
-    mutation2 = """
-    mutation CreateComment($input: CommentCreateInput!) {
-        commentCreate(input: $input) {
-            success
-            comment {
-                id
-                body
-                user {
-                    id
-                    name
-                    displayName
-                }
-                createdAt
-            }
-        }
-    }
-    """
+    return bool(result and result.get('data') and (result['data'].get('commentCreate') or {}).get('success'))
+
+def issue_update_input(data):
+    """Pick the IssueUpdateInput fields the app allows editing from request data"""
+    update_data = {}
     
-    variables2 = {
-        "input": {
-            "issueId": issue_id,
-            "body": comment
-        }
-    }
+    if 'title' in data:
+        update_data['title'] = data['title']
     
-    app.logger.info(f"Attempting comment creation with mutation 2")
+    if 'description' in data:
+        update_data['description'] = data['description']
     
-    # Try the second mutation attempt
-    result2 = execute_query(mutation2, variables2)
+    if 'stateId' in data:
+        update_data['stateId'] = data['stateId']
     
-    # Check if the second attempt succeeded
-    if result2 and 'data' in result2 and 'commentCreate' in result2['data'] and result2['data']['commentCreate'].get('success'):
-        app.logger.info("Comment creation successful with second attempt")
-        return True
-        
-    # If second attempt also failed, log errors and try direct HTTP approach
-    if result2 and 'errors' in result2:
-        app.logger.error(f"Second attempt errors: {json.dumps(result2['errors'])}")
+    if 'assigneeId' in data:
+        update_data['assigneeId'] = data['assigneeId'] if data['assigneeId'] else None
     
-    # Fallback attempt: Try a direct HTTP request with minimal structure
-    try:
-        app.logger.info("Trying fallback direct HTTP approach")
-        
-        # Make a direct HTTP request
-        headers = {
-            'Authorization': LINEAR_API_KEY,
-            'Content-Type': 'application/json'
-        }
-        
-        # Create the simplest possible payload
-        payload = {
-            'query': """
-            mutation {
-                commentCreate(input: { 
-                    issueId: "%s", 
-                    body: "%s" 
-                }) { 
-                    success 
-                    comment {
-                        id
-                        body
-                        user {
-                            id
-                            name
-                            displayName
-                        }
-                        createdAt
-                    }
-                }
+    return update_data
+
+ISSUE_UPDATE_VARIABLES = "$id: String!, $input: IssueUpdateInput!"
+ISSUE_UPDATE_SELECTION = """
+    issueUpdate(id: $id, input: $input) {
+        success
+        issue {
+            id
+            state {
+                id
+                name
             }
-            """ % (issue_id, comment.replace('"', '\\"').replace('\n', '\\n'))
         }
+    }
+"""
+
+def update_issues(updates):
+    """Update several issues with aliased issueUpdate mutations, chunked per request
+
+    updates is a list of (issue_id, input) pairs. Returns a list of
+    (success, error_message) tuples in the same order. Each chunk of
+    LINEAR_BULK_CHUNK_SIZE updates is sent as one document to stay within
+    Linear's complexity limits
+    """
+    outcomes = [None] * len(updates)
+    pending = []
+    for index, (issue_id, data) in enumerate(updates):
+        found, exists = existence_cache.get(('issue', issue_id))
+        if found and not exists:
+            outcomes[index] = (False, "Issue not found")
+        else:
+            pending.append(index)
+    
+    for chunk_start in range(0, len(pending), LINEAR_BULK_CHUNK_SIZE):
+        chunk = pending[chunk_start:chunk_start + LINEAR_BULK_CHUNK_SIZE]
+        parts = OrderedDict()
+        for index in chunk:
+            issue_id, data = updates[index]
+            parts[f"u{index}"] = (ISSUE_UPDATE_VARIABLES, ISSUE_UPDATE_SELECTION, {"id": issue_id, "input": data})
+        
+        mutation, variables = compose_queries('BulkIssueUpdate', parts, operation='mutation')
+        result = execute_query(mutation, variables)
+        app.logger.info(f"Bulk update of {len(chunk)} issues: {'failed' if not result else 'sent'}")
+        
+        # Errors for aliased fields carry the alias as the first path element.
+        # Errors without one (e.g. a rejected document) concern the whole chunk
+        # and say nothing about whether any one issue exists
+        errors_by_alias = {}
+        chunk_errors = []
+        for error in (result or {}).get('errors') or []:
+            path = error.get('path') or []
+            if path:
+                errors_by_alias.setdefault(path[0], []).append(error)
+            else:
+                chunk_errors.append(error)
         
-        # Log the direct request for debugging
-        app.logger.info(f"Direct request payload: {json.dumps(payload)}")
-        
-        # Execute the direct request
-        response = requests.post(LINEAR_API_URL, json=payload, headers=headers)
-        
-        # Log the response
-        app.logger.info(f"Direct request response: {response.status_code}")
-        app.logger.info(f"Direct request response body: {response.text}")
-        
-        # Check if the direct request succeeded
-        result3 = response.json()
-        if response.status_code == 200 and 'data' in result3 and 'commentCreate' in result3['data'] and result3['data']['commentCreate'].get('success'):
-            app.logger.info("Comment creation successful with direct HTTP approach")
-            return True
+        for index in chunk:
+            issue_id, _data = updates[index]
+            alias = f"u{index}"
+            errors = errors_by_alias.get(alias, [])
+            payload = ((result or {}).get('data') or {}).get(alias)
             
-        return False
-    except Exception as e:
-        app.logger.error(f"Exception in direct HTTP approach: {str(e)}")
-        return False
+            if payload and payload.get('success'):
+                remember_existence('issue', issue_id, True)
+                outcomes[index] = (True, None)
+            elif is_not_found_error({'errors': errors}) and confirm_missing('issue', issue_id):
+                outcomes[index] = (False, "Issue not found")
+            elif errors:
+                outcomes[index] = (False, '; '.join(error.get('message', 'Unknown error') for error in errors))
+            elif chunk_errors:
+                outcomes[index] = (False, "Bulk update failed: " + '; '.join(
+                    error.get('message', 'Unknown error') for error in chunk_errors))
+            elif not result:
+                outcomes[index] = (False, "Failed to reach Linear API")
+            else:
+                outcomes[index] = (False, "Failed to update issue")
+    
+    if any(success for success, _error in outcomes):
+        # Project issue counts depend on issue state and membership
+        invalidate_cache('projects')
+    return outcomes
 
 def update_issue(issue_id, data):
     """Update an issue with the given data"""
     try:
-        app.logger.info(f"Attempting to update issue {issue_id} with data: {json.dumps(data)}")
-        
-        # First, verify the issue exists
-        verify_query = """
-        query VerifyIssue($id: String!) {
-            issue(id: $id) {
-                id
-                identifier
-                title
-            }
-        }
-        """
-        
-        verify_vars = {"id": issue_id}
-        verify_result = execute_query(verify_query, verify_vars)
-        
-        # Log the verification result
-        app.logger.info(f"Issue verification: {json.dumps(verify_result)}")
-        
-        if not verify_result or 'data' not in verify_result or not verify_result['data'].get('issue'):
-            app.logger.error(f"Issue with ID {issue_id} could not be verified")
-            return False, "Issue not found"
+        log_event(writes_log, logging.DEBUG, "Updating issue", data, issue_id=issue_id)
         
         # Standard issue update mutation
         mutation = """
@@ -1058,15 +3111,14 @@ def update_issue(issue_id, data):
             "input": data
         }
         
-        # Log the mutation and variables
-        app.logger.info(f"Update mutation: {mutation}")
-        app.logger.info(f"Update variables: {json.dumps(variables)}")
-        
         # Execute the update query
-        result = execute_query(mutation, variables)
+        result, not_found = execute_write('issue', issue_id, mutation, variables)
+        
+        log_event(writes_log, logging.DEBUG, "Update result", result, issue_id=issue_id)
         
-        # Log the full result
-        app.logger.info(f"Update result: {json.dumps(result)}")
+        if not_found:
+            app.logger.error(f"Issue with ID {issue_id} could not be found")
+            return False, "Issue not found"
         
         if result and 'errors' in result:
             error_messages = [error.get('message', 'Unknown error') for error in result['errors']]
@@ -1074,9 +3126,13 @@ def update_issue(issue_id, data):
             app.logger.error(f"GraphQL errors: {error_message}")
             return False, error_message
         
-        return (result and 'data' in result and 
-                'issueUpdate' in result['data'] and 
-                result['data']['issueUpdate'].get('success')), None
+        success = (result and 'data' in result and 
+                   'issueUpdate' in result['data'] and 
+                   result['data']['issueUpdate'].get('success'))
+        if success:
+            # Project issue counts depend on issue state and membership
+            invalidate_cache('projects')
+        return success, None
     except Exception as e:
         app.logger.error(f"Exception updating issue: {str(e)}")
         return False, f"Exception: {str(e)}"
@@ -1110,11 +3166,16 @@ def project_roadmap():
         flash('Please select a team first')
         return redirect(url_for('index'))
     
-    projects = get_projects(team_id)
+    # Projects and teams are independent, so fetch them in parallel
+    results = fetch_concurrently({
+        'projects': (get_projects, team_id),
+        'teams': (get_teams,)
+    })
+    projects = results['projects']
     
     # Get team data for display
     team_name = None
-    teams = get_teams()
+    teams = results['teams']
     for team in teams:
         if team['id'] == team_id:
             team_name = team['name']
@@ -1141,37 +3202,44 @@ def roadmap():
     project_id = request.args.get('project_id')
     
     # Debug authentication info
-    app.logger.info(f"Session contains: access_token={bool('access_token' in session)}, refresh_token={bool('refresh_token' in session)}, token_expiry={bool('token_expiry' in session)}")
+    app.logger.info(f"Session contains: user={bool('user' in session)}, token_expiry={bool('token_expiry' in session)}")
     app.logger.info(f"LINEAR_API_KEY is set: {bool(LINEAR_API_KEY)}")
     
     if not team_id:
         flash('Please select a team first')
         return redirect(url_for('index'))
     
-    workflow_states = get_workflow_states(team_id)
-    issues = get_issues(team_id, project_id)
+    # Taken before syncing, so /api/board_changes may repeat (but never miss) a change
+    cursor = board_cursor() if LINEAR_ISSUE_STORE_PATH else None
+    
+    # States, the first issue page and the project list arrive in one request,
+    # which asgi.py may already have sent on its event loop
+    roadmap_prefetch = prefetched('roadmap')
+    if roadmap_prefetch:
+        roadmap_data = finish_roadmap_data(*roadmap_prefetch)
+    else:
+        roadmap_data = get_roadmap_data(team_id, project_id)
+    workflow_states = roadmap_data['workflow_states']
+    column_index = roadmap_data['column_index']
+    
+    # Drop issues into their columns as they stream in, skipping unknown states
+    columns = [[] for _state in workflow_states]
+    issue_count = 0
+    for issue in roadmap_data['issues']:
+        issue_count += 1
+        index = column_index.get(issue['state']['id'])
+        if index is not None:
+            columns[index].append(issue)
     
     # Get project name if project_id is provided
     project_name = None
-    if project_id:
-        projects = get_projects(team_id)
-        for project in projects:
-            if project['id'] == project_id:
-                project_name = project['name']
-                break
-    
-    # Debug: Log the number of issues returned
-    app.logger.info(f"Retrieved {len(issues)} issues for team {team_id} and project {project_id or 'None'}")
+    if roadmap_data['project']:
+        project_name = roadmap_data['project']['name']
     
-    # Group issues by workflow state
-    issues_by_state = {}
-    for state in workflow_states:
-        issues_by_state[state['id']] = []
+    issues_by_state = {state['id']: columns[index] for index, state in enumerate(workflow_states)}
     
-    for issue in issues:
-        state_id = issue['state']['id']
-        if state_id in issues_by_state:
-            issues_by_state[state_id].append(issue)
+    # Debug: Log the number of issues returned
+    app.logger.info(f"Retrieved {issue_count} issues for team {team_id} and project {project_id or 'None'}")
     
     return render_template(
         'roadmap.html', 
@@ -1179,14 +3247,14 @@ def roadmap():
         project_id=project_id,
         project_name=project_name,
         workflow_states=workflow_states, 
-        issues_by_state=issues_by_state
+        issues_by_state=issues_by_state,
+        board_cursor=cursor
     )
 
-@app.route('/issue/<issue_id>')
-def issue_details(issue_id):
-    # Get issue details
-    query = """
-    query Issue($id: String!) {
+# The issue page only fetches the issue and its first page of comments; the
+# edit form loads team states and members from /api/team_options when opened
+ISSUE_DETAILS_QUERY = """
+    query Issue($id: String!, $commentsFirst: Int, $commentsLast: Int) {
         issue(id: $id) {
             id
             identifier
@@ -1204,50 +3272,42 @@ def issue_details(issue_id):
             team {
                 id
                 name
-                states {
-                    nodes {
-                        id
-                        name
-                    }
-                }
-                members {
-                    nodes {
-                        id
-                        name
-                        displayName
-                    }
-                }
             }
-            comments {
+            comments(first: $commentsFirst, last: $commentsLast) {
                 nodes {
                     id
                     body
+                    user {
+                        name
+                        displayName
+                    }
                     createdAt
                 }
+""" + COMMENT_PAGE_INFO + """
             }
         }
     }
-    """
-    
-    variables = {"id": issue_id}
-    result = execute_query(query, variables)
+"""
+
+def issue_details_variables(issue_id):
+    """Get the ISSUE_DETAILS_QUERY variables for an issue"""
+    if LINEAR_COMMENTS_NEWEST_FIRST:
+        return {"id": issue_id, "commentsFirst": None, "commentsLast": LINEAR_COMMENTS_PAGE_SIZE}
+    return {"id": issue_id, "commentsFirst": LINEAR_COMMENTS_PAGE_SIZE, "commentsLast": None}
+
+@app.route('/issue/<issue_id>')
+def issue_details(issue_id):
+    # Get issue details, unless asgi.py already fetched them
+    result = prefetched('issue') or execute_query(ISSUE_DETAILS_QUERY, issue_details_variables(issue_id))
     
-    if result and 'data' in result and 'issue' in result['data']:
+    if result and result.get('data') and result['data'].get('issue'):
         issue = result['data']['issue']
-        team_members = []
-        
-        if issue['team'] and 'members' in issue['team']:
-            team_members = issue['team']['members']['nodes']
-        
-        workflow_states = []
-        if issue['team'] and 'states' in issue['team']:
-            workflow_states = issue['team']['states']['nodes']
-        
+        comments = comment_page(issue.get('comments') or {}, LINEAR_COMMENTS_NEWEST_FIRST)
         return render_template(
-            'issue_details.html', 
-            issue=issue, 
-            team_members=team_members,
-            workflow_states=workflow_states
+            'issue_details.html',
+            issue=issue,
+            comments=comments,
+            comments_newest_first=LINEAR_COMMENTS_NEWEST_FIRST
         )
     
     flash('Issue not found')
@@ -2119,19 +4179,15 @@ def login():
 @app.route('/auth/callback')
 def auth_callback():
     """Handle Linear OAuth callback"""
-    # Log all request details for debugging
-    app.logger.info("OAuth callback received")
-    app.logger.info(f"Full URL: {request.url}")
-    app.logger.info(f"Query params: {request.args}")
-    app.logger.info(f"Headers: {dict(request.headers)}")
+    # The query string carries the authorization code, so it is only logged
+    # as a payload, where the code is redacted; the URL and headers aren't
+    log_event(auth_log, logging.INFO, "OAuth callback received", request.args.to_dict())
     
     # Verify state to prevent CSRF
     state = request.args.get('state')
     error = request.args.get('error')
     error_description = request.args.get('error_description')
     
-    app.logger.info(f"Auth callback received with args: {request.args}")
-    
     if error:
         app.logger.error(f"OAuth error: {error} - {error_description}")
         flash(f"Authentication error: {error_description}", "danger")
@@ -2151,7 +4207,6 @@ def auth_callback():
     
     # Exchange the authorization code for an access token
     try:
-        token_url = "https://api.linear.app/oauth/token"
         token_payload = {
             "client_id": LINEAR_CLIENT_ID,
             "client_secret": LINEAR_CLIENT_SECRET,
@@ -2160,35 +4215,37 @@ def auth_callback():
             "grant_type": "authorization_code"
         }
         
-        app.logger.info(f"Exchanging auth code for token with payload: {json.dumps(token_payload)}")
+        log_event(auth_log, logging.DEBUG, "Exchanging auth code for token", token_payload)
         
         # Use data parameter instead of json for x-www-form-urlencoded content type
-        token_response = requests.post(token_url, data=token_payload)
-        app.logger.info(f"Token response status: {token_response.status_code}")
-        app.logger.info(f"Token response headers: {dict(token_response.headers)}")
-        app.logger.info(f"Token response body: {token_response.text}")
+        token_response = linear_post(LINEAR_TOKEN_URL, data=token_payload)
+        auth_log.info("Token response status: %s", token_response.status_code)
         
         # Try to parse the JSON response, but handle non-JSON responses
         try:
             token_data = token_response.json()
         except json.JSONDecodeError:
-            app.logger.error(f"Failed to parse token response as JSON: {token_response.text}")
+            auth_log.error("Failed to parse token response as JSON: %s", truncate(token_response.text))
             flash("Error parsing response from Linear. Please check server logs.", "danger")
             return redirect(url_for('index'))
         
         if 'error' in token_data or token_response.status_code != 200:
-            app.logger.error(f"Error getting access token: {token_data}")
+            log_event(auth_log, logging.ERROR, "Error getting access token", token_data)
             flash(f"Error getting access token: {token_data.get('error_description', 'Unknown error')}", "danger")
             return redirect(url_for('index'))
         
-        # Store the access token in session
         session.permanent = True
-        session['access_token'] = token_data['access_token']
         
         # Get user information
         user_info = get_user_info(token_data['access_token'])
         session['user'] = user_info
         
+        # The tokens stay on the server, with the token manager; the session
+        # cookie is signed but not encrypted
+        if user_info.get('id') != 'unknown':
+            tokens = token_manager.store(user_info['id'], token_data)
+            session['token_expiry'] = tokens['expires_at']
+        
         flash("Successfully logged in!", "success")
         return redirect(url_for('index'))
     
@@ -2217,7 +4274,7 @@ def get_user_info(access_token):
             "Content-Type": "application/json",
             "Authorization": f"Bearer {access_token}"
         }
-        response = requests.post(
+        response = linear_post(
             LINEAR_API_URL,
             json={"query": query},
             headers=headers
@@ -2246,6 +4303,9 @@ def get_user_info(access_token):
 @app.route('/logout')
 def logout():
     """Log user out by clearing session"""
+    user = session.get('user')
+    if user:
+        token_manager.forget(user.get('id'))
     session.clear()
     flash("You have been successfully logged out.", "success")
     return redirect(url_for('index'))
@@ -2268,7 +4328,7 @@ def get_linear_user_info(access_token):
         "Content-Type": "application/json"
     }
     
-    response = requests.post(
+    response = linear_post(
         LINEAR_API_URL,
         json={"query": query},
         headers=headers
@@ -2282,22 +4342,255 @@ def get_linear_user_info(access_token):
     app.logger.error(f"Failed to get user info: {response.text}")
     return None
 
-def refresh_access_token(refresh_token):
-    """Refresh the access token using the refresh token"""
-    token_url = "https://api.linear.app/oauth/token"
-    payload = {
-        "client_id": LINEAR_CLIENT_ID,
-        "client_secret": LINEAR_CLIENT_SECRET,
-        "refresh_token": refresh_token,
-        "grant_type": "refresh_token"
-    }
-    
-    response = requests.post(token_url, data=payload)
-    
-    if response.status_code == 200:
-        return response.json()
-    app.logger.error(f"Failed to refresh token: {response.text}")
-    return None
+def refresh_access_token(refresh_token):
+    """Refresh the access token using the refresh token
+
+    Returns the token response, Linear's error response if it rejected the
+    refresh token (e.g. invalid_grant), or None if the request failed
+    """
+    payload = {
+        "client_id": LINEAR_CLIENT_ID,
+        "client_secret": LINEAR_CLIENT_SECRET,
+        "refresh_token": refresh_token,
+        "grant_type": "refresh_token"
+    }
+    
+    response = linear_post(LINEAR_TOKEN_URL, data=payload)
+    
+    if response.status_code == 200:
+        return response.json()
+    app.logger.error(f"Failed to refresh token: {response.text}")
+    if response.status_code in (400, 401):
+        try:
+            error_data = response.json()
+        except ValueError:
+            return None
+        if isinstance(error_data, dict) and error_data.get('error'):
+            return error_data
+    return None
+
+def _token_store_connection():
+    """Get this thread's SQLite connection to the token store, creating it owner-only on first use"""
+    connection = getattr(_token_store_local, 'connection', None)
+    if connection is None:
+        # Create the file before SQLite does so it is never readable by others;
+        # SQLite gives its journal files the same permissions
+        os.close(os.open(LINEAR_TOKEN_STORE_PATH, os.O_CREAT | os.O_RDWR, 0o600))
+        os.chmod(LINEAR_TOKEN_STORE_PATH, 0o600)
+        connection = sqlite3.connect(LINEAR_TOKEN_STORE_PATH, timeout=10)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS user_tokens (
+                user_id TEXT PRIMARY KEY,
+                access_token TEXT NOT NULL,
+                refresh_token TEXT,
+                expires_at REAL
+            )
+        """)
+        _token_store_local.connection = connection
+    return connection
+
+def load_user_tokens(user_id):
+    """Get a user's tokens from the token store, or None"""
+    row = _token_store_connection().execute(
+        "SELECT access_token, refresh_token, expires_at FROM user_tokens WHERE user_id = ?",
+        (user_id,)
+    ).fetchone()
+    if not row:
+        return None
+    return {'access_token': row[0], 'refresh_token': row[1], 'expires_at': row[2]}
+
+def save_user_tokens(user_id, entry):
+    """Write a user's tokens to the token store"""
+    connection = _token_store_connection()
+    with connection:
+        connection.execute(
+            "INSERT OR REPLACE INTO user_tokens (user_id, access_token, refresh_token, expires_at) "
+            "VALUES (?, ?, ?, ?)",
+            (user_id, entry['access_token'], entry['refresh_token'], entry['expires_at'])
+        )
+
+def delete_user_tokens(user_id):
+    """Remove a user's tokens from the token store"""
+    connection = _token_store_connection()
+    with connection:
+        connection.execute("DELETE FROM user_tokens WHERE user_id = ?", (user_id,))
+
+class TokenManager:
+    """OAuth tokens of signed-in users, kept valid ahead of their expiry
+
+    Tokens are held per Linear user id and, when persist is set, written
+    through to the token store so they survive restarts and are shared by
+    every worker. A background thread refreshes any token within
+    LINEAR_TOKEN_REFRESH_MARGIN seconds of expiring, so requests don't wait on
+    a refresh; one that finds its token already expired refreshes it inline.
+    Concurrent refreshes for the same user share one call to Linear. A token
+    whose refresh Linear rejects is dropped; after any other failure the
+    refresh isn't retried for check_interval seconds
+    """
+
+    def __init__(self, margin, check_interval, persist=False):
+        self.margin = margin
+        self.check_interval = check_interval
+        self.persist = persist
+        self._tokens = {}
+        self._lock = threading.Lock()
+        self._refreshes = SingleFlight()
+        self._wake = threading.Event()
+        self._thread = None
+        self.refreshed = 0
+        self.failed = 0
+        self.dropped = 0
+
+    def store(self, user_id, token_data):
+        """Keep the tokens from a token response; returns the stored entry"""
+        expires_in = token_data.get('expires_in')
+        with self._lock:
+            previous = self._tokens.get(user_id) or {}
+            entry = {
+                'access_token': token_data['access_token'],
+                # Linear may not rotate the refresh token on every refresh
+                'refresh_token': token_data.get('refresh_token') or previous.get('refresh_token'),
+                'expires_at': time.time() + int(expires_in) if expires_in else None
+            }
+            self._remember(user_id, entry)
+        if self.persist:
+            save_user_tokens(user_id, entry)
+        return dict(entry)
+
+    def _remember(self, user_id, entry):
+        # Called with self._lock held
+        self._tokens[user_id] = entry
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True, name='token-refresher')
+            self._thread.start()
+
+    def forget(self, user_id):
+        """Drop a user's tokens, e.g. at logout"""
+        with self._lock:
+            self._tokens.pop(user_id, None)
+        if self.persist:
+            delete_user_tokens(user_id)
+
+    def _entry(self, user_id, reload=False):
+        """Get a copy of a user's entry, reading the store if it isn't held (or reload is set)"""
+        with self._lock:
+            entry = self._tokens.get(user_id)
+        if self.persist and (reload or entry is None):
+            stored = load_user_tokens(user_id)
+            with self._lock:
+                if stored is None:
+                    self._tokens.pop(user_id, None)
+                    return {}
+                entry = self._tokens.get(user_id)
+                if entry is None or stored['access_token'] != entry['access_token']:
+                    # Another worker refreshed (or this one restarted)
+                    entry = stored
+                    self._remember(user_id, entry)
+        return dict(entry or {})
+
+    def get(self, user_id):
+        """Get a valid access token for a user, or None if there isn't one"""
+        entry = self._entry(user_id)
+        if not entry:
+            return None
+        if entry['expires_at'] is None or not entry['refresh_token']:
+            return entry['access_token']
+        remaining = entry['expires_at'] - time.time()
+        if remaining <= 0:
+            return self.refresh(user_id)
+        if remaining <= self.margin:
+            self._wake.set()
+        return entry['access_token']
+
+    def refresh(self, user_id, force=False):
+        """Refresh a user's token unless it was just refreshed; returns the access token or None
+
+        force refreshes even a token that isn't close to expiring, e.g. after
+        Linear rejected it
+        """
+        return self._refreshes.do(user_id, lambda: self._refresh(user_id, force))
+
+    def _refresh(self, user_id, force):
+        # Pick up a refresh another worker already made
+        entry = self._entry(user_id, reload=True)
+        if not entry or not entry.get('refresh_token'):
+            return None
+        # A request that waited behind another refresh finds a fresh token
+        if not force and entry['expires_at'] and entry['expires_at'] - time.time() > self.margin:
+            return entry['access_token']
+        if not force and entry.get('retry_at', 0) > time.time():
+            return None
+        
+        try:
+            token_data = refresh_access_token(entry['refresh_token'])
+        except requests.RequestException as e:
+            auth_log.warning("Error refreshing the OAuth token of user %s: %s", user_id, e)
+            token_data = None
+        if token_data and 'access_token' in token_data:
+            self.refreshed += 1
+            auth_log.info("Refreshed the OAuth token of user %s", user_id)
+            return self.store(user_id, token_data)['access_token']
+
+        self.failed += 1
+        if token_data and token_data.get('error'):
+            # Linear rejected the refresh token (revoked, expired or already
+            # rotated by another worker); keep a newer one if it was rotated
+            newer = self._entry(user_id, reload=True)
+            if newer and newer['access_token'] != entry['access_token']:
+                return newer['access_token']
+            auth_log.warning("Linear rejected the refresh token of user %s (%s); dropping it",
+                             user_id, token_data['error'])
+            self.dropped += 1
+            self.forget(user_id)
+            return None
+        auth_log.warning("Failed to refresh the OAuth token of user %s", user_id)
+        with self._lock:
+            if user_id in self._tokens:
+                self._tokens[user_id]['retry_at'] = time.time() + self.check_interval
+        return None
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.check_interval)
+            self._wake.clear()
+            now = time.time()
+            with self._lock:
+                due = [user_id for user_id, entry in self._tokens.items()
+                       if entry['refresh_token'] and entry['expires_at']
+                       and entry['expires_at'] - now <= self.margin
+                       and entry.get('retry_at', 0) <= now]
+            for user_id in due:
+                try:
+                    self.refresh(user_id)
+                except Exception as e:
+                    auth_log.error("Error refreshing the OAuth token of user %s: %s", user_id, e, exc_info=True)
+
+    def stats(self):
+        """Get the number of users tracked and refresh counters"""
+        with self._lock:
+            users = len(self._tokens)
+        return {'users': users, 'refreshed': self.refreshed, 'failed': self.failed,
+                'dropped': self.dropped, 'persisted': self.persist}
+
+token_manager = TokenManager(LINEAR_TOKEN_REFRESH_MARGIN, LINEAR_TOKEN_REFRESH_INTERVAL,
+                             persist=bool(LINEAR_TOKEN_STORE_PATH))
+
+def user_access_token():
+    """Get a valid OAuth token for the signed-in user, or None to use the API key
+
+    A signed-in user without a usable token (e.g. Linear revoked it) is signed
+    out, so their actions don't silently go out under the API key
+    """
+    user = session.get('user')
+    if not user:
+        return None
+    access_token = token_manager.get(user.get('id'))
+    if not access_token:
+        session.pop('user', None)
+        session.pop('token_expiry', None)
+        flash("Your Linear session has expired. Please log in again.", "warning")
+    return access_token
 
 @app.route('/debug/oauth-config')
 def debug_oauth_config():
@@ -2308,9 +4601,102 @@ def debug_oauth_config():
         'client_secret_configured': bool(LINEAR_CLIENT_SECRET),
         'ngrok_enabled': NGROK_ENABLED,
         'ngrok_available': ngrok_available,
-        'ngrok_url': ngrok_tunnel_url
+        'ngrok_url': ngrok_tunnel_url,
+        'token_manager': token_manager.stats()
     })
 
+@app.before_request
+def start_request_timer():
+    """Note when a request started, for the route latency metrics"""
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    """Record route latency and status for /metrics"""
+    started = g.pop('request_started', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        metrics.observe('http_request_duration_seconds', time.perf_counter() - started,
+                        {'route': route, 'method': request.method})
+        metrics.inc('http_requests_total', {'route': route, 'method': request.method,
+                                            'status': str(response.status_code)})
+    return response
+
+def stats_metrics():
+    """Express the pool, cache, rate-limit, single-flight and comment-write stats as metrics"""
+    pool = get_pool_stats()
+    cache = response_cache.stats()
+    throttling = rate_limiter.stats()
+    coalescing = single_flight.stats()
+    comment_paths = get_comment_write_stats()['paths']
+    return [
+        ('linear_pool_requests_total', 'counter', 'Requests that reused (hit) or opened (miss) a pooled connection',
+         [({'result': 'hit'}, pool['hits']), ({'result': 'miss'}, pool['misses'])]),
+        ('linear_cache_entries', 'gauge', 'Entries in the response cache', [({}, cache['size'])]),
+        ('linear_cache_evictions_total', 'counter', 'Response cache LRU evictions', [({}, cache['evictions'])]),
+        ('linear_rate_limit_throttled_seconds_total', 'counter', 'Time spent waiting on Linear rate limits',
+         [({}, throttling['throttled_seconds'])]),
+        ('linear_rate_limited_responses_total', 'counter', 'Responses rejected by Linear rate limiting',
+         [({}, throttling['rate_limited_responses'])]),
+        ('linear_single_flight_calls_total', 'counter', 'Reads sent upstream (leader) or coalesced onto one (coalesced)',
+         [({'role': 'leader'}, coalescing['upstream_calls']), ({'role': 'coalesced'}, coalescing['coalesced_calls'])]),
+        ('linear_comment_writes_total', 'counter', 'Comment writes by mutation shape and outcome',
+         [({'path': name, 'result': result}, path_stats[key])
+          for name, path_stats in comment_paths.items()
+          for result, key in (('success', 'successes'), ('failure', 'failures'))]),
+    ]
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Expose query, route and cache metrics in the Prometheus text format"""
+    response = make_response(metrics.render(stats_metrics()))
+    response.headers['Content-Type'] = 'text/plain; version=0.0.4; charset=utf-8'
+    return response
+
+@app.route('/debug/pool-stats')
+def debug_pool_stats():
+    """Expose HTTP connection pool hit/miss counters for monitoring"""
+    return jsonify(get_pool_stats())
+
+@app.route('/debug/rate-limit-stats')
+def debug_rate_limit_stats():
+    """Expose rate-limit budgets and time spent throttled for monitoring"""
+    return jsonify(rate_limiter.stats())
+
+@app.route('/debug/single-flight-stats')
+def debug_single_flight_stats():
+    """Expose how many concurrent reads were coalesced into shared upstream calls"""
+    stats = single_flight.stats()
+    stats['async'] = async_single_flight.stats()
+    return jsonify(stats)
+
+@app.route('/debug/comment-write-stats')
+def debug_comment_write_stats():
+    """Expose per-path latency and failure counters for comment writes"""
+    return jsonify(get_comment_write_stats())
+
+@app.route('/debug/activity-log-stats')
+def debug_activity_log_stats():
+    """Expose the size and watermark of each activity log"""
+    with _activity_logs_lock:
+        logs = dict(activity_logs)
+    return jsonify({_sync_scope(team_id or '', project_id): log.stats() for (team_id, project_id), log in logs.items()})
+
+@app.route('/debug/board-feed-stats')
+def debug_board_feed_stats():
+    """Expose subscribers and event counts of the live board feeds"""
+    with _board_feeds_lock:
+        feeds = dict(board_feeds)
+    stats = {_sync_scope(team_id, project_id): feed.stats() for (team_id, project_id), feed in feeds.items()}
+    return jsonify({'feeds': stats, 'wsgi_streams': board_streams, 'max_wsgi_streams': LINEAR_FEED_MAX_STREAMS})
+
+@app.route('/debug/cache-stats')
+def debug_cache_stats():
+    """Expose response cache hit-rate stats for monitoring"""
+    stats = response_cache.stats()
+    stats['ttls'] = LINEAR_CACHE_TTLS
+    return jsonify(stats)
+
 @app.route('/oauth-setup-help')
 def oauth_setup_help():
     """Provides help for setting up OAuth"""
@@ -2386,6 +4772,245 @@ def debug_test_linear_auth():
         encoded_redirect_uri=encoded_redirect_uri
     )
 
+# Linear webhooks
+def verify_webhook_signature(body, signature):
+    """Check a Linear-Signature header against the HMAC-SHA256 of the raw body"""
+    if not LINEAR_WEBHOOK_SECRET or not signature:
+        return False
+    expected = hmac.new(LINEAR_WEBHOOK_SECRET.encode('utf-8'), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+def issue_from_webhook(data):
+    """Convert an Issue webhook payload into the node shape the Issues query returns"""
+    state = data.get('state') or {}
+    assignee = data.get('assignee')
+    return {
+        'id': data['id'],
+        'identifier': data.get('identifier'),
+        'title': data.get('title'),
+        'description': data.get('description'),
+        'priority': data.get('priority') or 0,
+        'priorityLabel': data.get('priorityLabel'),
+        'labels': {
+            'nodes': [
+                {'id': label.get('id'), 'name': label.get('name'), 'color': label.get('color')}
+                for label in data.get('labels') or []
+            ]
+        },
+        'state': {
+            'id': state.get('id') or data.get('stateId'),
+            'name': state.get('name'),
+            'color': state.get('color')
+        },
+        'assignee': {
+            'id': assignee.get('id'),
+            'name': assignee.get('name'),
+            'displayName': assignee.get('displayName') or assignee.get('name')
+        } if assignee else None,
+        'project': {'id': data['projectId']} if data.get('projectId') else None,
+        'createdAt': data.get('createdAt'),
+        'updatedAt': data.get('updatedAt'),
+        'archivedAt': data.get('archivedAt')
+    }
+
+def _replace_node(nodes, node, action):
+    """Apply a create/update/remove of node to a list of nodes, matched by id"""
+    nodes[:] = [existing for existing in nodes if existing.get('id') != node['id']]
+    if action != 'remove':
+        nodes.append(node)
+
+def apply_issue_webhook(action, data):
+    """Apply an Issue event to the local issue store"""
+    if not LINEAR_ISSUE_STORE_PATH:
+        return
+    team_id = data.get('teamId')
+    if action == 'remove':
+        delete_stored_issue(data['id'])
+    elif team_id:
+        store_issues(team_id, [issue_from_webhook(data)])
+    # Push the change to open boards now rather than at their next poll
+    for feed in team_board_feeds(team_id):
+        feed.wake()
+
+def apply_comment_webhook(action, data):
+    """Apply a Comment event to the cached comment list of its issue"""
+    if not data.get('issueId'):
+        return
+    user = data.get('user') or {}
+    comment = {
+        'id': data['id'],
+        'body': data.get('body'),
+        'user': {
+            'name': user.get('name'),
+            'displayName': user.get('displayName') or user.get('name')
+        } if user else None,
+        'createdAt': data.get('createdAt')
+    }
+    
+    def patch(result):
+        issue = result['data'].get('issue')
+        if not issue or issue.get('id') != data['issueId'] or not issue.get('comments'):
+            return
+        nodes = issue['comments']['nodes']
+        present = any(node.get('id') == comment['id'] for node in nodes)
+        # Cached pages are windows of the thread: edits and removals apply where
+        # the comment already is, and new comments only join the newest page
+        if present or (action == 'create' and not (issue['comments'].get('pageInfo') or {}).get('hasNextPage')):
+            _replace_node(nodes, comment, action)
+            nodes.sort(key=lambda node: node.get('createdAt') or '')
+    
+    cache_update('comments', patch)
+    if action == 'create':
+        publish_comment_activity(data)
+
+def publish_comment_activity(data):
+    """Send a new comment to the live feeds of its issue's boards"""
+    if not LINEAR_ISSUE_STORE_PATH:
+        return
+    row = _issue_store_connection().execute(
+        "SELECT team_id, project_id, data FROM issues WHERE id = ?", (data['issueId'],)
+    ).fetchone()
+    if not row:
+        return
+    team_id, project_id, issue_data = row[0], row[1], json.loads(row[2])
+    user = data.get('user') or {}
+    activity = {
+        'id': data['id'],
+        'type': 'comment_created',
+        'createdAt': data.get('createdAt'),
+        'user': {
+            'id': user.get('id'),
+            'name': user.get('displayName') or user.get('name') or 'Anonymous'
+        },
+        'issue': {'id': issue_data['id'], 'identifier': issue_data.get('identifier'), 'title': issue_data.get('title')},
+        'comment': data.get('body') or ''
+    }
+    for feed in team_board_feeds(team_id):
+        if feed.project_id in (None, project_id):
+            feed.publish('activity', activity)
+
+def apply_project_webhook(action, data):
+    """Apply a Project event to cached project lists and lookups"""
+    if action == 'create':
+        # New projects need the count fields the webhook doesn't carry
+        invalidate_cache('projects')
+        return
+    
+    fields = ['name', 'description', 'icon', 'color', 'state', 'startDate', 'targetDate',
+              'progress', 'completedAt', 'updatedAt']
+    
+    def patch_nodes(nodes):
+        for project in list(nodes):
+            if project.get('id') != data['id']:
+                continue
+            if action == 'remove':
+                nodes.remove(project)
+            else:
+                project.update({field: data[field] for field in fields if field in data})
+    
+    def patch(result):
+        result_data = result['data']
+        if result_data.get('project') and result_data['project'].get('id') == data['id']:
+            if action == 'remove':
+                result_data['project'] = None
+            else:
+                result_data['project'].update({field: data[field] for field in fields if field in data})
+        if result_data.get('projects'):
+            patch_nodes(result_data['projects']['nodes'])
+        if result_data.get('team') and result_data['team'].get('projects'):
+            patch_nodes(result_data['team']['projects']['nodes'])
+    
+    cache_update('projects', patch)
+
+def apply_workflow_state_webhook(action, data):
+    """Apply a WorkflowState event to the cached state list of its team"""
+    if not data.get('teamId'):
+        return
+    state = {field: data.get(field) for field in ['id', 'name', 'color', 'position', 'type']}
+    
+    def patch(result):
+        team = result['data'].get('team')
+        if team and team.get('states'):
+            _replace_node(team['states']['nodes'], state, action)
+    
+    if not cache_update('workflow_states', patch, WORKFLOW_STATES_QUERY, {"teamId": data['teamId']}):
+        invalidate_cache('workflow_states')
+    workflow_orderings.invalidate(data['teamId'])
+
+WEBHOOK_HANDLERS = {
+    'Issue': apply_issue_webhook,
+    'Comment': apply_comment_webhook,
+    'Project': apply_project_webhook,
+    'WorkflowState': apply_workflow_state_webhook
+}
+
+@csrf.exempt
+@app.route('/webhooks/linear', methods=['POST'])
+def linear_webhook():
+    """Receive Linear webhook events and apply them to cached data"""
+    body = request.get_data()
+    if not verify_webhook_signature(body, request.headers.get('Linear-Signature')):
+        app.logger.warning("Rejected Linear webhook with a missing or invalid signature")
+        return jsonify({'success': False, 'error': 'Invalid signature'}), 401
+    
+    try:
+        payload = json.loads(body)
+    except json.JSONDecodeError:
+        return jsonify({'success': False, 'error': 'Invalid JSON payload'}), 400
+    
+    # Reject stale deliveries to limit replay of captured requests
+    webhook_timestamp = payload.get('webhookTimestamp')
+    if LINEAR_WEBHOOK_MAX_AGE and webhook_timestamp:
+        age = time.time() - webhook_timestamp / 1000
+        if age > LINEAR_WEBHOOK_MAX_AGE:
+            app.logger.warning(f"Rejected Linear webhook delivered {int(age)}s ago")
+            return jsonify({'success': False, 'error': 'Webhook timestamp too old'}), 401
+    
+    if LINEAR_ISSUE_STORE_PATH:
+        record_webhook_delivery()
+    
+    event_type = payload.get('type')
+    action = payload.get('action')
+    data = payload.get('data') or {}
+    handler = WEBHOOK_HANDLERS.get(event_type)
+    if not handler or not data.get('id'):
+        return jsonify({'success': True, 'applied': False})
+    
+    try:
+        handler(action, data)
+    except Exception as e:
+        app.logger.error(f"Failed to apply {event_type} {action} webhook: {str(e)}", exc_info=True)
+        return jsonify({'success': False, 'error': 'Failed to apply webhook'}), 500
+    
+    app.logger.info(f"Applied {event_type} {action} webhook for {data['id']}")
+    return jsonify({'success': True, 'applied': True})
+
+@app.cli.command('replay-webhooks')
+@click.argument('path')
+def replay_webhooks(path):
+    """Replay recorded Linear webhook payloads from a JSON file against /webhooks/linear
+
+    The file holds one payload or a list of payloads. Each is signed with
+    LINEAR_WEBHOOK_SECRET, so the normal verification path is exercised.
+    """
+    if not LINEAR_WEBHOOK_SECRET:
+        raise click.ClickException("LINEAR_WEBHOOK_SECRET must be set to sign replayed payloads")
+    
+    with open(path) as f:
+        payloads = json.load(f)
+    if isinstance(payloads, dict):
+        payloads = [payloads]
+    
+    client = app.test_client()
+    for payload in payloads:
+        # Recorded payloads keep their original timestamp, so drop it to skip the age check
+        payload.pop('webhookTimestamp', None)
+        body = json.dumps(payload).encode('utf-8')
+        signature = hmac.new(LINEAR_WEBHOOK_SECRET.encode('utf-8'), body, hashlib.sha256).hexdigest()
+        response = client.post('/webhooks/linear', data=body, content_type='application/json',
+                               headers={'Linear-Signature': signature})
+        click.echo(f"{payload.get('type')} {payload.get('action')} -> {response.status_code} {response.get_json()}")
+
 @app.route('/api/diagnose')
 def api_diagnose():
     """A diagnostic endpoint to check API connectivity"""
@@ -2396,10 +5021,14 @@ def api_diagnose():
     results['has_oauth_config'] = bool(LINEAR_CLIENT_ID and LINEAR_CLIENT_SECRET)
     results['has_user_session'] = bool(session.get('user'))
     
-    # Try a basic API call to check connectivity
+    # The connectivity check and the team fetch are independent, so start both at once
     viewer_query = "query { viewer { id name } }"
+    viewer_future = submit_fetch(execute_query, viewer_query)
+    teams_future = submit_fetch(get_teams)
+    
+    # Try a basic API call to check connectivity
     try:
-        viewer_result = execute_query(viewer_query)
+        viewer_result = viewer_future.result()
         results['api_accessible'] = bool(viewer_result and 'data' in viewer_result and 'viewer' in viewer_result['data'])
         if results['api_accessible']:
             results['user_name'] = viewer_result['data']['viewer'].get('name', 'Unknown')
@@ -2409,7 +5038,7 @@ def api_diagnose():
     
     # Try to get teams
     try:
-        teams = get_teams()
+        teams = teams_future.result()
         results['can_fetch_teams'] = bool(teams)
         results['team_count'] = len(teams)
         
@@ -2435,185 +5064,558 @@ def api_diagnose():
     
     return jsonify(results)
 
-@app.route('/api/get_activity')
-def api_get_activity():
-    """Retrieve recent activity for issues"""
-    try:
-        project_id = request.args.get('project_id')
-        team_id = request.args.get('team_id')
-        
-        # Base query to get recent activity - updated to use correct schema
-        query = """
-        query GetActivity($teamId: ID, $projectId: ID) {
-          # Get issues sorted by most recently updated to show recent activity
-          issues(
-            first: 25,
-            orderBy: updatedAt,
-            filter: {
-              team: { id: { eq: $teamId } }
-              project: { id: { eq: $projectId } }
-            }
-          ) {
+# Recent activity: latest updated issues with their state history, plus recent
+# comments. $since limits both to what changed after an activity log's watermark,
+# and the after cursors page through everything that did
+ACTIVITY_ISSUES_SELECTION = """
+      # Get issues sorted by most recently updated to show recent activity
+      issues(
+        first: 25,
+        after: $issuesAfter,
+        orderBy: updatedAt,
+        filter: {
+          team: { id: { eq: $teamId } }
+          project: { id: { eq: $projectId } }
+          updatedAt: { gte: $since }
+        }
+      ) {
+        nodes {
+          id
+          identifier
+          title
+          createdAt
+          updatedAt
+          creator {
+            id
+            name
+            displayName
+          }
+          state {
+            id
+            name
+            color
+          }
+          history(first: 10) {
             nodes {
               id
-              identifier
-              title
               createdAt
-              updatedAt
-              creator {
+              fromState {
                 id
                 name
-                displayName
               }
-              state {
+              toState {
                 id
                 name
-                color
-              }
-              history(first: 10) {
-                nodes {
-                  id
-                  createdAt
-                  fromState {
-                    id
-                    name
-                  }
-                  toState {
-                    id
-                    name
-                  }
-                  actor {
-                    id
-                    name
-                    displayName
-                  }
-                }
               }
-            }
-          }
-          
-          # Get recent comments
-          comments(
-            first: 25,
-            orderBy: createdAt,
-            filter: {
-              issue: { 
-                team: { id: { eq: $teamId } }
-                project: { id: { eq: $projectId } }
-              }
-            }
-          ) {
-            nodes {
-              id
-              createdAt
-              body
-              user {
+              actor {
                 id
                 name
                 displayName
               }
-              issue {
-                id
-                identifier
-                title
-              }
             }
           }
         }
-        """
-        
-        variables = {}
-        if team_id:
-            variables["teamId"] = team_id
-        if project_id:
-            variables["projectId"] = project_id
-            
-        # Execute the GraphQL query
-        result = execute_query(query, variables)
+        pageInfo {
+          hasNextPage
+          endCursor
+        }
+      }
+"""
+
+ACTIVITY_COMMENTS_SELECTION = """
+      # Get recent comments
+      comments(
+        first: 25,
+        after: $commentsAfter,
+        orderBy: createdAt,
+        filter: {
+          issue: { 
+            team: { id: { eq: $teamId } }
+            project: { id: { eq: $projectId } }
+          }
+          createdAt: { gte: $since }
+        }
+      ) {
+        nodes {
+          id
+          createdAt
+          body
+          user {
+            id
+            name
+            displayName
+          }
+          issue {
+            id
+            identifier
+            title
+          }
+        }
+        pageInfo {
+          hasNextPage
+          endCursor
+        }
+      }
+"""
+
+def activity_document(issues=True, comments=True):
+    """Build a GetActivity document for issues, comments or both"""
+    variables = "$teamId: ID, $projectId: ID, $since: DateTimeOrDuration"
+    selections = ""
+    if issues:
+        variables += ", $issuesAfter: String"
+        selections += ACTIVITY_ISSUES_SELECTION
+    if comments:
+        variables += ", $commentsAfter: String"
+        selections += ACTIVITY_COMMENTS_SELECTION
+    return f"""
+    query GetActivity({variables}) {{{selections}    }}
+"""
+
+ACTIVITY_QUERY = activity_document()
+ACTIVITY_ISSUES_QUERY = activity_document(comments=False)
+ACTIVITY_COMMENTS_QUERY = activity_document(issues=False)
+
+def activity_variables(team_id=None, project_id=None, since=None):
+    """Build the GetActivity variables, leaving out filters that weren't given"""
+    variables = {}
+    if team_id:
+        variables["teamId"] = team_id
+    if project_id:
+        variables["projectId"] = project_id
+    if since:
+        variables["since"] = since
+    return variables
+
+def newest_first(nodes):
+    """Return nodes ordered by createdAt, newest first
+
+    Linear already returns most connections in this order, so the check is a
+    single pass and only out-of-order lists are sorted
+    """
+    if all(nodes[i]['createdAt'] >= nodes[i + 1]['createdAt'] for i in range(len(nodes) - 1)):
+        return nodes
+    return sorted(nodes, key=lambda node: node['createdAt'], reverse=True)
+
+def merge_activities(streams, limit=None):
+    """Merge activity streams that are each newest first into one, stopping at limit
+
+    A heap holds the head of each stream, so taking n entries from k streams
+    costs O(n log k) and the rest of each stream is never looked at
+    """
+    merged = heapq.merge(*streams, key=lambda activity: activity['createdAt'], reverse=True)
+    return list(itertools.islice(merged, limit))
+
+def issue_created_activities(issues):
+    """Issue creation events, newest first"""
+    for issue in newest_first([issue for issue in issues if issue.get('creator')]):
+        yield {
+            'id': f"{issue['id']}_created",
+            'type': 'issue_created',
+            'createdAt': issue['createdAt'],
+            'user': {
+                'id': issue['creator']['id'],
+                'name': issue['creator']['displayName'] or issue['creator']['name']
+            },
+            'issue': {
+                'id': issue['id'],
+                'identifier': issue['identifier'],
+                'title': issue['title']
+            }
+        }
+
+def state_change_activities(issue):
+    """State changes in one issue's history, newest first"""
+    events = [
+        event for event in (issue.get('history') or {}).get('nodes') or []
+        if (isinstance(event, dict) and
+            isinstance(event.get('fromState'), dict) and
+            isinstance(event.get('toState'), dict))
+    ]
+    for event in newest_first(events):
+        yield {
+            'id': event['id'],
+            'type': 'state_changed',
+            'createdAt': event['createdAt'],
+            'user': {
+                'id': event['actor']['id'] if event.get('actor') else None,
+                'name': event['actor']['displayName'] or event['actor']['name'] if event.get('actor') else 'Unknown'
+            },
+            'issue': {
+                'id': issue['id'],
+                'identifier': issue['identifier'],
+                'title': issue['title']
+            },
+            'fromState': event['fromState']['name'],
+            'toState': event['toState']['name']
+        }
+
+def comment_activities(comments):
+    """Comment events, newest first"""
+    for comment in newest_first(comments):
+        yield {
+            'id': comment['id'],
+            'type': 'comment_created',
+            'createdAt': comment['createdAt'],
+            'user': {
+                'id': comment['user']['id'] if comment.get('user') else None,
+                'name': comment['user']['displayName'] or comment['user']['name'] if comment.get('user') else 'Anonymous'
+            },
+            'issue': comment['issue'],
+            'comment': comment['body']
+        }
+
+def _activity_next_cursor(result, connection):
+    """Get the cursor of a GetActivity connection's next page, or None if it's exhausted"""
+    page_info = ((result['data'].get(connection) or {}).get('pageInfo')) or {}
+    return page_info.get('endCursor') if page_info.get('hasNextPage') else None
+
+def fetch_activity(team_id=None, project_id=None, since=None, first_page=None):
+    """Fetch activity since a watermark, following both connections to their end
+
+    Without since (seeding a log) only the first page is fetched. With since,
+    every issue and comment changed after it is fetched, up to
+    LINEAR_ACTIVITY_LOG_SIZE of each since older ones couldn't be kept anyway.
+    first_page is an already fetched first page. Returns a GetActivity result
+    with the nodes of all pages, or None if any page failed, so the caller's
+    watermark doesn't move past activity it never saw
+    """
+    result = first_page or execute_query(ACTIVITY_QUERY, activity_variables(team_id, project_id, since))
+    if not result or 'data' not in result or not since:
+        return result
+    
+    merged = {'data': {
+        'issues': {'nodes': list((result['data'].get('issues') or {}).get('nodes') or [])},
+        'comments': {'nodes': list((result['data'].get('comments') or {}).get('nodes') or [])}
+    }}
+    issues_after = _activity_next_cursor(result, 'issues')
+    comments_after = _activity_next_cursor(result, 'comments')
+    while issues_after or comments_after:
+        if (len(merged['data']['issues']['nodes']) >= LINEAR_ACTIVITY_LOG_SIZE
+                and len(merged['data']['comments']['nodes']) >= LINEAR_ACTIVITY_LOG_SIZE):
+            break
+        variables = activity_variables(team_id, project_id, since)
+        if issues_after and comments_after:
+            query = ACTIVITY_QUERY
+            variables.update(issuesAfter=issues_after, commentsAfter=comments_after)
+        elif issues_after:
+            query = ACTIVITY_ISSUES_QUERY
+            variables['issuesAfter'] = issues_after
+        else:
+            query = ACTIVITY_COMMENTS_QUERY
+            variables['commentsAfter'] = comments_after
         
+        page = execute_query(query, variables)
+        if not page or 'data' not in page or page.get('errors'):
+            return None
+        for connection in ('issues', 'comments'):
+            merged['data'][connection]['nodes'].extend((page['data'].get(connection) or {}).get('nodes') or [])
+        issues_after = issues_after and _activity_next_cursor(page, 'issues')
+        comments_after = comments_after and _activity_next_cursor(page, 'comments')
+    return merged
+
+def activities_from_result(result, limit=None):
+    """Turn a GetActivity result into feed entries, newest first
+
+    Each source (issue creations, every issue's state history, comments) is its
+    own ordered stream; new sources only need to yield entries newest first
+    """
+    issues = (result['data'].get('issues') or {}).get('nodes') or []
+    comments = (result['data'].get('comments') or {}).get('nodes') or []
+    
+    streams = [issue_created_activities(issues), comment_activities(comments)]
+    streams.extend(state_change_activities(issue) for issue in issues)
+    return merge_activities(streams, limit)
+
+class ActivityLog:
+    """Recent activity of one board, collected incrementally
+
+    Events are kept oldest to newest in a ring buffer of LINEAR_ACTIVITY_LOG_SIZE
+    entries, each numbered with an increasing seq that serves as the paging
+    cursor. The watermark is the newest createdAt seen: refreshes only ask Linear
+    for activity since then, and events already in the log are skipped by id
+    """
+
+    def __init__(self, max_events):
+        self.events = deque()
+        self.max_events = max_events
+        self.watermark = None
+        self.refreshed_at = None
+        self.refreshes = 0
+        self._ids = set()
+        self._seq = 0
+        self._lock = threading.Lock()
+        # Held while fetching, so concurrent requests share one refresh
+        self.refresh_lock = threading.Lock()
+
+    def due(self):
+        """Check whether the log should fetch new activity"""
+        return self.refreshed_at is None or time.monotonic() - self.refreshed_at >= LINEAR_ACTIVITY_REFRESH_INTERVAL
+
+    def apply(self, result, since):
+        """Add the new events of a GetActivity result fetched with the given since
+
+        Returns the number of events added
+        """
+        added = 0
+        with self._lock:
+            # Only the watermark this fetch was made from is trusted to be complete
+            if since != self.watermark:
+                return 0
+            # Anything past the newest max_events would be dropped right away
+            for activity in reversed(activities_from_result(result, self.max_events)):
+                if activity['id'] in self._ids or (since and activity['createdAt'] < since):
+                    continue
+                self._seq += 1
+                self.events.append((self._seq, activity))
+                self._ids.add(activity['id'])
+                added += 1
+                if len(self.events) > self.max_events:
+                    _seq, dropped = self.events.popleft()
+                    self._ids.discard(dropped['id'])
+                if self.watermark is None or activity['createdAt'] > self.watermark:
+                    self.watermark = activity['createdAt']
+            self.refreshed_at = time.monotonic()
+            self.refreshes += 1
+        return added
+
+    def page(self, limit, before=None, after=None):
+        """Get up to limit events, newest first, older than before or newer than after
+
+        Returns (activities, cursor), where cursor is the seq of the oldest event
+        returned, for the next page's before, or None when nothing older is left
+        """
+        with self._lock:
+            page = []
+            for seq, activity in reversed(self.events):
+                if before is not None and seq >= before:
+                    continue
+                if after is not None and seq <= after:
+                    break
+                if len(page) == limit:
+                    return [activity for _seq, activity in page], page[-1][0]
+                page.append((seq, activity))
+            return [activity for _seq, activity in page], None
+
+    def latest(self):
+        """Get the seq of the newest event, for a later page's after"""
+        with self._lock:
+            return self.events[-1][0] if self.events else 0
+
+    def stats(self):
+        """Get the log's size and refresh counters"""
+        with self._lock:
+            return {
+                'events': len(self.events),
+                'max_events': self.max_events,
+                'watermark': self.watermark,
+                'refreshes': self.refreshes,
+                'latest': self.events[-1][0] if self.events else 0
+            }
+
+# Least recently used first, with the monotonic time each log was last used
+activity_logs = OrderedDict()
+_activity_logs_used = {}
+_activity_logs_lock = threading.Lock()
+
+def get_activity_log(team_id=None, project_id=None):
+    """Get the activity log for a board, or for the whole workspace
+
+    Logs unused for LINEAR_ACTIVITY_LOG_IDLE_TTL seconds are dropped, and the
+    least recently used ones beyond LINEAR_ACTIVITY_LOGS_MAX; a dropped board
+    starts a fresh log on its next request
+    """
+    key = (team_id, project_id)
+    now = time.monotonic()
+    with _activity_logs_lock:
+        log = activity_logs.get(key)
+        if log is None:
+            log = activity_logs[key] = ActivityLog(LINEAR_ACTIVITY_LOG_SIZE)
+        activity_logs.move_to_end(key)
+        _activity_logs_used[key] = now
+        while len(activity_logs) > max(1, LINEAR_ACTIVITY_LOGS_MAX) or (
+                now - _activity_logs_used[next(iter(activity_logs))] > LINEAR_ACTIVITY_LOG_IDLE_TTL):
+            oldest, _log = activity_logs.popitem(last=False)
+            del _activity_logs_used[oldest]
+        return log
+
+def refresh_activity_log(log, team_id=None, project_id=None):
+    """Fetch activity since the log's watermark if a refresh is due
+
+    Returns False when the fetch failed
+    """
+    if not log.due():
+        return True
+    with log.refresh_lock:
+        # Another request may have refreshed while this one waited
+        if not log.due():
+            return True
+        since = log.watermark
+        prefetched_activity = prefetched('activity')
+        first_page = None
+        if prefetched_activity and prefetched_activity.get('since') == since:
+            first_page = prefetched_activity['result']
+        result = fetch_activity(team_id, project_id, since, first_page)
         if not result or 'data' not in result:
             app.logger.error(f"Failed to fetch activity data: {result}")
+            return False
+        added = log.apply(result, since)
+    app.logger.info(f"Added {added} activity events for team {team_id or 'None'} and project {project_id or 'None'}")
+    return True
+
+@app.route('/api/issue_comments/<issue_id>')
+def api_issue_comments(issue_id):
+    """Get a further page of an issue's comments
+
+    Query args: cursor (from the previous page), newest=1 to page backward from
+    the newest comment, and limit (at most 250, Linear's page size cap)
+    """
+    newest = request.args.get('newest', '').lower() in ('true', '1', 'yes')
+    limit = request.args.get('limit', type=int) or LINEAR_COMMENTS_PAGE_SIZE
+    page = get_issue_comments(issue_id, request.args.get('cursor') or None, newest, max(1, min(limit, 250)))
+    if page is None:
+        return jsonify({'success': False, 'error': 'Failed to fetch comments'}), 502
+    page['success'] = True
+    return jsonify(page)
+
+@app.route('/api/team_options/<team_id>')
+def api_team_options(team_id):
+    """Get a team's workflow states and members, for the issue edit form"""
+    states = get_workflow_states(team_id)
+    if not states:
+        return jsonify({'success': False, 'error': 'Failed to fetch workflow states'}), 502
+    return jsonify({
+        'success': True,
+        'states': [{'id': state['id'], 'name': state['name']} for state in states],
+        'members': [
+            {'id': member['id'], 'name': member.get('displayName') or member.get('name')}
+            for member in get_team_members(team_id)
+        ]
+    })
+
+@app.route('/api/board_changes')
+def api_board_changes():
+    """Get the issues added, moved or removed on a board since a cursor"""
+    team_id = request.args.get('team_id')
+    project_id = request.args.get('project_id') or None
+    since = request.args.get('since')
+    
+    if not team_id:
+        return jsonify({'success': False, 'error': 'team_id is required'}), 400
+    if not LINEAR_ISSUE_STORE_PATH:
+        return jsonify({
+            'success': False,
+            'error': 'Board changes need the local issue store (LINEAR_ISSUE_STORE_PATH)'
+        }), 400
+    if since is not None and not since.isdigit():
+        return jsonify({'success': False, 'error': 'since must be a cursor returned by this endpoint'}), 400
+    
+    try:
+        changes = get_board_changes(team_id, project_id, int(since) if since is not None else None)
+    except Exception as e:
+        app.logger.error(f"Error computing board changes: {str(e)}", exc_info=True)
+        return jsonify({'success': False, 'error': f"Failed to get board changes: {str(e)}"}), 500
+    
+    changes['success'] = True
+    return jsonify(changes)
+
+@app.route('/api/board_events')
+def api_board_events():
+    """Stream a board's changes and activity as Server-Sent Events
+
+    Every browser on the same board shares one BoardFeed, so N viewers cost one
+    upstream sync per interval. since (or the Last-Event-ID a reconnecting
+    browser sends) replays changes the browser missed from the local store.
+    Each stream holds a request thread here, so past LINEAR_FEED_MAX_STREAMS
+    open streams the answer is a 503 and the page polls /api/board_changes;
+    asgi.py serves this route on the event loop instead
+    """
+    global board_streams
+    team_id = request.args.get('team_id')
+    project_id = request.args.get('project_id') or None
+    since = request.headers.get('Last-Event-ID') or request.args.get('since')
+    
+    if not team_id:
+        return jsonify({'success': False, 'error': 'team_id is required'}), 400
+    if not LINEAR_ISSUE_STORE_PATH:
+        return jsonify({
+            'success': False,
+            'error': 'Live board events need the local issue store (LINEAR_ISSUE_STORE_PATH)'
+        }), 400
+    
+    with _board_streams_lock:
+        if board_streams >= LINEAR_FEED_MAX_STREAMS:
             return jsonify({
                 'success': False,
-                'error': 'Failed to fetch activity data',
-                'raw_response': result
-            }), 400
-            
-        # Process the results into a unified activity feed
-        activities = []
-        
-        # Process issue creation and state changes
-        if 'issues' in result['data'] and 'nodes' in result['data']['issues']:
-            issues = result['data']['issues']['nodes']
-            
-            # Process issue creation events
-            for issue in issues:
-                # Add issue creation event
-                if issue.get('creator'):
-                    activities.append({
-                        'id': f"{issue['id']}_created",
-                        'type': 'issue_created',
-                        'createdAt': issue['createdAt'],
-                        'user': {
-                            'id': issue['creator']['id'],
-                            'name': issue['creator']['displayName'] or issue['creator']['name']
-                        },
-                        'issue': {
-                            'id': issue['id'],
-                            'identifier': issue['identifier'],
-                            'title': issue['title']
-                        }
-                    })
-                
-                # Process issue history (state changes)
-                if 'history' in issue and 'nodes' in issue['history']:
-                    for event in issue['history']['nodes']:
-                        if (isinstance(event, dict) and 
-                            event.get('fromState') and 
-                            event.get('toState') and
-                            isinstance(event['fromState'], dict) and
-                            isinstance(event['toState'], dict)):
-                            activities.append({
-                                'id': event['id'],
-                                'type': 'state_changed',
-                                'createdAt': event['createdAt'],
-                                'user': {
-                                    'id': event['actor']['id'] if event.get('actor') else None,
-                                    'name': event['actor']['displayName'] or event['actor']['name'] if event.get('actor') else 'Unknown'
-                                },
-                                'issue': {
-                                    'id': issue['id'],
-                                    'identifier': issue['identifier'],
-                                    'title': issue['title']
-                                },
-                                'fromState': event['fromState']['name'],
-                                'toState': event['toState']['name']
-                            })
-        
-        # Process comments
-        if 'comments' in result['data'] and 'nodes' in result['data']['comments']:
-            for comment in result['data']['comments']['nodes']:
-                activities.append({
-                    'id': comment['id'],
-                    'type': 'comment_created',
-                    'createdAt': comment['createdAt'],
-                    'user': {
-                        'id': comment['user']['id'] if comment.get('user') else None,
-                        'name': comment['user']['displayName'] or comment['user']['name'] if comment.get('user') else 'Anonymous'
-                    },
-                    'issue': comment['issue'],
-                    'comment': comment['body']
-                })
-        
-        # Sort all activities by creation date (newest first)
-        activities.sort(key=lambda x: x['createdAt'], reverse=True)
+                'error': 'Too many live boards are open; poll /api/board_changes instead'
+            }), 503
+        board_streams += 1
+    
+    feed, subscriber = subscribe_board_feed(team_id, project_id)
+    closed = threading.Event()
+    
+    def close():
+        global board_streams
+        if closed.is_set():
+            return
+        closed.set()
+        feed.unsubscribe(subscriber)
+        with _board_streams_lock:
+            board_streams -= 1
+    
+    try:
+        messages, ended = board_stream_start(team_id, project_id, since)
+    except Exception:
+        close()
+        raise
+    
+    def stream():
+        yield from messages
+        if ended:
+            return
+        while True:
+            try:
+                event, data, event_id = subscriber.get(timeout=LINEAR_FEED_HEARTBEAT)
+            except queue.Empty:
+                yield ": keepalive\n\n"
+                continue
+            yield format_sse(event, data, event_id)
+            if event == 'reset':
+                return
+    
+    response = Response(stream(), mimetype='text/event-stream', headers=SSE_HEADERS)
+    # Runs when the server closes the response, even if streaming never began
+    response.call_on_close(close)
+    return response
+
+@app.route('/api/get_activity')
+def api_get_activity():
+    """Retrieve recent activity for issues
+
+    Served from the board's activity log, newest first. Pass the returned cursor
+    as before to page back through older events, or latest as after to get only
+    what happened since an earlier call. limit defaults to LINEAR_ACTIVITY_PAGE_SIZE
+    """
+    try:
+        project_id = request.args.get('project_id')
+        team_id = request.args.get('team_id')
+        before = request.args.get('before', type=int)
+        after = request.args.get('after', type=int)
+        limit = max(1, min(request.args.get('limit', type=int) or LINEAR_ACTIVITY_PAGE_SIZE, LINEAR_ACTIVITY_LOG_SIZE))
         
-        # Limit to 50 most recent activities
-        activities = activities[:50]
+        log = get_activity_log(team_id, project_id)
+        if not refresh_activity_log(log, team_id, project_id) and log.refreshed_at is None:
+            return jsonify({
+                'success': False,
+                'error': 'Failed to fetch activity data'
+            }), 400
         
+        activities, cursor = log.page(limit, before=before, after=after)
         return jsonify({
             'success': True,
-            'activities': activities
+            'activities': activities,
+            'cursor': cursor,
+            'latest': log.latest()
         })
         
     except Exception as e:
@@ -2623,6 +5625,33 @@ def api_get_activity():
             'error': f"Failed to fetch activity: {str(e)}"
         }), 500
 
+# Async prefetchers for asgi.py, keyed by endpoint. Each one receives the query
+# args and view args, sends the view's Linear requests on the event loop and
+# returns the results for prefetched(), or None to let the view fetch itself
+async def prefetch_roadmap(args):
+    team_id = args.get('team_id')
+    if not team_id:
+        return None
+    return {'roadmap': await async_get_roadmap_data(team_id, args.get('project_id'))}
+
+async def prefetch_issue_details(args, issue_id):
+    return {'issue': await async_execute_query(ISSUE_DETAILS_QUERY, issue_details_variables(issue_id))}
+
+async def prefetch_activity(args):
+    team_id, project_id = args.get('team_id'), args.get('project_id')
+    log = get_activity_log(team_id, project_id)
+    if not log.due():
+        return None
+    since = log.watermark
+    result = await async_execute_query(ACTIVITY_QUERY, activity_variables(team_id, project_id, since))
+    return {'activity': {'since': since, 'result': result}}
+
+ASYNC_PREFETCHERS = {
+    'roadmap': prefetch_roadmap,
+    'issue_details': prefetch_issue_details,
+    'api_get_activity': prefetch_activity
+}
+
 if __name__ == '__main__':
     # Check if API key is set
     if not LINEAR_API_KEY:
@@ -0,0 +1,151 @@
+"""ASGI entry point for serving the app on an event loop
+
+    uvicorn asgi:application
+    gunicorn asgi:application -k uvicorn.workers.UvicornWorker
+
+The Linear requests behind /roadmap, /issue/<id> and /api/get_activity are
+sent with an async HTTP client on the event loop, so slow upstream calls don't
+each hold a worker thread. The Flask view then runs as usual (sessions, flash
+messages, templates) using the prefetched results. All other routes are served
+by the Flask app unchanged, each request on its own thread from a pool of
+LINEAR_ASYNC_WORKER_THREADS, except the live board stream (/api/board_events),
+which is served on the event loop so open boards don't hold threads. The WSGI
+entry point (gunicorn app:app) still works.
+"""
+import asyncio
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from werkzeug.datastructures import MultiDict
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import RequestRedirect
+
+import app as app_module
+from app import (app, ASYNC_PREFETCHERS, LINEAR_ASYNC_WORKER_THREADS, LINEAR_FEED_HEARTBEAT, SSE_HEADERS,
+                 AsyncSubscriber, board_stream_start, format_sse, prefetched_results, subscribe_board_feed,
+                 close_async_http_client, httpx_available)
+
+if not httpx_available:
+    raise RuntimeError("The async entry point needs httpx: pip install httpx asgiref uvicorn")
+
+# asgiref runs WSGI apps through thread-sensitive sync_to_async, which puts
+# every request on one shared thread; run them on a pool instead
+_run_wsgi_app = WsgiToAsgiInstance.__dict__['run_wsgi_app'].func
+
+class ThreadPoolWsgiToAsgiInstance(WsgiToAsgiInstance):
+    """One request of a ThreadPoolWsgiToAsgi app"""
+
+    def __init__(self, wsgi_application, executor):
+        super().__init__(wsgi_application)
+        self.executor = executor
+
+    async def run_wsgi_app(self, body):
+        await sync_to_async(_run_wsgi_app, thread_sensitive=False, executor=self.executor)(self, body)
+
+class ThreadPoolWsgiToAsgi(WsgiToAsgi):
+    """WsgiToAsgi that runs each request on a thread from an executor"""
+
+    def __init__(self, wsgi_application, executor):
+        super().__init__(wsgi_application)
+        self.executor = executor
+
+    async def __call__(self, scope, receive, send):
+        await ThreadPoolWsgiToAsgiInstance(self.wsgi_application, self.executor)(scope, receive, send)
+
+wsgi_executor = ThreadPoolExecutor(max_workers=LINEAR_ASYNC_WORKER_THREADS, thread_name_prefix='wsgi')
+wsgi_application = ThreadPoolWsgiToAsgi(app, wsgi_executor)
+url_adapter = app.url_map.bind('localhost')
+
+def match_endpoint(scope):
+    """Find the endpoint and view args of a GET request, or (None, None)"""
+    if scope['method'] != 'GET':
+        return None, None
+    try:
+        return url_adapter.match(scope['path'], method='GET')
+    except (HTTPException, RequestRedirect):
+        return None, None
+
+def query_args(scope):
+    """Parse a request's query string"""
+    query_string = scope.get('query_string', b'').decode('latin-1')
+    return MultiDict(urllib.parse.parse_qsl(query_string, keep_blank_values=True))
+
+async def wait_for_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+async def board_events(scope, receive, send, args):
+    """Serve /api/board_events on the event loop, like the Flask view but without holding a thread"""
+    team_id, project_id = args.get('team_id'), args.get('project_id') or None
+    headers = dict(scope.get('headers') or [])
+    since = headers.get(b'last-event-id', b'').decode('latin-1') or args.get('since')
+    
+    subscriber = AsyncSubscriber(asyncio.get_running_loop())
+    feed, subscriber = subscribe_board_feed(team_id, project_id, subscriber)
+    disconnected = asyncio.ensure_future(wait_for_disconnect(receive))
+    try:
+        messages, ended = await asyncio.to_thread(board_stream_start, team_id, project_id, since)
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [(b'content-type', b'text/event-stream; charset=utf-8')] +
+                       [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in SSE_HEADERS.items()]
+        })
+        for message in messages:
+            await send({'type': 'http.response.body', 'body': message.encode('utf-8'), 'more_body': True})
+        while not ended:
+            next_event = asyncio.ensure_future(subscriber.get_async())
+            done, _pending = await asyncio.wait({next_event, disconnected}, timeout=LINEAR_FEED_HEARTBEAT,
+                                                return_when=asyncio.FIRST_COMPLETED)
+            if disconnected in done:
+                next_event.cancel()
+                return
+            if next_event in done:
+                event, data, event_id = next_event.result()
+                message = format_sse(event, data, event_id)
+                ended = event == 'reset'
+            else:
+                next_event.cancel()
+                message = ": keepalive\n\n"
+            await send({'type': 'http.response.body', 'body': message.encode('utf-8'), 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        disconnected.cancel()
+        feed.unsubscribe(subscriber)
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await close_async_http_client()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+
+    results = None
+    if scope['type'] == 'http':
+        endpoint, view_args = match_endpoint(scope)
+        if endpoint == 'api_board_events':
+            args = query_args(scope)
+            # Invalid requests get the Flask view's error response
+            if args.get('team_id') and app_module.LINEAR_ISSUE_STORE_PATH:
+                await board_events(scope, receive, send, args)
+                return
+        prefetcher = ASYNC_PREFETCHERS.get(endpoint)
+        if prefetcher:
+            results = await prefetcher(query_args(scope), **view_args)
+
+    # The Flask view runs in a worker thread that inherits this context
+    token = prefetched_results.set(results)
+    try:
+        await wsgi_application(scope, receive, send)
+    finally:
+        prefetched_results.reset(token)
@@ -0,0 +1,365 @@
+"""A local stand-in for api.linear.app/graphql used by the benchmarks
+
+Serves synthetic teams, projects, workflow states, issues and comments for the
+queries the app sends. Top-level fields (and their aliases) are resolved from
+the request document, so composed documents like RoadmapData work too. Nodes
+carry every field the app may select; unselected fields are simply extra
+"""
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STATE_TYPES = ['backlog', 'unstarted', 'started', 'started', 'completed', 'canceled']
+STATE_NAMES = ['Backlog', 'Todo', 'In Progress', 'In Review', 'Done', 'Canceled']
+
+def _timestamp(moment):
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+class Dataset:
+    """Deterministic synthetic Linear workspace"""
+
+    def __init__(self, teams=3, projects_per_team=5, issues_per_team=2000, comments_per_issue=3,
+                 members_per_team=12, seed=1):
+        rng = random.Random(seed)
+        now = datetime.now(timezone.utc)
+        self.teams = []
+        self.states = {}
+        self.members = {}
+        self.projects = {}
+        self.issues = {}
+        self.issues_by_team = {}
+        self.comments_by_issue = {}
+        self.comments = []
+
+        for t in range(teams):
+            team = {'id': f'team-{t}', 'name': f'Team {t}', 'key': f'T{t}'}
+            self.teams.append(team)
+            self.states[team['id']] = [
+                {'id': f'{team["id"]}-state-{i}', 'name': name, 'color': '#%06x' % rng.randrange(1 << 24),
+                 'position': float(i), 'type': state_type}
+                for i, (name, state_type) in enumerate(zip(STATE_NAMES, STATE_TYPES))
+            ]
+            self.members[team['id']] = [
+                {'id': f'{team["id"]}-user-{i}', 'name': f'user{i}', 'displayName': f'User {i}'}
+                for i in range(members_per_team)
+            ]
+            for p in range(projects_per_team):
+                project_id = f'{team["id"]}-project-{p}'
+                start = now - timedelta(days=rng.randrange(200))
+                self.projects[project_id] = {
+                    'id': project_id, 'name': f'Project {t}.{p}', 'description': 'Synthetic project',
+                    'icon': None, 'color': '#5e6ad2', 'state': rng.choice(['planned', 'started', 'completed']),
+                    'startDate': start.strftime('%Y-%m-%d'),
+                    'targetDate': (start + timedelta(days=90)).strftime('%Y-%m-%d'),
+                    'lead': rng.choice(self.members[team['id']]),
+                    'teams': {'nodes': [{'id': team['id'], 'name': team['name']}]},
+                    'progress': round(rng.random(), 2), 'completedAt': None,
+                    'updatedAt': _timestamp(now), 'createdAt': _timestamp(start),
+                    'issueCountHistory': [0, 0], 'completedIssueCountHistory': [0, 0],
+                }
+
+            team_issues = []
+            for i in range(issues_per_team):
+                created = now - timedelta(minutes=rng.randrange(60 * 24 * 180))
+                updated = created + timedelta(minutes=rng.randrange(60 * 24 * 14))
+                state = rng.choice(self.states[team['id']])
+                project_id = f'{team["id"]}-project-{rng.randrange(projects_per_team)}' if projects_per_team else None
+                creator = rng.choice(self.members[team['id']])
+                issue = {
+                    'id': f'{team["id"]}-issue-{i}', 'identifier': f'{team["key"]}-{i + 1}',
+                    'title': f'Synthetic issue {i + 1}', 'description': 'Lorem ipsum dolor sit amet. ' * 8,
+                    'priority': rng.randrange(5), 'priorityLabel': 'Medium',
+                    'labels': {'nodes': []},
+                    'state': {'id': state['id'], 'name': state['name'], 'color': state['color']},
+                    'assignee': rng.choice(self.members[team['id']] + [None]),
+                    'creator': creator,
+                    'project': {'id': project_id} if project_id else None,
+                    'team_id': team['id'],
+                    'createdAt': _timestamp(created), 'updatedAt': _timestamp(updated), 'archivedAt': None,
+                    'history': {'nodes': [{
+                        'id': f'{team["id"]}-issue-{i}-history-0', 'createdAt': _timestamp(updated),
+                        'fromState': {'id': self.states[team['id']][0]['id'], 'name': self.states[team['id']][0]['name']},
+                        'toState': {'id': state['id'], 'name': state['name']}, 'actor': creator,
+                    }]},
+                }
+                self.issues[issue['id']] = issue
+                team_issues.append(issue)
+                if project_id:
+                    self.projects[project_id]['issueCountHistory'][-1] += 1
+                    if state['type'] == 'completed':
+                        self.projects[project_id]['completedIssueCountHistory'][-1] += 1
+
+                comments = []
+                for c in range(comments_per_issue):
+                    comment_time = created + timedelta(minutes=rng.randrange(60 * 24 * 30))
+                    comment = {
+                        'id': f'{issue["id"]}-comment-{c}', 'body': f'Comment {c} on {issue["identifier"]}',
+                        'createdAt': _timestamp(comment_time), 'updatedAt': _timestamp(comment_time),
+                        'user': rng.choice(self.members[team['id']]),
+                        'issue': {'id': issue['id'], 'identifier': issue['identifier'], 'title': issue['title']},
+                        'team_id': team['id'], 'project_id': project_id,
+                    }
+                    comments.append(comment)
+                    self.comments.append(comment)
+                self.comments_by_issue[issue['id']] = sorted(comments, key=lambda c: c['createdAt'])
+
+            # The app orders issue pages by updatedAt
+            self.issues_by_team[team['id']] = sorted(team_issues, key=lambda issue: issue['updatedAt'], reverse=True)
+        self.comments.sort(key=lambda c: c['createdAt'], reverse=True)
+
+def _strip_comments(text):
+    return re.sub(r'#[^\n]*', '', text)
+
+def top_level_fields(query):
+    """Split a document into (alias, field, args, body) for each root selection"""
+    query = _strip_comments(query)
+    # The selection set is the first brace outside the variable definitions
+    start = query.index('{')
+    depth_paren = 0
+    for index, char in enumerate(query):
+        if char == '(':
+            depth_paren += 1
+        elif char == ')':
+            depth_paren -= 1
+        elif char == '{' and depth_paren == 0:
+            start = index
+            break
+
+    fields = []
+    index = start + 1
+    pattern = re.compile(r'\s*(?:(\w+)\s*:\s*)?(\w+)\s*')
+    while True:
+        match = pattern.match(query, index)
+        if not match or not match.group(2):
+            break
+        alias, name = match.group(1), match.group(2)
+        index = match.end()
+        args = ''
+        if index < len(query) and query[index] == '(':
+            end = _matching(query, index, '(', ')')
+            args = query[index + 1:end]
+            index = end + 1
+        while index < len(query) and query[index].isspace():
+            index += 1
+        body = ''
+        if index < len(query) and query[index] == '{':
+            end = _matching(query, index, '{', '}')
+            body = query[index + 1:end]
+            index = end + 1
+        fields.append((alias or name, name, args, body))
+    return fields
+
+def _matching(text, start, open_char, close_char):
+    depth = 0
+    for index in range(start, len(text)):
+        if text[index] == open_char:
+            depth += 1
+        elif text[index] == close_char:
+            depth -= 1
+            if depth == 0:
+                return index
+    raise ValueError('Unbalanced document')
+
+def _argument(args, pattern, variables, default=None):
+    """Resolve an argument matched by pattern to a literal or variable value"""
+    match = re.search(pattern + r'\s*(\$\w+|"[^"]*"|-?\d+|true|false)', args)
+    if not match:
+        return default
+    token = match.group(1)
+    if token.startswith('$'):
+        value = variables.get(token[1:])
+        return default if value is None else value
+    if token.startswith('"'):
+        return token[1:-1]
+    if token in ('true', 'false'):
+        return token == 'true'
+    return int(token)
+
+def _connection(nodes, first, after, last=None, before=None):
+    """Page nodes forward (first/after) or backward (last/before); cursors are offsets"""
+    if last is not None and first is None:
+        end = int(before) if before else len(nodes)
+        start = max(0, end - last)
+    else:
+        start = int(after) if after else 0
+        end = start + (first if first is not None else 50)
+    page = nodes[start:end]
+    return {
+        'nodes': page,
+        'pageInfo': {'hasNextPage': end < len(nodes), 'hasPreviousPage': start > 0,
+                     'startCursor': str(start), 'endCursor': str(start + len(page))}
+    }
+
+class Resolver:
+    """Answer root fields from a Dataset"""
+
+    def __init__(self, dataset):
+        self.data = dataset
+
+    def resolve(self, name, args, body, variables):
+        handler = getattr(self, f'resolve_{name}', None)
+        return handler(args, body, variables) if handler else None
+
+    def resolve_viewer(self, args, body, variables):
+        return {'id': 'viewer', 'name': 'Benchmark', 'email': 'bench@example.com', 'admin': False,
+                'organizationMember': {'role': 'user'}}
+
+    def resolve_teams(self, args, body, variables):
+        return {'nodes': [{'id': team['id'], 'name': team['name']} for team in self.data.teams]}
+
+    def resolve_team(self, args, body, variables):
+        team_id = _argument(args, r'id\s*:', variables)
+        if team_id not in self.data.states:
+            return None
+        team = {'id': team_id}
+        if re.search(r'\bstates\b', body):
+            team['states'] = {'nodes': [dict(state) for state in self.data.states[team_id]]}
+        if re.search(r'\bprojects\b', body):
+            team['projects'] = {'nodes': [self._project(project) for project in self.data.projects.values()
+                                          if project['teams']['nodes'][0]['id'] == team_id]}
+        members_match = re.search(r'\bmembers\s*(\(([^)]*)\))?', body)
+        if members_match:
+            member_args = members_match.group(2) or ''
+            first = _argument(member_args, r'first\s*:', variables, 50)
+            after = _argument(member_args, r'after\s*:', variables)
+            team['members'] = _connection(list(self.data.members[team_id]), first, after)
+        return team
+
+    def _project(self, project):
+        project = dict(project)
+        project['issueCountHistory'] = list(project['issueCountHistory'])
+        project['completedIssueCountHistory'] = list(project['completedIssueCountHistory'])
+        return project
+
+    def resolve_projects(self, args, body, variables):
+        return {'nodes': [self._project(project) for project in self.data.projects.values()]}
+
+    def resolve_project(self, args, body, variables):
+        project = self.data.projects.get(_argument(args, r'id\s*:', variables))
+        return self._project(project) if project else None
+
+    def _issue_node(self, issue, body):
+        node = {key: value for key, value in issue.items() if key not in ('team_id', 'history')}
+        if re.search(r'\bhistory\b', body):
+            node['history'] = issue['history']
+        return node
+
+    def resolve_issues(self, args, body, variables):
+        team_id = _argument(args, r'team\s*:\s*{\s*id\s*:\s*{\s*eq\s*:', variables)
+        project_id = _argument(args, r'project\s*:\s*{\s*id\s*:\s*{\s*eq\s*:', variables)
+        updated_since = _argument(args, r'updatedAt\s*:\s*{\s*gte\s*:', variables)
+        first = _argument(args, r'first\s*:', variables, 50)
+        after = _argument(args, r'after\s*:', variables)
+
+        if team_id:
+            issues = self.data.issues_by_team.get(team_id, [])
+        else:
+            issues = sorted(self.data.issues.values(), key=lambda issue: issue['updatedAt'], reverse=True)
+        if project_id:
+            issues = [issue for issue in issues if (issue['project'] or {}).get('id') == project_id]
+        if updated_since:
+            issues = [issue for issue in issues if issue['updatedAt'] >= updated_since]
+        connection = _connection(issues, first, after)
+        connection['nodes'] = [self._issue_node(issue, body) for issue in connection['nodes']]
+        return connection
+
+    def resolve_issue(self, args, body, variables):
+        issue = self.data.issues.get(_argument(args, r'id\s*:', variables))
+        if not issue:
+            return None
+        node = self._issue_node(issue, body)
+        team_id = issue['team_id']
+        team_match = re.search(r'\bteam\s*{', body)
+        if team_match:
+            team_body = body[team_match.end() - 1:_matching(body, team_match.end() - 1, '{', '}')]
+            node['team'] = self.resolve_team(f'id: "{team_id}"', team_body, variables)
+            node['team']['name'] = next(team['name'] for team in self.data.teams if team['id'] == team_id)
+        comments_match = re.search(r'\bcomments\s*(\(([^)]*)\))?', body)
+        if comments_match:
+            comments = self.data.comments_by_issue.get(issue['id'], [])
+            comment_args = comments_match.group(2) or ''
+            first = _argument(comment_args, r'first\s*:', variables)
+            after = _argument(comment_args, r'after\s*:', variables)
+            last = _argument(comment_args, r'last\s*:', variables)
+            before = _argument(comment_args, r'before\s*:', variables)
+            node['comments'] = _connection(comments, first, after, last, before)
+        return node
+
+    def resolve_comments(self, args, body, variables):
+        team_id = _argument(args, r'team\s*:\s*{\s*id\s*:\s*{\s*eq\s*:', variables)
+        project_id = _argument(args, r'project\s*:\s*{\s*id\s*:\s*{\s*eq\s*:', variables)
+        first = _argument(args, r'first\s*:', variables, 50)
+        after = _argument(args, r'after\s*:', variables)
+        created_since = _argument(args, r'createdAt\s*:\s*{\s*gte\s*:', variables)
+        comments = [
+            comment for comment in self.data.comments
+            if (not team_id or comment['team_id'] == team_id)
+            and (not project_id or comment['project_id'] == project_id)
+            and (not created_since or comment['createdAt'] >= created_since)
+        ]
+        return _connection(comments, first, after)
+
+class FakeLinear:
+    """Threaded HTTP server answering Linear GraphQL requests with configurable latency"""
+
+    def __init__(self, dataset, latency=0.0, jitter=0.0, host='127.0.0.1', port=0):
+        self.resolver = Resolver(dataset)
+        self.latency = latency
+        self.jitter = jitter
+        self.calls = 0
+        self.operations = {}
+        self._lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                payload = json.dumps(fake.handle(body)).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.url = f'http://{host}:{self.server.server_address[1]}/graphql'
+
+    def handle(self, body):
+        query = body.get('query', '')
+        variables = body.get('variables') or {}
+        match = re.match(r'\s*(?:query|mutation)\s+(\w+)', query)
+        with self._lock:
+            self.calls += 1
+            operation = match.group(1) if match else 'anonymous'
+            self.operations[operation] = self.operations.get(operation, 0) + 1
+        if self.latency or self.jitter:
+            time.sleep(self.latency + random.uniform(0, self.jitter))
+        if query.lstrip().startswith('mutation'):
+            return {'data': {}}
+        data = {}
+        for alias, name, args, field_body in top_level_fields(query):
+            data[alias] = self.resolver.resolve(name, args, field_body, variables)
+        return {'data': data}
+
+    def reset_counters(self):
+        with self._lock:
+            calls, operations = self.calls, self.operations
+            self.calls, self.operations = 0, {}
+        return calls, operations
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
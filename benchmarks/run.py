@@ -0,0 +1,161 @@
+"""Benchmark the app's pages against a local fake Linear API
+
+Starts benchmarks/fake_linear.py with a synthetic workspace, points the app at
+it and drives each route through Flask's test client, reporting latency
+percentiles, throughput and upstream Linear calls per route.
+
+    python benchmarks/run.py --requests 200 --concurrency 8 --latency-ms 40
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_linear import Dataset, FakeLinear
+
+ROUTES = ['index', 'roadmap', 'project_roadmap', 'issue', 'activity']
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--routes', default=','.join(ROUTES), help='Comma-separated routes to run: ' + ', '.join(ROUTES))
+    parser.add_argument('--requests', type=int, default=100, help='Measured requests per route')
+    parser.add_argument('--warmup', type=int, default=5, help='Unmeasured requests per route before timing')
+    parser.add_argument('--concurrency', type=int, default=4, help='Client threads')
+    parser.add_argument('--latency-ms', type=float, default=30.0, help='Fake Linear latency per request')
+    parser.add_argument('--jitter-ms', type=float, default=10.0, help='Extra random latency per request')
+    parser.add_argument('--teams', type=int, default=3)
+    parser.add_argument('--projects', type=int, default=5, help='Projects per team')
+    parser.add_argument('--issues', type=int, default=2000, help='Issues per team')
+    parser.add_argument('--comments', type=int, default=3, help='Comments per issue')
+    parser.add_argument('--cold', action='store_true', help='Clear the response cache before every request')
+    parser.add_argument('--no-store', action='store_true', help='Disable the local SQLite issue store')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    return parser.parse_args()
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a sorted list"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(round(fraction * len(values) + 0.5)) - 1))
+    return values[index]
+
+def route_urls(route, dataset):
+    """Yield the URLs to request for a route, cycling through the synthetic data"""
+    teams = [team['id'] for team in dataset.teams]
+    projects = list(dataset.projects)
+    issues = list(dataset.issues)
+    n = 0
+    while True:
+        team_id = teams[n % len(teams)]
+        if route == 'index':
+            yield '/'
+        elif route == 'roadmap':
+            # Alternate between whole-team and single-project boards
+            if n % 2 and projects:
+                project_id = projects[n % len(projects)]
+                yield f'/roadmap?team_id={dataset.projects[project_id]["teams"]["nodes"][0]["id"]}&project_id={project_id}'
+            else:
+                yield f'/roadmap?team_id={team_id}'
+        elif route == 'project_roadmap':
+            yield f'/project_roadmap?team_id={team_id}'
+        elif route == 'issue':
+            yield f'/issue/{issues[(n * 7919) % len(issues)]}'
+        elif route == 'activity':
+            yield f'/api/get_activity?team_id={team_id}'
+        n += 1
+
+def run_route(app_module, fake, route, urls, args):
+    """Issue the warmup and measured requests for one route"""
+    def fetch(url):
+        if args.cold:
+            app_module.response_cache.invalidate()
+        client = app_module.app.test_client()
+        started = time.perf_counter()
+        response = client.get(url)
+        elapsed = time.perf_counter() - started
+        return elapsed, response.status_code
+
+    for _ in range(args.warmup):
+        fetch(next(urls))
+    fake.reset_counters()
+
+    targets = [next(urls) for _ in range(args.requests)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(fetch, targets))
+    wall = time.perf_counter() - started
+    upstream_calls, operations = fake.reset_counters()
+
+    latencies = sorted(elapsed for elapsed, _status in results)
+    statuses = {}
+    for _elapsed, status in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    return {
+        'route': route,
+        'requests': len(results),
+        'statuses': statuses,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'mean_ms': round(statistics.mean(latencies) * 1000, 2) if latencies else 0.0,
+        'throughput_rps': round(len(results) / wall, 2) if wall else 0.0,
+        'upstream_calls': upstream_calls,
+        'upstream_per_request': round(upstream_calls / len(results), 2) if results else 0.0,
+        'operations': operations,
+    }
+
+def print_table(results):
+    header = f"{'route':<16}{'reqs':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'upstream':>10}{'per req':>9}  statuses"
+    print(header)
+    print('-' * len(header))
+    for result in results:
+        statuses = ' '.join(f'{status}:{count}' for status, count in sorted(result['statuses'].items()))
+        print(f"{result['route']:<16}{result['requests']:>6}{result['p50_ms']:>10}{result['p95_ms']:>10}"
+              f"{result['p99_ms']:>10}{result['throughput_rps']:>10}{result['upstream_calls']:>10}"
+              f"{result['upstream_per_request']:>9}  {statuses}")
+    print()
+    for result in results:
+        operations = ', '.join(f'{name}={count}' for name, count in sorted(result['operations'].items()))
+        print(f"{result['route']:<16}{operations}")
+
+def main():
+    args = parse_args()
+    routes = [route.strip() for route in args.routes.split(',') if route.strip()]
+    unknown = set(routes) - set(ROUTES)
+    if unknown:
+        sys.exit(f"Unknown routes: {', '.join(sorted(unknown))}")
+
+    dataset = Dataset(teams=args.teams, projects_per_team=args.projects,
+                      issues_per_team=args.issues, comments_per_issue=args.comments)
+    fake = FakeLinear(dataset, latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000).start()
+
+    # Configure the app before importing it, since settings are read at import time
+    store_dir = tempfile.mkdtemp(prefix='linear-bench-')
+    os.environ.setdefault('LINEAR_API_KEY', 'lin_api_benchmark')
+    os.environ['LINEAR_ISSUE_STORE_PATH'] = '' if args.no_store else os.path.join(store_dir, 'issues.sqlite3')
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    import app as app_module
+    app_module.LINEAR_API_URL = fake.url
+
+    results = []
+    try:
+        for route in routes:
+            results.append(run_route(app_module, fake, route, route_urls(route, dataset), args))
+    finally:
+        fake.stop()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results)
+
+if __name__ == '__main__':
+    main()
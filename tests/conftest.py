@@ -0,0 +1,77 @@
+import os
+import sys
+
+# Settings are read when app is imported, so configure it first
+os.environ.setdefault('LINEAR_API_KEY', 'lin_api_test')
+os.environ['LINEAR_ISSUE_STORE_PATH'] = ''
+os.environ['LINEAR_TOKEN_STORE_PATH'] = ''
+os.environ['LINEAR_WEBHOOK_SECRET'] = 'test-webhook-secret'
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import app as app_module
+
+
+class FakeGraphQL:
+    """Stands in for execute_query, answering with a test's handler and recording calls"""
+
+    def __init__(self):
+        self.calls = []
+        self.handler = lambda query, variables, access_token: {'data': {}}
+
+    def __call__(self, query, variables=None, access_token=None):
+        self.calls.append((query, variables, access_token))
+        return self.handler(query, variables or {}, access_token)
+
+    def operations(self):
+        """Names of the operations sent, in order"""
+        return [query.split('(')[0].split()[1] for query, _variables, _token in self.calls]
+
+
+@pytest.fixture
+def app():
+    return app_module
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    app_module.response_cache.invalidate()
+    app_module.existence_cache.invalidate()
+    yield
+    app_module.response_cache.invalidate()
+    app_module.existence_cache.invalidate()
+
+
+@pytest.fixture
+def graphql(monkeypatch):
+    fake = FakeGraphQL()
+    monkeypatch.setattr(app_module, 'execute_query', fake)
+    return fake
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """Point the app at an empty issue store for this test"""
+    monkeypatch.setattr(app_module, 'LINEAR_ISSUE_STORE_PATH', str(tmp_path / 'issues.sqlite3'))
+    app_module._issue_store_local.connection = None
+    yield app_module._issue_store_connection()
+    app_module._issue_store_local.connection.close()
+    app_module._issue_store_local.connection = None
+
+
+@pytest.fixture
+def token_store(tmp_path, monkeypatch):
+    """Point the app at an empty token store for this test"""
+    monkeypatch.setattr(app_module, 'LINEAR_TOKEN_STORE_PATH', str(tmp_path / 'tokens.sqlite3'))
+    app_module._token_store_local.connection = None
+    yield app_module._token_store_connection()
+    app_module._token_store_local.connection.close()
+    app_module._token_store_local.connection = None
+
+
+@pytest.fixture
+def client():
+    app_module.app.config['TESTING'] = True
+    return app_module.app.test_client()
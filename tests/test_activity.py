@@ -0,0 +1,124 @@
+def comment(comment_id, created_at):
+    return {
+        'id': comment_id,
+        'createdAt': created_at,
+        'body': f'Comment {comment_id}',
+        'user': {'id': 'USER-1', 'name': 'Ada', 'displayName': 'ada'},
+        'issue': {'id': 'ISS-1', 'identifier': 'ENG-1', 'title': 'Issue'}
+    }
+
+
+def activity_result(comments=(), issues=(), comments_after=None, issues_after=None):
+    return {'data': {
+        'issues': {'nodes': list(issues),
+                   'pageInfo': {'hasNextPage': bool(issues_after), 'endCursor': issues_after}},
+        'comments': {'nodes': list(comments),
+                     'pageInfo': {'hasNextPage': bool(comments_after), 'endCursor': comments_after}}
+    }}
+
+
+def test_merge_activities_interleaves_newest_first(app):
+    streams = [
+        iter([{'createdAt': '2024-01-05'}, {'createdAt': '2024-01-01'}]),
+        iter([{'createdAt': '2024-01-04'}, {'createdAt': '2024-01-03'}, {'createdAt': '2024-01-02'}])
+    ]
+
+    merged = app.merge_activities(streams, limit=4)
+
+    assert [activity['createdAt'] for activity in merged] == ['2024-01-05', '2024-01-04', '2024-01-03', '2024-01-02']
+
+
+def test_newest_first_sorts_only_out_of_order_lists(app):
+    ordered = [{'createdAt': '2024-01-02'}, {'createdAt': '2024-01-01'}]
+    assert app.newest_first(ordered) is ordered
+    assert app.newest_first(list(reversed(ordered))) == ordered
+
+
+def test_activities_merge_issue_history_and_comments(app):
+    issue = {
+        'id': 'ISS-1', 'identifier': 'ENG-1', 'title': 'Issue', 'createdAt': '2024-01-01',
+        'creator': {'id': 'USER-1', 'name': 'Ada', 'displayName': 'ada'},
+        'history': {'nodes': [{
+            'id': 'H-1', 'createdAt': '2024-01-03', 'actor': None,
+            'fromState': {'name': 'Todo'}, 'toState': {'name': 'Done'}
+        }]}
+    }
+    result = activity_result(comments=[comment('C-1', '2024-01-02')], issues=[issue])
+
+    activities = app.activities_from_result(result)
+
+    assert [(activity['type'], activity['createdAt']) for activity in activities] == [
+        ('state_changed', '2024-01-03'), ('comment_created', '2024-01-02'), ('issue_created', '2024-01-01')
+    ]
+
+
+def test_activity_log_adds_new_events_once(app):
+    log = app.ActivityLog(10)
+    assert log.apply(activity_result([comment('C-2', '2024-01-02'), comment('C-1', '2024-01-01')]), None) == 2
+    assert log.watermark == '2024-01-02'
+
+    # The next fetch overlaps the watermark; known events are skipped
+    added = log.apply(activity_result([comment('C-3', '2024-01-03'), comment('C-2', '2024-01-02')]), '2024-01-02')
+
+    assert added == 1
+    activities, cursor = log.page(10)
+    assert [activity['id'] for activity in activities] == ['C-3', 'C-2', 'C-1']
+    assert cursor is None
+
+
+def test_activity_log_ignores_results_from_an_old_watermark(app):
+    log = app.ActivityLog(10)
+    log.apply(activity_result([comment('C-2', '2024-01-02')]), None)
+
+    assert log.apply(activity_result([comment('C-1', '2024-01-01')]), None) == 0
+
+
+def test_activity_log_keeps_the_newest_events_and_pages_by_seq(app):
+    log = app.ActivityLog(3)
+    log.apply(activity_result([comment(f'C-{n}', f'2024-01-0{n}') for n in range(5, 0, -1)]), None)
+
+    activities, cursor = log.page(2)
+    assert [activity['id'] for activity in activities] == ['C-5', 'C-4']
+    older, cursor = log.page(2, before=cursor)
+    assert [activity['id'] for activity in older] == ['C-3']
+    assert cursor is None
+
+    latest = log.latest()
+    log.apply(activity_result([comment('C-6', '2024-01-06')]), log.watermark)
+    newer, _cursor = log.page(10, after=latest)
+    assert [activity['id'] for activity in newer] == ['C-6']
+
+
+def test_fetch_activity_follows_every_page_since_the_watermark(app, graphql):
+    pages = {
+        None: activity_result([comment('C-3', '2024-01-03')], comments_after='c1'),
+        'c1': activity_result([comment('C-2', '2024-01-02')], comments_after='c2'),
+        'c2': activity_result([comment('C-1', '2024-01-01')])
+    }
+    graphql.handler = lambda query, variables, access_token: pages[variables.get('commentsAfter')]
+
+    result = app.fetch_activity('TEAM-1', since='2023-12-31')
+
+    assert [node['id'] for node in result['data']['comments']['nodes']] == ['C-3', 'C-2', 'C-1']
+    assert len(graphql.calls) == 3
+
+
+def test_fetch_activity_fails_as_a_whole_when_a_page_fails(app, graphql):
+    graphql.handler = lambda query, variables, access_token: (
+        None if variables.get('commentsAfter') else activity_result([comment('C-2', '2024-01-02')], comments_after='c1')
+    )
+
+    assert app.fetch_activity('TEAM-1', since='2023-12-31') is None
+
+
+def test_idle_activity_logs_are_pruned(app, monkeypatch):
+    monkeypatch.setattr(app, 'activity_logs', app.OrderedDict())
+    monkeypatch.setattr(app, '_activity_logs_used', {})
+    monkeypatch.setattr(app, 'LINEAR_ACTIVITY_LOGS_MAX', 2)
+
+    first = app.get_activity_log('TEAM-1')
+    app.get_activity_log('TEAM-2')
+    assert app.get_activity_log('TEAM-1') is first
+    app.get_activity_log('TEAM-3')
+
+    assert list(app.activity_logs) == [('TEAM-1', None), ('TEAM-3', None)]
@@ -0,0 +1,52 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+asgi = pytest.importorskip('asgi')
+
+
+def call(requests):
+    async def run():
+        transport = httpx.ASGITransport(app=asgi.application)
+        async with httpx.AsyncClient(transport=transport, base_url='http://testserver') as client:
+            return await asyncio.gather(*(client.get(path) for path in requests))
+    return asyncio.run(run())
+
+
+def test_views_run_concurrently_on_worker_threads(app, monkeypatch):
+    threads = set()
+
+    def slow_view():
+        threads.add(threading.current_thread().name)
+        time.sleep(0.5)
+        return app.jsonify({'success': True})
+    monkeypatch.setitem(app.app.view_functions, 'debug_cache_stats', slow_view)
+
+    started = time.monotonic()
+    responses = call(['/debug/cache-stats'] * 3)
+
+    assert [response.status_code for response in responses] == [200] * 3
+    # One shared thread would take 1.5 s
+    assert time.monotonic() - started < 1.2
+    assert len(threads) == 3
+
+
+def test_prefetched_results_reach_the_view(app, monkeypatch):
+    seen = []
+
+    async def prefetch(args, issue_id):
+        return {'issue': {'data': {'issue': {'id': issue_id}}}}
+
+    def view(issue_id):
+        seen.append(app.prefetched('issue'))
+        return app.jsonify({'success': True})
+    monkeypatch.setitem(asgi.ASYNC_PREFETCHERS, 'issue_details', prefetch)
+    monkeypatch.setitem(app.app.view_functions, 'issue_details', view)
+
+    response, = call(['/issue/ISS-1'])
+
+    assert response.status_code == 200
+    assert seen == [{'data': {'issue': {'id': 'ISS-1'}}}]
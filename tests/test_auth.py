@@ -0,0 +1,16 @@
+import logging
+
+
+def test_oauth_callback_does_not_log_the_code(app, client, caplog, monkeypatch):
+    monkeypatch.setattr(app, 'LOG_PAYLOAD_SAMPLE_RATE', 1)
+    caplog.set_level(logging.DEBUG, logger=app.app.logger.name)
+    with client.session_transaction() as session:
+        session['oauth_state'] = 'state-1'
+
+    response = client.get('/auth/callback?code=secret-code&state=state-2',
+                          headers={'X-Forwarded-For': 'secret-header'})
+
+    assert response.status_code == 302
+    assert 'OAuth callback received' in caplog.text
+    assert 'secret-code' not in caplog.text
+    assert 'secret-header' not in caplog.text
@@ -0,0 +1,59 @@
+import pytest
+
+
+def issue(issue_id, updated_at='2024-01-01T00:00:00.000Z', state_id='STATE-1', title=None):
+    return {
+        'id': issue_id,
+        'identifier': issue_id,
+        'title': title or f'Issue {issue_id}',
+        'state': {'id': state_id, 'name': state_id, 'color': '#000'},
+        'project': None,
+        'createdAt': '2024-01-01T00:00:00.000Z',
+        'updatedAt': updated_at,
+        'archivedAt': None
+    }
+
+
+@pytest.fixture
+def board(app, store, monkeypatch):
+    """A board in the store that Linear is never asked about"""
+    monkeypatch.setattr(app, 'sync_issues', lambda *args, **kwargs: 0)
+    app.store_issues('TEAM-1', [issue('ISS-1'), issue('ISS-2'), issue('ISS-3')])
+    return app.board_cursor()
+
+
+def test_changes_since_a_cursor_are_classified(app, client, board):
+    later = '2024-01-02T00:00:00.000Z'
+    app.store_issues('TEAM-1', [issue('ISS-1', later, state_id='STATE-2'),
+                                issue('ISS-2', later, title='Renamed'),
+                                issue('ISS-4', later)])
+    app.store_issues('TEAM-2', [issue('ISS-3', later)])
+
+    changes = client.get(f'/api/board_changes?team_id=TEAM-1&since={board}').get_json()
+
+    assert changes['success'] and not changes['reset']
+    assert [(node['id'], node['previousStateId']) for node in changes['moved']] == [('ISS-1', 'STATE-1')]
+    assert [node['title'] for node in changes['updated']] == ['Renamed']
+    assert [node['id'] for node in changes['added']] == ['ISS-4']
+    assert changes['removed'] == ['ISS-3']
+    assert changes['cursor'] == app.board_cursor()
+
+
+def test_no_cursor_returns_the_current_one(app, client, board):
+    changes = client.get('/api/board_changes?team_id=TEAM-1').get_json()
+
+    assert changes['cursor'] == board
+    assert not any(changes[kind] for kind in ('added', 'moved', 'updated', 'removed'))
+
+
+def test_unknown_cursor_asks_for_a_reload(app, client, board):
+    changes = client.get(f'/api/board_changes?team_id=TEAM-1&since={int(board) + 100}').get_json()
+
+    assert changes['reset'] is True
+
+
+def test_malformed_cursor_is_rejected(app, client, board):
+    response = client.get('/api/board_changes?team_id=TEAM-1&since=yesterday')
+
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
@@ -0,0 +1,133 @@
+import asyncio
+import queue
+
+import pytest
+
+
+
+@pytest.fixture
+def feeds(app, store, monkeypatch):
+    """An empty feed registry whose feeds read the store without syncing from Linear"""
+    monkeypatch.setattr(app, 'board_feeds', app.OrderedDict())
+    monkeypatch.setattr(app, 'sync_issues', lambda *args, **kwargs: 0)
+    monkeypatch.setattr(app, 'get_workflow_ordering', lambda team_id: {'states': [
+        {'id': 'STATE-1', 'name': 'Todo'}, {'id': 'STATE-2', 'name': 'Done'}
+    ]})
+    return app.board_feeds
+
+
+def issue(issue_id, updated_at='2024-01-01T00:00:00.000Z'):
+    return {
+        'id': issue_id,
+        'identifier': issue_id,
+        'title': f'Issue {issue_id}',
+        'state': {'id': 'STATE-1', 'name': 'Todo', 'color': '#000'},
+        'project': None,
+        'createdAt': '2024-01-01T00:00:00.000Z',
+        'updatedAt': updated_at,
+        'archivedAt': None
+    }
+
+
+def moved(issue_id, state_id, updated_at):
+    node = issue(issue_id, updated_at)
+    node['state'] = {'id': state_id, 'name': 'Done', 'color': '#0f0'}
+    return node
+
+
+def test_poll_publishes_board_changes_and_activity(app, feeds):
+    app.store_issues('TEAM-1', [issue('ISS-1')])
+    feed = app.BoardFeed('TEAM-1')
+    subscriber = queue.Queue()
+    feed._subscribers.add(subscriber)
+
+    feed.poll()
+    assert subscriber.empty()
+
+    app.store_issues('TEAM-1', [moved('ISS-1', 'STATE-2', '2024-01-02T00:00:00.000Z')])
+    feed.poll()
+
+    event, changes, event_id = subscriber.get_nowait()
+    assert (event, event_id) == ('board', changes['cursor'])
+    assert [(node['id'], node['previousStateId']) for node in changes['moved']] == [('ISS-1', 'STATE-1')]
+    event, activity, _event_id = subscriber.get_nowait()
+    assert (event, activity['type'], activity['fromState'], activity['toState']) == (
+        'activity', 'state_changed', 'Todo', 'Done')
+    # The store doesn't know who moved it
+    assert activity['user'] is None
+
+
+def test_full_subscriber_is_reset_and_dropped(app):
+    feed = app.BoardFeed('TEAM-1')
+    slow, fast = queue.Queue(maxsize=1), queue.Queue()
+    feed._subscribers.update({slow, fast})
+
+    feed.publish('activity', {'id': 1})
+    feed.publish('activity', {'id': 2})
+
+    assert slow.get_nowait()[0] == 'reset'
+    assert [fast.get_nowait()[1]['id'] for _ in range(2)] == [1, 2]
+    assert feed.stats()['subscribers'] == 1
+
+
+def test_wsgi_streams_are_capped_and_released_on_close(app, client, feeds, monkeypatch):
+    monkeypatch.setattr(app, 'LINEAR_FEED_MAX_STREAMS', 1)
+
+    stream = client.get('/api/board_events?team_id=TEAM-1', buffered=False)
+    assert stream.status_code == 200
+    assert next(stream.response) == b'retry: 5000\n\n'
+
+    refused = client.get('/api/board_events?team_id=TEAM-2')
+    assert refused.status_code == 503
+
+    stream.close()
+    assert app.board_streams == 0
+    assert feeds[('TEAM-1', None)].stats()['subscribers'] == 0
+
+
+def test_reconnecting_browser_gets_missed_changes(app, client, feeds):
+    app.store_issues('TEAM-1', [issue('ISS-1')])
+    cursor = app.board_cursor()
+    app.store_issues('TEAM-1', [moved('ISS-1', 'STATE-2', '2024-01-02T00:00:00.000Z')])
+
+    stream = client.get('/api/board_events?team_id=TEAM-1', headers={'Last-Event-ID': cursor}, buffered=False)
+    chunks = stream.response
+    next(chunks)
+    message = next(chunks).decode('utf-8')
+    stream.close()
+
+    assert message.startswith(f"event: board\nid: {app.board_cursor()}\n")
+    assert '"previousStateId": "STATE-1"' in message
+
+
+def test_asgi_streams_on_the_event_loop(app, feeds):
+    asgi = pytest.importorskip('asgi')
+    scope = {'type': 'http', 'method': 'GET', 'path': '/api/board_events', 'headers': [],
+             'query_string': b'team_id=TEAM-1'}
+
+    async def run():
+        inbox, sent = asyncio.Queue(), []
+
+        async def receive():
+            return await inbox.get()
+
+        async def send(message):
+            sent.append(message)
+
+        async def wait_for(text):
+            while not any(text in message.get('body', b'') for message in sent):
+                await asyncio.sleep(0.01)
+
+        task = asyncio.ensure_future(asgi.application(scope, receive, send))
+        await asyncio.wait_for(wait_for(b'retry'), 2)
+        feeds[('TEAM-1', None)].publish('activity', {'id': 'A-1'})
+        await asyncio.wait_for(wait_for(b'event: activity'), 2)
+        await inbox.put({'type': 'http.disconnect'})
+        await asyncio.wait_for(task, 2)
+        return sent
+
+    sent = asyncio.run(run())
+
+    assert sent[0]['status'] == 200
+    assert (b'content-type', b'text/event-stream; charset=utf-8') in sent[0]['headers']
+    assert feeds[('TEAM-1', None)].stats()['subscribers'] == 0
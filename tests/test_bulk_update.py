@@ -0,0 +1,87 @@
+import re
+
+
+def aliases(query):
+    return re.findall(r'(u\d+): issueUpdate', query)
+
+
+def test_updates_are_sent_as_one_aliased_document(app, graphql):
+    graphql.handler = lambda query, variables, access_token: {
+        'data': {alias: {'success': True} for alias in aliases(query)}
+    }
+
+    outcomes = app.update_issues([('ISS-1', {'priority': 1}), ('ISS-2', {'priority': 2})])
+
+    assert outcomes == [(True, None), (True, None)]
+    assert graphql.operations() == ['BulkIssueUpdate']
+    _query, variables, _token = graphql.calls[0]
+    assert variables['u0_id'] == 'ISS-1'
+    assert variables['u1_input'] == {'priority': 2}
+
+
+def test_errors_are_attributed_by_path(app, graphql):
+    def handler(query, variables, access_token):
+        if 'VerifyIssue' in query:
+            return {'data': {'issue': None}}
+        return {
+            'data': {'u0': {'success': True}, 'u1': None},
+            'errors': [{'message': 'Entity not found', 'path': ['u1']}]
+        }
+    graphql.handler = handler
+
+    outcomes = app.update_issues([('ISS-1', {}), ('ISS-2', {})])
+
+    assert outcomes == [(True, None), (False, 'Issue not found')]
+    assert graphql.calls[1][1] == {'id': 'ISS-2'}
+
+
+def test_not_found_about_another_id_is_reported_as_an_error(app, graphql):
+    def handler(query, variables, access_token):
+        if 'VerifyIssue' in query:
+            return {'data': {'issue': {'id': variables['id']}}}
+        return {
+            'data': {'u0': None},
+            'errors': [{'message': 'State not found', 'path': ['u0']}]
+        }
+    graphql.handler = handler
+
+    outcomes = app.update_issues([('ISS-1', {'stateId': 'bad'})])
+
+    assert outcomes == [(False, 'State not found')]
+    assert app.existence_cache.get(('issue', 'ISS-1')) == (True, True)
+
+
+def test_path_less_errors_fail_the_chunk_without_marking_issues_missing(app, graphql):
+    graphql.handler = lambda query, variables, access_token: {
+        'errors': [{'message': 'Argument not found in document'}]
+    }
+
+    outcomes = app.update_issues([('ISS-1', {}), ('ISS-2', {})])
+
+    assert outcomes == [(False, 'Bulk update failed: Argument not found in document')] * 2
+    assert graphql.operations() == ['BulkIssueUpdate']
+    assert app.existence_cache.get(('issue', 'ISS-1')) == (False, None)
+
+
+def test_issues_known_to_be_missing_are_not_sent(app, graphql):
+    app.remember_existence('issue', 'ISS-1', False)
+    graphql.handler = lambda query, variables, access_token: {
+        'data': {alias: {'success': True} for alias in aliases(query)}
+    }
+
+    outcomes = app.update_issues([('ISS-1', {}), ('ISS-2', {})])
+
+    assert outcomes == [(False, 'Issue not found'), (True, None)]
+    assert aliases(graphql.calls[0][0]) == ['u1']
+
+
+def test_updates_are_chunked(app, graphql, monkeypatch):
+    monkeypatch.setattr(app, 'LINEAR_BULK_CHUNK_SIZE', 2)
+    graphql.handler = lambda query, variables, access_token: {
+        'data': {alias: {'success': True} for alias in aliases(query)}
+    }
+
+    outcomes = app.update_issues([(f'ISS-{n}', {}) for n in range(5)])
+
+    assert outcomes == [(True, None)] * 5
+    assert [aliases(query) for query, _variables, _token in graphql.calls] == [['u0', 'u1'], ['u2', 'u3'], ['u4']]
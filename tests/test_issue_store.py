@@ -0,0 +1,86 @@
+import time
+
+
+def issue(issue_id, updated_at='2024-01-01T00:00:00.000Z', project_id=None):
+    return {
+        'id': issue_id,
+        'identifier': issue_id,
+        'title': f'Issue {issue_id}',
+        'state': {'id': 'STATE-1', 'name': 'Todo', 'color': '#000'},
+        'project': {'id': project_id} if project_id else None,
+        'createdAt': '2024-01-01T00:00:00.000Z',
+        'updatedAt': updated_at,
+        'archivedAt': None
+    }
+
+
+def issues_page(nodes):
+    return {'data': {'issues': {'nodes': nodes, 'pageInfo': {'hasNextPage': False, 'endCursor': None}}}}
+
+
+def stored_ids(store):
+    return {row[0] for row in store.execute("SELECT id FROM issues")}
+
+
+def test_delta_sync_advances_the_watermark(app, store, graphql):
+    graphql.handler = lambda query, variables, access_token: issues_page([issue('ISS-1'), issue('ISS-2')])
+    app.sync_issues('TEAM-1')
+    assert app.get_sync_watermark('TEAM-1') == '2024-01-01T00:00:00.000Z'
+
+    graphql.handler = lambda query, variables, access_token: issues_page(
+        [issue('ISS-2', '2024-01-02T00:00:00.000Z')] if variables.get('updatedSince') else []
+    )
+    assert app.sync_issues('TEAM-1') == 1
+    _query, variables, _token = graphql.calls[-1]
+    assert variables['updatedSince'] == '2024-01-01T00:00:00.000Z'
+    assert app.get_sync_watermark('TEAM-1') == '2024-01-02T00:00:00.000Z'
+
+
+def test_reconcile_removes_issues_that_left_the_board(app, store, graphql):
+    graphql.handler = lambda query, variables, access_token: issues_page(
+        [issue('ISS-1'), issue('ISS-2'), issue('ISS-3')])
+    app.sync_issues('TEAM-1')
+    cursor = int(app.board_cursor())
+
+    # ISS-2 moved to another team; ISS-4 was created while the ids were listed
+    app.store_issues('TEAM-1', [issue('ISS-4', '2024-02-01T00:00:00.000Z')])
+    graphql.handler = lambda query, variables, access_token: issues_page(
+        [{'id': 'ISS-1'}, {'id': 'ISS-3'}])
+
+    assert app.reconcile_issues('TEAM-1', force=True) == 1
+    assert stored_ids(store) == {'ISS-1', 'ISS-3', 'ISS-4'}
+    assert app.get_board_changes('TEAM-1', since=cursor, sync=False)['removed'] == ['ISS-2']
+
+
+def test_reconcile_keeps_issues_when_listing_fails(app, store, graphql):
+    graphql.handler = lambda query, variables, access_token: issues_page([issue('ISS-1')])
+    app.sync_issues('TEAM-1')
+    graphql.handler = lambda query, variables, access_token: None
+
+    assert app.reconcile_issues('TEAM-1', force=True) == 0
+    assert stored_ids(store) == {'ISS-1'}
+
+
+def test_reconcile_runs_once_per_interval(app, store, graphql):
+    graphql.handler = lambda query, variables, access_token: issues_page([issue('ISS-1')])
+    app.sync_issues('TEAM-1')
+    with store:
+        store.execute("UPDATE sync_reconciles SET reconciled_at = ?", (time.time() - app.LINEAR_SYNC_RECONCILE_INTERVAL - 1,))
+    graphql.calls.clear()
+
+    app.sync_issues('TEAM-1')
+    app.sync_issues('TEAM-1')
+
+    assert graphql.operations() == ['Issues', 'IssueIds', 'Issues']
+
+
+def test_full_sync_leaves_out_the_updated_since_filter(app, store, graphql):
+    graphql.handler = lambda query, variables, access_token: issues_page([issue('ISS-1')])
+    app.sync_issues('TEAM-1')
+    app.sync_issues('TEAM-1')
+
+    (full_query, full_variables, _), (delta_query, delta_variables, _) = graphql.calls
+    assert 'updatedSince' not in full_variables
+    assert '$updatedSince' not in full_query
+    assert delta_variables['updatedSince'] == '2024-01-01T00:00:00.000Z'
+    assert 'updatedAt: { gte: $updatedSince }' in delta_query
@@ -0,0 +1,88 @@
+import threading
+import time
+
+
+class StubResponse:
+    def __init__(self, headers=None):
+        self.headers = headers or {}
+
+
+def test_compose_queries_namespaces_variables_per_alias(app):
+    parts = app.OrderedDict()
+    parts['states'] = ("$teamId: String!", "team(id: $teamId) { id }", {'teamId': 'TEAM-1'})
+    parts['project'] = ("$projectId: String!", "project(id: $projectId) { id }", {'projectId': 'P-1'})
+
+    query, variables = app.compose_queries('Combined', parts)
+
+    assert query.startswith('query Combined($states_teamId: String!, $project_projectId: String!)')
+    assert 'states: team(id: $states_teamId)' in query
+    assert 'project: project(id: $project_projectId)' in query
+    assert variables == {'states_teamId': 'TEAM-1', 'project_projectId': 'P-1'}
+
+
+def test_split_composed_result_restores_each_response(app):
+    parts = app.OrderedDict()
+    parts['states'] = ("", "team { id }", {})
+    parts['project'] = ("", "project { id }", {})
+
+    split = app.split_composed_result({'data': {'states': {'id': 'TEAM-1'}, 'project': None}}, parts)
+
+    assert split == {'states': {'data': {'team': {'id': 'TEAM-1'}}}, 'project': None}
+
+
+def test_retry_delay_honours_retry_after(app):
+    scheduler = app.RateLimitScheduler()
+
+    assert scheduler.retry_delay('key', 0, StubResponse({'Retry-After': '3'})) == 3
+    assert scheduler.retry_delay('key', 0, StubResponse({'Retry-After': '3600'})) == app.LINEAR_RATE_LIMIT_MAX_WAIT
+    assert scheduler.stats()['rate_limited_responses'] == 2
+
+
+def test_retry_delay_backs_off_with_jitter(app):
+    scheduler = app.RateLimitScheduler()
+
+    for attempt in range(6):
+        delay = scheduler.retry_delay('key', attempt, StubResponse())
+        assert 0 <= delay <= min(app.LINEAR_BACKOFF_MAX, app.LINEAR_BACKOFF_BASE * 2 ** attempt)
+
+
+def test_retry_delay_waits_for_a_known_reset(app):
+    scheduler = app.RateLimitScheduler()
+    reset_ms = (time.time() + 5) * 1000
+    scheduler.record_response('key', StubResponse({
+        'X-RateLimit-Requests-Remaining': '0',
+        'X-RateLimit-Requests-Reset': str(reset_ms)
+    }))
+
+    assert 4 < scheduler.retry_delay('key', 0, StubResponse()) <= 5
+
+
+def test_single_flight_shares_one_call_between_concurrent_callers(app):
+    flight = app.SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {'nodes': [1, 2]}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do('key', fetch)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do('key', fetch))) for _ in range(3)]
+    for follower in followers:
+        follower.start()
+    while flight.stats()['coalesced_calls'] < 3:
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == [{'nodes': [1, 2]}] * 4
+    # Every caller gets its own copy
+    assert len({id(result) for result in results}) == 4
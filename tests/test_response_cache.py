@@ -0,0 +1,30 @@
+def test_response_cache_evicts_least_recently_used(app):
+    cache = app.ResponseCache(2)
+    cache.set('a', 1, 60)
+    cache.set('b', 2, 60)
+    assert cache.get('a') == (True, 1)
+    cache.set('c', 3, 60)
+
+    assert cache.get('b') == (False, None)
+    assert cache.get('a') == (True, 1)
+    assert cache.stats()['evictions'] == 1
+
+
+def test_response_cache_expires_entries(app):
+    cache = app.ResponseCache(10)
+    cache.set('a', 1, 0)
+    assert cache.get('a') == (False, None)
+    assert cache.stats()['expirations'] == 1
+
+
+def test_response_cache_invalidates_and_updates_by_entity(app):
+    cache = app.ResponseCache(10)
+    cache.set('p1', {'name': 'old'}, 60, 'projects')
+    cache.set('p2', {'name': 'old'}, 60, 'projects')
+    cache.set('t1', {'name': 'team'}, 60, 'teams')
+
+    assert cache.update('projects', lambda value: value.update(name='new')) == 2
+    assert cache.get('p1') == (True, {'name': 'new'})
+    assert cache.invalidate('projects') == 2
+    assert cache.get('p2') == (False, None)
+    assert cache.get('t1') == (True, {'name': 'team'})
@@ -0,0 +1,119 @@
+import os
+import stat
+import time
+
+import pytest
+
+
+@pytest.fixture
+def refreshes(app, monkeypatch):
+    """Answers for refresh_access_token, consumed in order"""
+    answers = []
+    monkeypatch.setattr(app, 'refresh_access_token', lambda refresh_token: answers.pop(0))
+    return answers
+
+
+def expire(app, user_id):
+    entry = app.load_user_tokens(user_id)
+    entry['expires_at'] = time.time() - 1
+    app.save_user_tokens(user_id, entry)
+
+
+def test_tokens_survive_a_restart(app, token_store):
+    app.TokenManager(300, 60, persist=True).store('USER-1', {
+        'access_token': 'access-1', 'refresh_token': 'refresh-1', 'expires_in': 3600
+    })
+
+    assert app.TokenManager(300, 60, persist=True).get('USER-1') == 'access-1'
+
+
+def test_token_store_is_private_to_the_owner(app, token_store):
+    app.save_user_tokens('USER-1', {'access_token': 'access-1', 'refresh_token': None, 'expires_at': None})
+
+    assert stat.S_IMODE(os.stat(app.LINEAR_TOKEN_STORE_PATH).st_mode) == 0o600
+
+
+def test_tokens_persist_without_the_issue_store(app, token_store):
+    assert app.LINEAR_ISSUE_STORE_PATH == ''
+    app.TokenManager(300, 60, persist=True).store('USER-1', {'access_token': 'access-1', 'expires_in': 3600})
+
+    assert app.TokenManager(300, 60, persist=True).get('USER-1') == 'access-1'
+
+
+def test_issue_store_drops_tokens_it_used_to_hold(app, tmp_path, monkeypatch):
+    path = tmp_path / 'issues.sqlite3'
+    legacy = app.sqlite3.connect(path)
+    legacy.execute("CREATE TABLE user_tokens (user_id TEXT PRIMARY KEY, access_token TEXT NOT NULL)")
+    legacy.execute("INSERT INTO user_tokens VALUES ('USER-1', 'access-1')")
+    legacy.commit()
+    legacy.close()
+    monkeypatch.setattr(app, 'LINEAR_ISSUE_STORE_PATH', str(path))
+    monkeypatch.setattr(app._issue_store_local, 'connection', None)
+
+    tables = {row[0] for row in app._issue_store_connection().execute("SELECT name FROM sqlite_master")}
+    app._issue_store_local.connection.close()
+
+    assert 'user_tokens' not in tables
+
+
+def test_expired_token_is_refreshed_inline(app, token_store, refreshes):
+    app.TokenManager(300, 60, persist=True).store('USER-1', {
+        'access_token': 'access-1', 'refresh_token': 'refresh-1', 'expires_in': 3600
+    })
+    expire(app, 'USER-1')
+    refreshes.append({'access_token': 'access-2', 'expires_in': 3600})
+    manager = app.TokenManager(300, 60, persist=True)
+
+    assert manager.get('USER-1') == 'access-2'
+    # Linear didn't rotate the refresh token, so the old one is kept
+    assert app.load_user_tokens('USER-1')['refresh_token'] == 'refresh-1'
+
+
+def test_rejected_refresh_token_is_dropped(app, token_store, refreshes):
+    manager = app.TokenManager(300, 60, persist=True)
+    manager.store('USER-1', {'access_token': 'access-1', 'refresh_token': 'refresh-1', 'expires_in': 3600})
+    refreshes.append({'error': 'invalid_grant'})
+
+    assert manager.refresh('USER-1', force=True) is None
+    assert app.load_user_tokens('USER-1') is None
+    assert manager.get('USER-1') is None
+    assert manager.stats()['dropped'] == 1
+
+
+def test_failed_refresh_backs_off(app, token_store, refreshes):
+    manager = app.TokenManager(300, 60, persist=True)
+    manager.store('USER-1', {'access_token': 'access-1', 'refresh_token': 'refresh-1', 'expires_in': 1})
+    refreshes.append(None)
+
+    assert manager.refresh('USER-1') is None
+    # Not retried until the check interval has passed, and not dropped
+    assert manager.refresh('USER-1') is None
+    assert manager.stats()['failed'] == 1
+    assert app.load_user_tokens('USER-1') is not None
+
+
+def test_token_rotated_by_another_worker_is_kept(app, token_store, monkeypatch):
+    manager = app.TokenManager(300, 60, persist=True)
+    other_worker = app.TokenManager(300, 60, persist=True)
+    manager.store('USER-1', {'access_token': 'access-1', 'refresh_token': 'refresh-1', 'expires_in': 3600})
+
+    def refresh_elsewhere_first(refresh_token):
+        other_worker.store('USER-1', {'access_token': 'access-2', 'refresh_token': 'refresh-2', 'expires_in': 3600})
+        return {'error': 'invalid_grant'}
+    monkeypatch.setattr(app, 'refresh_access_token', refresh_elsewhere_first)
+
+    assert manager.refresh('USER-1', force=True) == 'access-2'
+    assert app.load_user_tokens('USER-1')['refresh_token'] == 'refresh-2'
+
+
+def test_user_without_a_usable_token_is_signed_out(app, client, token_store, monkeypatch):
+    monkeypatch.setattr(app, 'token_manager', app.TokenManager(300, 60, persist=True))
+    with client.session_transaction() as session:
+        session['user'] = {'id': 'USER-1', 'name': 'Ada'}
+
+    response = client.post('/api/add_comment/ISS-1', json={'comment': 'Hello'})
+
+    assert response.status_code == 401
+    with client.session_transaction() as session:
+        assert 'user' not in session
+        assert 'access_token' not in session
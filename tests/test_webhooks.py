@@ -0,0 +1,94 @@
+import hashlib
+import hmac
+import json
+import time
+
+SECRET = 'test-webhook-secret'
+
+
+def sign(body):
+    return hmac.new(SECRET.encode('utf-8'), body, hashlib.sha256).hexdigest()
+
+
+def deliver(client, payload, signature=None):
+    body = json.dumps(payload).encode('utf-8')
+    return client.post('/webhooks/linear', data=body, content_type='application/json',
+                       headers={'Linear-Signature': signature if signature is not None else sign(body)})
+
+
+def issue_event(action='update', **data):
+    payload = {
+        'type': 'Issue',
+        'action': action,
+        'webhookTimestamp': int(time.time() * 1000),
+        'data': {
+            'id': 'ISS-1',
+            'teamId': 'TEAM-1',
+            'title': 'From a webhook',
+            'stateId': 'STATE-1',
+            'createdAt': '2024-01-01T00:00:00.000Z',
+            'updatedAt': '2024-01-02T00:00:00.000Z'
+        }
+    }
+    payload['data'].update(data)
+    return payload
+
+
+def test_signature_must_match_the_body(app):
+    body = b'{"type": "Issue"}'
+    assert app.verify_webhook_signature(body, sign(body))
+    assert not app.verify_webhook_signature(body + b' ', sign(body))
+    assert not app.verify_webhook_signature(body, None)
+
+
+def test_signature_is_rejected_without_a_secret(app, monkeypatch):
+    monkeypatch.setattr(app, 'LINEAR_WEBHOOK_SECRET', None)
+    body = b'{}'
+    assert not app.verify_webhook_signature(body, sign(body))
+
+
+def test_unsigned_delivery_is_rejected(app, client, store):
+    response = deliver(client, issue_event(), signature='0' * 64)
+
+    assert response.status_code == 401
+    assert store.execute("SELECT COUNT(*) FROM issues").fetchone()[0] == 0
+
+
+def test_stale_delivery_is_rejected(app, client, store, monkeypatch):
+    monkeypatch.setattr(app, 'LINEAR_WEBHOOK_MAX_AGE', 60)
+    payload = issue_event()
+    payload['webhookTimestamp'] -= 120 * 1000
+
+    assert deliver(client, payload).status_code == 401
+
+
+def test_issue_events_update_the_store(app, client, store):
+    assert deliver(client, issue_event()).get_json() == {'success': True, 'applied': True}
+    stored = json.loads(store.execute("SELECT data FROM issues WHERE id = 'ISS-1'").fetchone()[0])
+    assert stored['title'] == 'From a webhook'
+
+    assert deliver(client, issue_event('remove')).status_code == 200
+    assert store.execute("SELECT COUNT(*) FROM issues").fetchone()[0] == 0
+
+
+def test_handler_failure_returns_a_generic_error(app, client, store, monkeypatch):
+    def fail(action, data):
+        raise RuntimeError('secret internals')
+    monkeypatch.setitem(app.WEBHOOK_HANDLERS, 'Issue', fail)
+
+    response = deliver(client, issue_event())
+
+    assert response.status_code == 500
+    assert 'secret internals' not in response.get_data(as_text=True)
+
+
+def test_syncs_are_only_skipped_while_deliveries_arrive(app, client, store):
+    with store:
+        store.execute("INSERT INTO sync_watermarks (scope, updated_at, synced_at) VALUES (?, ?, ?)",
+                      (app._sync_scope('TEAM-1'), '2024-01-01T00:00:00.000Z', time.time()))
+    # A configured secret alone says nothing about whether Linear delivers here
+    assert not app._sync_is_fresh('TEAM-1')
+
+    deliver(client, issue_event())
+    assert app._sync_is_fresh('TEAM-1')
+    assert not app._sync_is_fresh('TEAM-2')
@@ -0,0 +1,73 @@
+import time
+
+MUTATION = """
+mutation IssueUpdate($id: String!, $input: IssueUpdateInput!) {
+    issueUpdate(id: $id, input: $input) { success }
+}
+"""
+
+NOT_FOUND = {'data': None, 'errors': [{'message': 'Entity not found', 'path': ['issueUpdate']}]}
+
+
+def test_not_found_about_another_id_keeps_the_target(app, graphql):
+    # e.g. a bad stateId: the issue itself still exists
+    def handler(query, variables, access_token):
+        if 'VerifyIssue' in query:
+            return {'data': {'issue': {'id': variables['id']}}}
+        return NOT_FOUND
+    graphql.handler = handler
+
+    result, not_found = app.execute_write('issue', 'ISS-1', MUTATION, {'id': 'ISS-1', 'input': {'stateId': 'bad'}})
+
+    assert not_found is False
+    assert result == NOT_FOUND
+    assert app.existence_cache.get(('issue', 'ISS-1')) == (True, True)
+
+
+def test_confirmed_missing_target_is_cached(app, graphql):
+    def handler(query, variables, access_token):
+        if 'VerifyIssue' in query:
+            return {'data': {'issue': None}}
+        return NOT_FOUND
+    graphql.handler = handler
+
+    _result, not_found = app.execute_write('issue', 'ISS-1', MUTATION, {'id': 'ISS-1', 'input': {}})
+    assert not_found is True
+    assert graphql.operations() == ['IssueUpdate', 'VerifyIssue']
+
+    # The miss is remembered, so the next write doesn't reach Linear
+    result, not_found = app.execute_write('issue', 'ISS-1', MUTATION, {'id': 'ISS-1', 'input': {}})
+    assert (result, not_found) == (None, True)
+    assert len(graphql.calls) == 2
+
+
+def test_failed_verify_does_not_cache_a_miss(app, graphql):
+    def handler(query, variables, access_token):
+        if 'VerifyIssue' in query:
+            return None
+        return NOT_FOUND
+    graphql.handler = handler
+
+    _result, not_found = app.execute_write('issue', 'ISS-1', MUTATION, {'id': 'ISS-1', 'input': {}})
+
+    assert not_found is False
+    assert app.existence_cache.get(('issue', 'ISS-1')) == (False, None)
+
+
+def test_successful_write_remembers_the_target(app, graphql):
+    graphql.handler = lambda query, variables, access_token: {'data': {'issueUpdate': {'success': True}}}
+
+    _result, not_found = app.execute_write('issue', 'ISS-1', MUTATION, {'id': 'ISS-1', 'input': {}})
+
+    assert not_found is False
+    assert app.existence_cache.get(('issue', 'ISS-1')) == (True, True)
+
+
+def test_missing_entries_expire_sooner(app, monkeypatch):
+    monkeypatch.setattr(app, 'LINEAR_MISSING_TTL', 0)
+    app.remember_existence('issue', 'gone', False)
+    app.remember_existence('issue', 'here', True)
+    time.sleep(0.001)
+
+    assert app.existence_cache.get(('issue', 'gone')) == (False, None)
+    assert app.existence_cache.get(('issue', 'here')) == (True, True)